@@ -40,6 +40,11 @@ def create_api_stats_tables(connection):
             print("Adding memory_usage_mb column to api_stats...")
             cursor.execute("ALTER TABLE api_stats ADD COLUMN memory_usage_mb FLOAT")
 
+        cursor.execute("SHOW COLUMNS FROM api_stats LIKE 'cache_hits'")
+        if not cursor.fetchone():
+            print("Adding cache_hits/cache_misses columns to api_stats...")
+            cursor.execute("ALTER TABLE api_stats ADD COLUMN cache_hits INT, ADD COLUMN cache_misses INT")
+
         # Also create code_copies table as seen in app.py usage
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS code_copies (
@@ -86,16 +91,24 @@ def track_api_call(func):
         # Extract model_id if present in kwargs or args
         model_id = kwargs.get('model_id')
         
+        # Prediction result cache counters, set by the prediction helpers
+        cache_hits = g.get('cache_hits')
+        cache_misses = g.get('cache_misses')
+        
         # Log to database if possible
+        conn = None
+        cursor = None
         try:
             from database import get_db
             db = get_db()
-            if db and db.connection:
-                cursor = db.connection.cursor(buffered=True)
+            conn = db.acquire_connection() if db else None
+            if conn:
+                cursor = conn.cursor(buffered=True)
                 query = """
                     INSERT INTO api_stats 
-                    (endpoint, method, status_code, response_time_ms, model_id, client_ip, cpu_percent, memory_usage_mb)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    (endpoint, method, status_code, response_time_ms, model_id, client_ip, cpu_percent, memory_usage_mb,
+                     cache_hits, cache_misses)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """
                 cursor.execute(query, (
                     request.path,
@@ -105,24 +118,30 @@ def track_api_call(func):
                     model_id,
                     request.remote_addr,
                     cpu_percent,
-                    memory_usage_mb
+                    memory_usage_mb,
+                    cache_hits,
+                    cache_misses
                 ))
-                db.connection.commit()
-                cursor.close()
+                conn.commit()
         except Exception as e:
             print(f"Warning: Failed to log API stat: {e}")
+        finally:
+            if conn:
+                db.release_connection(conn, cursor)
             
         return response
     return wrapper
 
 def get_api_statistics(db_manager, model_id=None, days=7):
     """Get detailed API statistics"""
-    cursor = db_manager.connection.cursor(dictionary=True, buffered=True)
+    conn = db_manager.acquire_connection()
     stats = {
         'totalCalls': 0,
         'successfulCalls': 0,
         'failedCalls': 0,
         'avgResponseTime': 0,
+        'cacheHits': 0,
+        'cacheMisses': 0,
         'totalCopiedCount': 0,
         'endpoints': [],
         'timeSeriesData': [],
@@ -130,15 +149,22 @@ def get_api_statistics(db_manager, model_id=None, days=7):
         'resourceUsage': {'cpu': 0, 'memory': 0, 'timestamp': datetime.now().isoformat()},
         'topClients': []
     }
+    if not conn:
+        return stats
+    cursor = None
     
     try:
+        cursor = conn.cursor(dictionary=True, buffered=True)
+        
         # 1. Overview Stats
         query_overview = """
             SELECT 
                 COUNT(*) as total,
                 SUM(CASE WHEN status_code >= 200 AND status_code < 300 THEN 1 ELSE 0 END) as success,
                 SUM(CASE WHEN status_code >= 400 THEN 1 ELSE 0 END) as failed,
-                AVG(response_time_ms) as avg_time
+                AVG(response_time_ms) as avg_time,
+                SUM(cache_hits) as cache_hits,
+                SUM(cache_misses) as cache_misses
             FROM api_stats
             WHERE timestamp >= CURDATE() - INTERVAL %s DAY
         """
@@ -155,6 +181,8 @@ def get_api_statistics(db_manager, model_id=None, days=7):
             stats['successfulCalls'] = overview['success'] or 0
             stats['failedCalls'] = overview['failed'] or 0
             stats['avgResponseTime'] = round(overview['avg_time'] or 0, 2)
+            stats['cacheHits'] = int(overview['cache_hits'] or 0)
+            stats['cacheMisses'] = int(overview['cache_misses'] or 0)
 
         # 2. Code Copies
         query_copies = "SELECT COUNT(*) as count FROM code_copies WHERE timestamp >= CURDATE() - INTERVAL %s DAY"
@@ -315,24 +343,29 @@ def get_api_statistics(db_manager, model_id=None, days=7):
         print(f"Error getting API stats: {e}")
         return stats
     finally:
-        cursor.close()
+        db_manager.release_connection(conn, cursor)
 
 def track_code_copy(model_id, section, client_ip=None):
     """Track when a user copies code snippet"""
+    conn = None
+    cursor = None
     try:
         from database import get_db
         db = get_db()
-        if db and db.connection:
-            cursor = db.connection.cursor(buffered=True)
+        conn = db.acquire_connection() if db else None
+        if conn:
+            cursor = conn.cursor(buffered=True)
             query = """
                 INSERT INTO code_copies 
                 (model_id, section, client_id)
                 VALUES (%s, %s, %s)
             """
             cursor.execute(query, (model_id, section, client_ip))
-            db.connection.commit()
-            cursor.close()
+            conn.commit()
             return True
     except Exception as e:
         print(f"Error tracking code copy: {e}")
         return False
+    finally:
+        if conn:
+            db.release_connection(conn, cursor)
@@ -4,19 +4,19 @@ Enhanced Flask API for ML Model Training, Storage, and Serving
 Integrates model serialization, MySQL storage, and prediction endpoints
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split, cross_validate, KFold, StratifiedKFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    mean_squared_error, mean_absolute_error, r2_score
-)
+from sklearn.base import clone
+import csv
+import functools
 import io
 import json
 import os
+from concurrent.futures import FIRST_COMPLETED, wait
 from datetime import datetime
 import pickle
 from flask import g
@@ -43,8 +43,16 @@ from sklearn.neighbors import KNeighborsRegressor
 
 # Import custom modules
 import config
-from model_serializer import ModelSerializer, PreprocessingPipeline
+from model_serializer import ModelSerializer, CompiledPreprocessing
 from database import get_db
+from job_manager import get_job_manager
+from training_cache import TrainingCache, get_training_cache
+from training_pool import evaluate_classification, evaluate_regression, fit_and_score, get_training_pool
+from dataset_store import get_dataset_store
+from model_cache import get_model_cache
+from prediction_logger import get_prediction_logger
+from micro_batcher import MicroBatcherRegistry, get_micro_batchers
+from result_cache import PredictionResultCache, get_prediction_cache
 
 app = Flask(__name__)
 CORS(app)
@@ -67,39 +75,227 @@ def before_request():
 # Import the tracking decorator
 from api_statistics import track_api_call, get_api_statistics
 
+# Optional: pyarrow enables pandas' multithreaded CSV reader
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
 
 def robust_read_csv(csv_string: str):
-    """Try to read a CSV string with multiple common separators.
-    
-    Returns a pandas.DataFrame or raises the last exception.
+    """Read a CSV string with a single parse.
+
+    The separator and quote character are sniffed once from the first
+    ``CSV_SNIFF_BYTES`` of the input, and column dtypes are inferred from
+    that same sample. The full input is then parsed once with pyarrow's
+    multithreaded reader when it is installed, otherwise with pandas' C
+    engine. If the sampled dtypes do not hold for the whole file, it is
+    re-parsed once with full inference.
+
+    Returns a pandas.DataFrame or raises the parser's exception.
     """
-    # First try pandas autodetect (engine='python', sep=None)
+    if not csv_string or not csv_string.strip():
+        raise ValueError('Empty CSV data')
+
+    sample = csv_string[:config.CSV_SNIFF_BYTES]
+    sep, quotechar = sniff_csv_dialect(sample)
+    dtype = _sample_dtypes(sample, sep, quotechar)
+    engine = 'pyarrow' if _use_pyarrow() else 'c'
+
     try:
-        return pd.read_csv(io.StringIO(csv_string), sep=None, engine="python")
-    except Exception as e_auto:
-        last_exc = e_auto
-    
-    # Try common separators
-    for sep in [';', ',', '\t']:
-        try:
-            return pd.read_csv(io.StringIO(csv_string), sep=sep)
-        except Exception as e:
-            last_exc = e
-    
-    # If all attempts fail, raise the last exception
-    raise last_exc
+        return pd.read_csv(io.StringIO(csv_string), sep=sep, quotechar=quotechar, dtype=dtype, engine=engine)
+    except Exception:
+        if not dtype:
+            raise
+    # A value later in the file did not fit the sampled dtypes
+    return pd.read_csv(io.StringIO(csv_string), sep=sep, quotechar=quotechar, engine=engine)
+
+
+def _use_pyarrow():
+    """Whether the pyarrow CSV engine should be used"""
+    if config.CSV_ENGINE == 'c':
+        return False
+    return PYARROW_AVAILABLE
+
+
+def _sample_dtypes(sample: str, sep: str, quotechar: str):
+    """Infer an explicit dtype map for float and text columns from the sniffed sample.
+
+    Integer columns are left to the parser since a missing value later
+    in the file would turn them into floats.
+    """
+    if '\n' not in sample:
+        return None
+    try:
+        sample_df = pd.read_csv(io.StringIO(sample[:sample.rindex('\n')]), sep=sep, quotechar=quotechar)
+    except Exception:
+        return None
+    if sample_df.empty:
+        # Only the header fit in the sample, so there is nothing to infer from
+        return None
+
+    dtype = {}
+    for col, col_dtype in sample_df.dtypes.items():
+        if pd.api.types.is_float_dtype(col_dtype):
+            dtype[col] = 'float64'
+        elif col_dtype == object:
+            dtype[col] = 'object'
+    return dtype or None
+
+
+class _ReplayStream(io.RawIOBase):
+    """Binary stream that replays already-consumed head bytes before the rest of the source"""
+
+    def __init__(self, head: bytes, source):
+        self._head = head
+        self._source = source
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._head:
+            n = min(len(buffer), len(self._head))
+            buffer[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+        data = self._source.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+
+def sniff_csv_dialect(sample: str):
+    """Guess the field separator and quote character from the first lines of a CSV"""
+    # Only sniff complete lines
+    if '\n' in sample:
+        sample = sample[:sample.rindex('\n')]
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t|')
+        return dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        # Ties, such as a header cut off before its first separator, fall back to a comma
+        header = sample.split('\n', 1)[0]
+        return max([',', ';', '\t'], key=header.count), '"'
+
+
+def read_csv_stream(stream, chunksize=None):
+    """Parse a CSV from a binary file-like object without buffering it as a string.
+
+    The separator is sniffed from the first ``CSV_SNIFF_BYTES`` of the
+    stream; those bytes are then replayed so pandas reads the upload
+    incrementally. Returns a DataFrame, or a chunk iterator when
+    ``chunksize`` is given.
+    """
+    head = stream.read(config.CSV_SNIFF_BYTES)
+    if not head:
+        raise ValueError('Empty CSV upload')
+    sep, quotechar = sniff_csv_dialect(head.decode('utf-8', errors='replace'))
+
+    buffered = io.BufferedReader(_ReplayStream(head, stream), buffer_size=1024 * 1024)
+    return pd.read_csv(buffered, sep=sep, quotechar=quotechar, chunksize=chunksize)
+
+
+def summarize_csv_stream(stream):
+    """Compute parse-csv column information chunk by chunk from a binary stream"""
+    columns = None
+    sample = None
+    column_types = {}
+    row_count = 0
+
+    for chunk in read_csv_stream(stream, chunksize=config.CSV_CHUNK_ROWS):
+        if columns is None:
+            columns = chunk.columns.tolist()
+            sample = chunk.head(5)
+            column_types = chunk.dtypes.to_dict()
+        else:
+            # Widen types that differ between chunks the way a single parse would
+            for col, dtype in chunk.dtypes.items():
+                if dtype != column_types[col]:
+                    if pd.api.types.is_numeric_dtype(dtype) and pd.api.types.is_numeric_dtype(column_types[col]):
+                        column_types[col] = np.result_type(dtype, column_types[col])
+                    else:
+                        column_types[col] = np.dtype('object')
+        row_count += len(chunk)
+
+    return {
+        'columns': columns or [],
+        'sample_data': sample.to_dict('records') if sample is not None else [],
+        'row_count': row_count,
+        'column_types': {col: str(dtype) for col, dtype in column_types.items()}
+    }
+
+
+def _parse_list_param(values):
+    """Read a list parameter given as repeated fields, a JSON array or a comma-separated string"""
+    if len(values) != 1:
+        return values
+    value = values[0].strip()
+    if value.startswith('['):
+        return json.loads(value)
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def _is_true(value):
+    """Interpret JSON booleans and form/query strings such as 'true' or '1'"""
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def _get_request_data():
+    """Return the request parameters and an uploaded CSV stream, if any.
+
+    Supports JSON bodies (CSV embedded as ``csv_data``), multipart uploads
+    (CSV in a ``file`` field, parameters as form fields) and raw
+    ``text/csv`` bodies (parameters in the query string). Uploaded CSVs
+    are returned as binary streams so they never become one Python string.
+    """
+    if request.mimetype == 'multipart/form-data':
+        fields = request.form
+        upload = request.files.get('file') or request.files.get('csv_file')
+        stream = upload.stream if upload else None
+    elif request.mimetype in ('text/csv', 'application/csv', 'text/plain'):
+        fields = request.args
+        stream = request.stream
+    else:
+        return request.get_json(silent=True) or {}, None
+
+    data = fields.to_dict()
+    if 'input_features' in fields:
+        data['input_features'] = _parse_list_param(fields.getlist('input_features'))
+    return data, stream
 
 
 class MLModelTrainer:
     """Enhanced model trainer with model persistence and evaluation"""
     
-    def __init__(self, model_type):
+    SELECTION_STRATEGIES = ('full', 'successive_halving')
+
+    def __init__(self, model_type, n_jobs=None, progress_callback=None, selection=None):
         self.model_type = model_type
+        self.n_jobs = n_jobs if n_jobs is not None else config.TRAINING_WORKERS
+        self.selection = selection or config.TRAINING_SELECTION
+        if self.selection not in self.SELECTION_STRATEGIES:
+            raise ValueError(
+                f"Unknown selection strategy '{self.selection}'. "
+                f"Expected one of: {', '.join(self.SELECTION_STRATEGIES)}"
+            )
+        self.progress_callback = progress_callback  # Called as progress_callback(algorithm, status)
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.best_model = None
         self.best_model_name = None
 
+    def _report_progress(self, name, status):
+        """Notify the progress callback, if any, about an algorithm's status"""
+        if self.progress_callback:
+            try:
+                self.progress_callback(name, status)
+            except Exception as e:
+                print(f"Warning: progress callback failed: {e}")
+
     def get_algorithms(self):
         """Get available algorithms for the model type"""
         if self.model_type == 'classification':
@@ -125,45 +321,71 @@ class MLModelTrainer:
             }
 
     def preprocess_data(self, df, input_features, output_feature):
-        """Preprocess data: handle missing values and encode categorical features"""
-        # Handle missing values
-        df = df.dropna()
-
-        # Separate features and target
-        X = df[input_features].copy()
-        y = df[output_feature].copy()
-
-        # Encode categorical features
-        for col in X.columns:
-            if X[col].dtype == 'object':
-                self.label_encoders[col] = LabelEncoder()
-                X[col] = self.label_encoders[col].fit_transform(X[col])
+        """Preprocess data: handle missing values and encode categorical features
+
+        Only the selected columns are kept. Numeric features are downcast to
+        the smallest integer type that holds them (and to float32 when
+        TRAINING_FLOAT32 is set), and text columns are encoded to
+        categorical codes in one vectorized pass.
+        """
+        # Drop unused columns before handling missing values
+        columns = list(dict.fromkeys(list(input_features) + [output_feature]))
+        df = df[columns].dropna()
+
+        # Separate and compact features
+        X = pd.DataFrame(
+            {col: self._compact_feature(col, df[col]) for col in input_features},
+            index=df.index
+        )
+        y = df[output_feature]
 
         # Encode target for classification
-        if self.model_type == 'classification' and y.dtype == 'object':
-            self.label_encoders['target'] = LabelEncoder()
-            y = self.label_encoders['target'].fit_transform(y)
+        if self.model_type == 'classification' and self._is_categorical(y):
+            self.label_encoders['target'], y = self._encode_categorical(y)
 
         return X, y
 
+    @staticmethod
+    def _is_categorical(series):
+        """Whether a column holds text/categorical values that need encoding"""
+        return (
+            series.dtype == 'object'
+            or pd.api.types.is_string_dtype(series.dtype)
+            or isinstance(series.dtype, pd.CategoricalDtype)
+        )
+
+    @staticmethod
+    def _encode_categorical(series):
+        """Encode a column to integer codes in one pass.
+
+        Categories are sorted like LabelEncoder's classes, so the returned
+        encoder is interchangeable with one fitted on the column.
+        """
+        categorical = pd.Categorical(series).remove_unused_categories()
+        if not categorical.ordered:
+            categorical = categorical.reorder_categories(sorted(categorical.categories))
+        encoder = LabelEncoder()
+        encoder.classes_ = np.asarray(categorical.categories, dtype=object)
+        return encoder, categorical.codes
+
+    def _compact_feature(self, col, series):
+        """Encode a categorical feature or downcast a numeric one to its smallest safe dtype"""
+        if self._is_categorical(series):
+            self.label_encoders[col], codes = self._encode_categorical(series)
+            return codes
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return pd.to_numeric(series, downcast='integer')
+        if pd.api.types.is_float_dtype(series.dtype) and config.TRAINING_FLOAT32:
+            return series.astype(np.float32)
+        return series
+
     def evaluate_classification(self, y_true, y_pred):
         """Evaluate classification model"""
-        return {
-            'accuracy': round(accuracy_score(y_true, y_pred), 4),
-            'precision': round(precision_score(y_true, y_pred, average='weighted', zero_division=0), 4),
-            'recall': round(recall_score(y_true, y_pred, average='weighted', zero_division=0), 4),
-            'f1_score': round(f1_score(y_true, y_pred, average='weighted', zero_division=0), 4)
-        }
+        return evaluate_classification(y_true, y_pred)
 
     def evaluate_regression(self, y_true, y_pred):
         """Evaluate regression model"""
-        mse = mean_squared_error(y_true, y_pred)
-        return {
-            'mse': round(mse, 4),
-            'rmse': round(np.sqrt(mse), 4),
-            'mae': round(mean_absolute_error(y_true, y_pred), 4),
-            'r2_score': round(r2_score(y_true, y_pred), 4)
-        }
+        return evaluate_regression(y_true, y_pred)
 
     def train_and_evaluate(self, df, input_features, output_feature):
         """Train and evaluate all algorithms using k-fold CV for small datasets"""
@@ -181,6 +403,7 @@ class MLModelTrainer:
             else:
                 n_splits = min(3, n_samples)
                 cv = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+            split = None
             evaluation_method = 'k-fold cross-validation'
         else:
             # For larger datasets, use traditional train/test split
@@ -197,93 +420,28 @@ class MLModelTrainer:
                 X_train, X_test, y_train, y_test = train_test_split(
                     X, y, test_size=0.2, random_state=42
                 )
+            cv = None
+            split = (X_train, X_test, y_train, y_test)
             evaluation_method = 'train/test split'
 
+        # Scale the evaluation data once; every candidate reuses the same arrays
+        splits = self._prepare_splits(X, y, cv, split)
         algorithms = self.get_algorithms()
-        results = []
 
-        for name, model in algorithms.items():
-            try:
-                if use_kfold:
-                    # K-fold cross-validation: fit and average metrics across folds
-                    fold_metrics = []
-                    fold_scores = []
-                    
-                    # Get fold indices
-                    if self.model_type == 'classification':
-                        fold_generator = cv.split(X, y)
-                    else:
-                        fold_generator = cv.split(X)
-                    
-                    for train_idx, test_idx in fold_generator:
-                        X_train_fold = X.iloc[train_idx] if hasattr(X, 'iloc') else X[train_idx]
-                        X_test_fold = X.iloc[test_idx] if hasattr(X, 'iloc') else X[test_idx]
-                        y_train_fold = y.iloc[train_idx] if hasattr(y, 'iloc') else y[train_idx]
-                        y_test_fold = y.iloc[test_idx] if hasattr(y, 'iloc') else y[test_idx]
-                        
-                        # Scale features per fold
-                        scaler_fold = StandardScaler()
-                        X_train_scaled = scaler_fold.fit_transform(X_train_fold)
-                        X_test_scaled = scaler_fold.transform(X_test_fold)
-                        
-                        # Clone and fit model
-                        from sklearn.base import clone
-                        model_clone = clone(model)
-                        model_clone.fit(X_train_scaled, y_train_fold)
-                        y_pred = model_clone.predict(X_test_scaled)
-                        
-                        # Evaluate fold
-                        if self.model_type == 'classification':
-                            metrics_fold = self.evaluate_classification(y_test_fold, y_pred)
-                            score_fold = metrics_fold['f1_score']
-                        else:
-                            metrics_fold = self.evaluate_regression(y_test_fold, y_pred)
-                            score_fold = metrics_fold['r2_score']
-                        
-                        fold_metrics.append(metrics_fold)
-                        fold_scores.append(score_fold)
-                    
-                    # Average metrics across folds
-                    metrics = {}
-                    if fold_metrics:
-                        for key in fold_metrics[0].keys():
-                            metrics[key] = round(np.mean([m[key] for m in fold_metrics]), 4)
-                        score = np.mean(fold_scores)
-                    else:
-                        raise ValueError(f"No valid folds for {name}")
-                    
-                    # Also train on full dataset for serialization
-                    X_scaled = self.scaler.fit_transform(X)
-                    model.fit(X_scaled, y)
-                    
-                else:
-                    # Traditional train/test split evaluation
-                    X_train_scaled = self.scaler.fit_transform(X_train)
-                    X_test_scaled = self.scaler.transform(X_test)
-                    
-                    # Train model
-                    model.fit(X_train_scaled, y_train)
-                    
-                    # Predict
-                    y_pred = model.predict(X_test_scaled)
-                    
-                    # Evaluate
-                    if self.model_type == 'classification':
-                        metrics = self.evaluate_classification(y_test, y_pred)
-                        score = metrics['f1_score']
-                    else:
-                        metrics = self.evaluate_regression(y_test, y_pred)
-                        score = metrics['r2_score']
-
-                results.append({
-                    'algorithm': name,
-                    'metrics': metrics,
-                    'score': score,
-                    'model': model  # Store model for later serialization
-                })
-            except Exception as e:
-                print(f"Error with {name}: {str(e)}")
-                continue
+        # Successive halving races the candidates on growing subsamples first
+        elimination = []
+        eliminated_results = []
+        ranking_sample = None
+        if self.selection == 'successive_halving' and 'train_test' in splits:
+            algorithms, elimination, eliminated_results = self._successive_halving(algorithms, splits)
+        elif 'train_test' in splits:
+            ranking_sample = self._ranking_sample_sizes(splits)
+
+        if ranking_sample:
+            # Big data: rank on a sample and refit only the winner on the full split
+            results, eliminated_results = self._rank_on_sample(algorithms, splits, *ranking_sample)
+        else:
+            results = self._evaluate_candidates(algorithms, splits)
 
         # If no algorithm produced results, raise a clear error
         if len(results) == 0:
@@ -292,8 +450,9 @@ class MLModelTrainer:
                 "correct column types, and that the selected input/output columns exist and contain valid values."
             )
 
-        # Sort by score and select best
+        # Sort by score and select best; eliminated candidates rank below the full-data survivors
         results.sort(key=lambda x: x['score'], reverse=True)
+        results += eliminated_results
         best_result = results[0]
 
         # Store best model for serialization
@@ -301,17 +460,26 @@ class MLModelTrainer:
         self.best_model_name = best_result['algorithm']
 
         # Remove model object from results for JSON serialization
-        results_for_response = [
-            {
+        results_for_response = []
+        for r in results:
+            entry = {
                 'algorithm': r['algorithm'],
                 'metrics': r['metrics'],
                 'score': r['score']
             }
-            for r in results
-        ]
+            if 'eliminated_at_rung' in r:
+                entry['eliminated_at_rung'] = r['eliminated_at_rung']
+            if 'train_size' in r:
+                entry['train_size'] = r['train_size']
+            if 'fold_results' in r:
+                entry['fold_results'] = r['fold_results']
+            results_for_response.append(entry)
 
         # Generate justification
-        justification = self.generate_justification(best_result, results, self.model_type, evaluation_method)
+        justification = self.generate_justification(
+            best_result, results, self.model_type, evaluation_method, elimination,
+            ranking_sample[0] if ranking_sample else None
+        )
 
         return {
             'results': results_for_response,
@@ -319,7 +487,237 @@ class MLModelTrainer:
             'justification': justification
         }
 
-    def generate_justification(self, best_model, all_results, model_type, evaluation_method='train/test split'):
+    def _prepare_splits(self, X, y, cv=None, split=None):
+        """Scale every evaluation split once so all candidates share the same arrays.
+
+        Returns a dict holding either ``folds`` (one scaled
+        ``(X_train, X_test, y_train, y_test)`` tuple per CV fold) and
+        ``full`` (scaled ``(X, y)`` for the final fit), or ``train_test``
+        (a single scaled tuple). Arrays are C-contiguous, read-only and
+        float32 when TRAINING_FLOAT32 is set; ``self.scaler`` is left fitted
+        on the data the final model sees.
+        """
+        float_dtype = np.float32 if config.TRAINING_FLOAT32 else np.float64
+        X_values = np.asarray(X, dtype=float_dtype)
+        y_values = np.asarray(y)
+
+        def _shared(array):
+            array = np.ascontiguousarray(array)
+            array.flags.writeable = False
+            return array
+
+        if cv is not None:
+            folds = []
+            fold_generator = cv.split(X_values, y_values) if self.model_type == 'classification' else cv.split(X_values)
+            for train_idx, test_idx in fold_generator:
+                # Scale features per fold
+                scaler_fold = StandardScaler()
+                folds.append((
+                    _shared(scaler_fold.fit_transform(X_values[train_idx])),
+                    _shared(scaler_fold.transform(X_values[test_idx])),
+                    _shared(y_values[train_idx]),
+                    _shared(y_values[test_idx])
+                ))
+            return {
+                'folds': folds,
+                'full': (_shared(self.scaler.fit_transform(X_values)), _shared(y_values))
+            }
+
+        X_train, X_test, y_train, y_test = split
+        X_train_scaled = self.scaler.fit_transform(np.asarray(X_train, dtype=float_dtype))
+        X_test_scaled = self.scaler.transform(np.asarray(X_test, dtype=float_dtype))
+        return {
+            'train_test': (
+                _shared(X_train_scaled),
+                _shared(X_test_scaled),
+                _shared(np.asarray(y_train)),
+                _shared(np.asarray(y_test))
+            )
+        }
+
+    def _evaluate_candidates(self, algorithms, splits):
+        """Fit and score each algorithm, sequentially or in a process pool"""
+        n_workers = min(self.n_jobs, len(algorithms), os.cpu_count() or 1)
+
+        if n_workers > 1:
+            return self._evaluate_parallel(algorithms, splits, n_workers)
+
+        results = []
+        for name, model in algorithms.items():
+            self._report_progress(name, 'running')
+            try:
+                results.append(self._fit_and_score(name, model, splits))
+                self._report_progress(name, 'completed')
+            except Exception as e:
+                print(f"Error with {name}: {str(e)}")
+                self._report_progress(name, 'failed')
+                continue
+        return results
+
+    def _successive_halving(self, algorithms, splits):
+        """Race algorithms on growing stratified subsamples of the training split.
+
+        Each rung scores the remaining candidates on the held-out test set
+        after fitting on a subsample, keeps the top half and doubles the
+        subsample size, until one candidate is left or the next rung would
+        need the full training set.
+
+        Returns the surviving algorithms, a list of
+        ``(rung, train_size, [eliminated names])`` and the leaderboard
+        entries of eliminated candidates.
+        """
+        X_train, X_test, y_train, y_test = splits['train_test']
+        n_train = len(X_train)
+        size = config.HALVING_MIN_SAMPLES
+        candidates = dict(algorithms)
+        elimination = []
+        eliminated_results = []
+        rung = 1
+
+        while len(candidates) > 1 and size < n_train:
+            print(f"🏁 Successive halving rung {rung}: {len(candidates)} candidates on {size} rows")
+            X_sub, y_sub = self._subsample(X_train, y_train, size)
+            rung_results = self._evaluate_candidates(
+                {name: clone(model) for name, model in candidates.items()},
+                {'train_test': (X_sub, X_test, y_sub, y_test)}
+            )
+            rung_results.sort(key=lambda x: x['score'], reverse=True)
+
+            keep = max(1, (len(rung_results) + 1) // 2)
+            dropped = rung_results[keep:]
+            for r in dropped:
+                r['eliminated_at_rung'] = rung
+                r['train_size'] = size
+                self._report_progress(r['algorithm'], 'eliminated')
+            elimination.append((rung, size, [r['algorithm'] for r in dropped]))
+            eliminated_results = dropped + eliminated_results
+
+            # Algorithms that failed on the subsample are dropped as well
+            candidates = {r['algorithm']: candidates[r['algorithm']] for r in rung_results[:keep]}
+            size *= 2
+            rung += 1
+
+        return candidates, elimination, eliminated_results
+
+    def _ranking_sample_sizes(self, splits):
+        """Pick sample sizes for ranking candidates on big data.
+
+        Only applies once the dataset reaches SUBSAMPLE_MIN_ROWS. The test
+        sample is sized so the standard error of the score stays within
+        SUBSAMPLE_SCORE_STDERR: per-row correctness varies by at most 0.25
+        for classification, and for regression the R² error is bounded by
+        the variance of the target's squared deviations relative to its
+        variance. The training sample keeps the 80/20 ratio.
+
+        Returns ``(train_size, test_size)``, or None to evaluate every
+        candidate on the full split.
+        """
+        X_train, X_test, y_train, y_test = splits['train_test']
+        if not config.SUBSAMPLE_MIN_ROWS or len(X_train) + len(X_test) < config.SUBSAMPLE_MIN_ROWS:
+            return None
+
+        if self.model_type == 'classification':
+            row_variance = 0.25
+        else:
+            deviations = (np.asarray(y_test, dtype=np.float64) - np.mean(y_test)) ** 2
+            target_variance = deviations.mean()
+            if target_variance == 0:
+                return None
+            row_variance = deviations.var() / target_variance ** 2
+
+        test_size = int(np.ceil(row_variance / config.SUBSAMPLE_SCORE_STDERR ** 2))
+        train_size = 4 * test_size
+        if train_size >= len(X_train):
+            return None
+        return train_size, min(test_size, len(X_test))
+
+    def _rank_on_sample(self, algorithms, splits, train_size, test_size):
+        """Rank candidates on a stratified sample, then refit only the winner on the full split.
+
+        Returns the winner's full-split result (as a one-item list) and the
+        sample-scored results of the other candidates, tagged with
+        ``train_size``.
+        """
+        X_train, X_test, y_train, y_test = splits['train_test']
+        print(f"🎯 Ranking {len(algorithms)} candidates on {train_size} of {len(X_train)} training rows")
+        X_sub, y_sub = self._subsample(X_train, y_train, train_size)
+        if test_size < len(X_test):
+            X_test, y_test = self._subsample(X_test, y_test, test_size)
+
+        sample_results = self._evaluate_candidates(
+            {name: clone(model) for name, model in algorithms.items()},
+            {'train_test': (X_sub, X_test, y_sub, y_test)}
+        )
+        sample_results.sort(key=lambda x: x['score'], reverse=True)
+        for r in sample_results:
+            r['train_size'] = train_size
+        if not sample_results:
+            return [], []
+
+        winner = sample_results[0]['algorithm']
+        print(f"🎯 Refitting {winner} on all {len(X_train)} training rows")
+        refit = self._evaluate_candidates({winner: algorithms[winner]}, splits)
+        if not refit:
+            # Keep the sample-fitted model rather than failing the whole request
+            return sample_results[:1], sample_results[1:]
+        # The justification compares candidates on the sample they were ranked on
+        refit[0]['sample_score'] = sample_results[0]['score']
+        return refit, sample_results[1:]
+
+    def _subsample(self, X, y, size):
+        """Draw a subsample of ``size`` rows, stratified on the target for classification"""
+        try:
+            if self.model_type == 'classification':
+                X_sub, _, y_sub, _ = train_test_split(X, y, train_size=size, random_state=42, stratify=y)
+                return X_sub, y_sub
+        except Exception:
+            pass
+        X_sub, _, y_sub, _ = train_test_split(X, y, train_size=size, random_state=42)
+        return X_sub, y_sub
+
+    def _fit_and_score(self, name, model, splits):
+        """Fit a single algorithm on the prepared splits and score it"""
+        return fit_and_score(self.model_type, name, model, splits)
+
+    def _evaluate_parallel(self, algorithms, splits, n_workers):
+        """Evaluate the algorithms in the shared training pool.
+
+        The splits are placed in shared memory once for the whole call, and
+        at most ``n_workers`` algorithms are in the pool at a time. Results
+        are returned in the same order as ``algorithms`` so the leaderboard
+        stays deterministic regardless of completion order.
+        """
+        pool = get_training_pool()
+        pool_size = pool.reserve(n_workers)
+        print(f"⚙️  Evaluating {len(algorithms)} algorithms with {n_workers} worker processes (pool of {pool_size})")
+        results = {}
+        pending = iter(algorithms.items())
+        with pool.share(splits) as shared_splits:
+            futures = {}
+
+            def submit_next():
+                item = next(pending, None)
+                if item is not None:
+                    futures[pool.submit(self.model_type, item[0], item[1], shared_splits)] = item[0]
+                    self._report_progress(item[0], 'running')
+
+            for _ in range(n_workers):
+                submit_next()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    try:
+                        results[name] = future.result()
+                        self._report_progress(name, 'completed')
+                    except Exception as e:
+                        print(f"Error with {name}: {str(e)}")
+                        self._report_progress(name, 'failed')
+                    submit_next()
+        return [results[name] for name in algorithms if name in results]
+
+    def generate_justification(self, best_model, all_results, model_type, evaluation_method='train/test split',
+                               elimination=None, ranking_sample_size=None):
         """Generate explanation for model selection"""
         algorithm = best_model['algorithm']
         metrics = best_model['metrics']
@@ -347,7 +745,8 @@ class MLModelTrainer:
             second_best = all_results[1]
             try:
                 if second_best.get('score') and second_best['score'] != 0:
-                    improvement = ((best_model['score'] - second_best['score']) / second_best['score']) * 100
+                    best_score = best_model.get('sample_score', best_model['score'])
+                    improvement = ((best_score - second_best['score']) / second_best['score']) * 100
                     improvement_str = f"by {improvement:.2f}% in {primary_metric}."
                 else:
                     improvement_str = f"(no measurable improvement over {second_best['algorithm']} in {primary_metric})."
@@ -360,6 +759,21 @@ class MLModelTrainer:
         if evaluation_method == 'k-fold cross-validation':
             justification += f" (Evaluated using {evaluation_method} due to small dataset size.)"
 
+        # Record where each algorithm dropped out of successive halving
+        if elimination:
+            rungs = "; ".join(
+                f"rung {rung} ({size} training rows): {', '.join(names)}"
+                for rung, size, names in elimination if names
+            )
+            justification += f" Selected with successive halving; eliminated at {rungs}."
+
+        # Note when the leaderboard was ranked on a sample of a large dataset
+        if ranking_sample_size:
+            justification += (
+                f" Candidates were ranked on a stratified sample of {ranking_sample_size} training rows; "
+                f"only {algorithm} was refit on the full training split."
+            )
+
         return justification
 
 
@@ -367,16 +781,29 @@ class MLModelTrainer:
 
 @app.route('/api/train', methods=['POST'])
 def train_model():
-    """Train model and save to database"""
+    """Train model and save to database
+
+    Pass ``"async": true`` (or ``?async=true``) to queue the training as a
+    background job and get a job ID back immediately; poll
+    ``GET /api/jobs/<job_id>`` for progress and the final ``model_id``.
+
+    Instead of ``csv_data`` a ``dataset_id`` from ``POST /api/datasets`` may
+    be given; ``"save_dataset": true`` stores the uploaded CSV and returns
+    its ``dataset_id`` so later retrains can skip the upload.
+    """
     try:
-        # Get request data
-        data = request.json
+        # Get request data (JSON body, multipart upload or raw CSV body)
+        data, csv_stream = _get_request_data()
         model_name = data.get('model_name')
         description = data.get('description', '')
         model_type = data.get('model_type')  # 'classification' or 'regression'
         csv_data = data.get('csv_data')
+        dataset_id = data.get('dataset_id')
+        save_dataset = _is_true(data.get('save_dataset', False))
         input_features = data.get('input_features')
         output_feature = data.get('output_feature')
+        selection = data.get('selection_strategy')  # 'full' (default) or 'successive_halving'
+        run_async = _is_true(data.get('async')) or _is_true(request.args.get('async', ''))
 
         # Log incoming data
         print("\n" + "="*80)
@@ -387,116 +814,97 @@ def train_model():
         print(f"Model Type: {model_type}")
         print(f"Input Features: {input_features}")
         print(f"Output Feature: {output_feature}")
-        print(f"CSV Data (first 200 chars): {csv_data[:200] if csv_data else 'None'}...")
-        print(f"CSV Data Total Length: {len(csv_data) if csv_data else 0} characters")
+        if csv_stream is not None:
+            print(f"CSV Data: streamed upload ({request.mimetype})")
+        elif dataset_id:
+            print(f"Dataset ID: {dataset_id}")
+        else:
+            print(f"CSV Data (first 200 chars): {csv_data[:200] if csv_data else 'None'}...")
+            print(f"CSV Data Total Length: {len(csv_data) if csv_data else 0} characters")
+        print(f"Async: {run_async}")
         print("="*80 + "\n")
 
-        if not all([model_name, model_type, csv_data, input_features, output_feature]):
+        if not all([model_name, model_type, csv_data or csv_stream or dataset_id, input_features, output_feature]):
             print("❌ ERROR: Missing required fields!")
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
 
-        # Parse CSV data
-        try:
-            df = robust_read_csv(csv_data)
-            print(f"✅ CSV parsed successfully!")
-            print(f"   Dataset shape: {df.shape[0]} rows × {df.shape[1]} columns")
-            print(f"   Columns: {list(df.columns)}")
-            print(f"   Data preview:\n{df.head()}\n")
-        except Exception as e:
-            print(f"❌ CSV parsing error: {str(e)}")
-            return jsonify({'success': False, 'error': f"CSV parsing error: {str(e)}"}), 400
+        if selection and selection not in MLModelTrainer.SELECTION_STRATEGIES:
+            return jsonify({'success': False, 'error': f"Unknown selection_strategy '{selection}'"}), 400
 
-        # Initialize trainer
-        trainer = MLModelTrainer(model_type)
+        # Load a stored dataset instead of parsing an upload
+        if dataset_id and not csv_data and csv_stream is None:
+            df = get_dataset_store().load(dataset_id)
+            if df is None:
+                return jsonify({'success': False, 'error': 'Dataset not found'}), 404
+            dataset_id_saved = None
+        else:
+            # Parse CSV data
+            try:
+                if csv_stream is not None:
+                    # Uploads must be consumed while the request is open, even for async jobs
+                    df = read_csv_stream(csv_stream)
+                elif not run_async or save_dataset:
+                    df = robust_read_csv(csv_data)
+                else:
+                    df = None
+                if df is not None:
+                    print(f"✅ CSV parsed successfully!")
+                    print(f"   Dataset shape: {df.shape[0]} rows × {df.shape[1]} columns")
+                    print(f"   Columns: {list(df.columns)}")
+                    print(f"   Data preview:\n{df.head()}\n")
+            except Exception as e:
+                print(f"❌ CSV parsing error: {str(e)}")
+                return jsonify({'success': False, 'error': f"CSV parsing error: {str(e)}"}), 400
 
-        # Train and evaluate
-        print(f"🚀 Starting training with model type: {model_type}")
-        print(f"   Input features: {input_features}")
-        print(f"   Output feature: {output_feature}\n")
-        results = trainer.train_and_evaluate(df, input_features, output_feature)
-        
-        print(f"\n✅ Training completed!")
-        print(f"   Best Model: {results['best_model']}")
-        print(f"   All Results:")
-        for result in results['results']:
-            print(f"      - {result['algorithm']}: {result['metrics']} (score: {result['score']:.4f})")
-        print(f"   Justification: {results['justification']}\n")
+            dataset_id_saved = get_dataset_store().save(df, model_name) if save_dataset else None
 
-        # Save model and metadata to disk
-        try:
-            # Get best model metrics
-            best_metrics = None
-            for result in results['results']:
-                if result['algorithm'] == results['best_model']:
-                    best_metrics = result['metrics']
-                    break
-
-            # Serialize and save the model
-            model_file_path = ModelSerializer.save_model(
-                trainer.best_model,
-                1,  # Temporary ID, will be updated after DB insert
-                model_name
+        if run_async:
+            job_id = get_job_manager().submit(
+                _run_training_job, model_name, description, model_type,
+                df if df is not None else csv_data, input_features, output_feature, selection,
+                description=model_name
             )
+            if job_id is None:
+                return jsonify({'success': False, 'error': 'Too many training jobs pending, try again later'}), 503
 
-            # Save preprocessing metadata
-            metadata = {
-                'label_encoders': ModelSerializer.serialize_preprocessing(trainer.label_encoders, trainer.scaler)['label_encoders'],
-                'scaler': ModelSerializer.serialize_preprocessing(trainer.label_encoders, trainer.scaler)['scaler'],
-                'input_features': input_features,
-                'output_feature': output_feature,
-                'model_type': model_type
+            response_data = {
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}'
             }
+            if dataset_id_saved:
+                response_data['dataset_id'] = dataset_id_saved
+            return jsonify(response_data), 202
 
-            metadata_file_path = ModelSerializer.save_metadata(1, metadata)
-
-            # Save to database
-            if db:
-                model_id = db.save_model(
-                    model_name=model_name,
-                    description=description,
-                    model_type=model_type,
-                    best_algorithm=results['best_model'],
-                    metrics=best_metrics,
-                    justification=results['justification'],
-                    model_file_path=model_file_path,
-                    input_features=input_features,
-                    output_feature=output_feature,
-                    all_results=results['results']
-                )
+        # Reuse the leaderboard and best model of an identical earlier request
+        fingerprint = _training_fingerprint(df, model_type, input_features, output_feature, selection)
+        cached = get_training_cache().get(fingerprint)
 
-                # Update model files with correct ID
-                if model_id:
-                    # Rename files with actual model_id
-                    new_model_path = os.path.join(
-                        config.MODEL_STORAGE_PATH,
-                        f"model_{model_id}_{model_name.replace(' ', '_')}.pkl"
-                    )
-                    os.rename(model_file_path, new_model_path)
+        trainer = None
+        if cached is None:
+            # Initialize trainer
+            trainer = MLModelTrainer(model_type, selection=selection)
 
-                    new_metadata_path = os.path.join(
-                        config.MODEL_STORAGE_PATH,
-                        f"metadata_{model_id}.json"
-                    )
-                    os.rename(metadata_file_path, new_metadata_path)
-
-                    response_data = {
-                        'success': True,
-                        'model_id': model_id,
-                        'model_name': model_name,
-                        'description': description,
-                        'model_type': model_type,
-                        'results': results['results'],
-                        'best_model': results['best_model'],
-                        'justification': results['justification']
-                    }
-                    
-                    print(f"💾 Model saved successfully!")
-                    print(f"   Model ID: {model_id}")
-                    print(f"   Model Path: {new_model_path}")
-                    print(f"   Metadata Path: {new_metadata_path}")
-                    print(f"   Response: {response_data}\n")
-                    
-                    return jsonify(response_data), 201
+            # Train and evaluate
+            results = _train(trainer, df, input_features, output_feature)
+
+        # Save model and metadata to disk
+        try:
+            if cached:
+                response_data = _save_cached_model(
+                    cached, model_name, description, model_type,
+                    input_features, output_feature
+                )
+            else:
+                response_data = _save_trained_model(
+                    trainer, results, model_name, description, model_type,
+                    input_features, output_feature, fingerprint
+                )
+            if response_data:
+                if dataset_id_saved:
+                    response_data['dataset_id'] = dataset_id_saved
+                return jsonify(response_data), 201
 
             # If DB save failed but files were saved
             return jsonify({
@@ -517,6 +925,264 @@ def train_model():
         }), 400
 
 
+def _train(trainer, df, input_features, output_feature):
+    """Run the trainer's leaderboard and log the outcome"""
+    print(f"🚀 Starting training with model type: {trainer.model_type}")
+    print(f"   Input features: {input_features}")
+    print(f"   Output feature: {output_feature}\n")
+    results = trainer.train_and_evaluate(df, input_features, output_feature)
+
+    print(f"\n✅ Training completed!")
+    print(f"   Best Model: {results['best_model']}")
+    print(f"   All Results:")
+    for result in results['results']:
+        print(f"      - {result['algorithm']}: {result['metrics']} (score: {result['score']:.4f})")
+    print(f"   Justification: {results['justification']}\n")
+    return results
+
+
+def _training_fingerprint(df, model_type, input_features, output_feature, selection=None):
+    """Fingerprint a parsed dataset together with the settings that affect training"""
+    return TrainingCache.fingerprint(
+        df,
+        model_type=model_type,
+        input_features=input_features,
+        output_feature=output_feature,
+        selection=selection or config.TRAINING_SELECTION,
+        float32=config.TRAINING_FLOAT32,
+        halving_min_samples=config.HALVING_MIN_SAMPLES,
+        subsample_min_rows=config.SUBSAMPLE_MIN_ROWS,
+        subsample_score_stderr=config.SUBSAMPLE_SCORE_STDERR
+    )
+
+
+def _save_trained_model(trainer, results, model_name, description, model_type,
+                        input_features, output_feature, fingerprint=None):
+    """Serialize the best model and its metadata, then record it in the database
+
+    When a fingerprint is given the run is also stored in the training cache.
+    Returns the API response payload, or None if the database save failed.
+    """
+    # Serialize and save the model
+    model_file_path = ModelSerializer.save_model(
+        trainer.best_model,
+        1,  # Temporary ID, will be updated after DB insert
+        model_name
+    )
+    preprocessing = ModelSerializer.serialize_preprocessing(trainer.label_encoders, trainer.scaler)
+
+    if fingerprint:
+        get_training_cache().put(fingerprint, results, preprocessing, model_file_path)
+
+    return _register_model(
+        model_file_path, preprocessing, results, model_name, description,
+        model_type, input_features, output_feature
+    )
+
+
+def _save_cached_model(cached, model_name, description, model_type,
+                       input_features, output_feature):
+    """Register a model from a training cache entry without retraining or re-pickling it"""
+    model_file_path = ModelSerializer.copy_model(
+        cached['model_path'],
+        1,  # Temporary ID, will be updated after DB insert
+        model_name
+    )
+
+    response_data = _register_model(
+        model_file_path, cached['preprocessing'], cached, model_name, description,
+        model_type, input_features, output_feature
+    )
+    if response_data:
+        response_data['cached'] = True
+    return response_data
+
+
+def _register_model(model_file_path, preprocessing, results, model_name, description,
+                    model_type, input_features, output_feature):
+    """Save preprocessing metadata and the database record for a serialized model
+
+    Returns the API response payload, or None if the database save failed.
+    """
+    # Get best model metrics
+    best_metrics = None
+    for result in results['results']:
+        if result['algorithm'] == results['best_model']:
+            best_metrics = result['metrics']
+            break
+
+    # Save to database
+    if not db:
+        return None
+
+    model_id = db.save_model(
+        model_name=model_name,
+        description=description,
+        model_type=model_type,
+        best_algorithm=results['best_model'],
+        metrics=best_metrics,
+        justification=results['justification'],
+        model_file_path=model_file_path,
+        input_features=input_features,
+        output_feature=output_feature,
+        all_results=results['results']
+    )
+    if not model_id:
+        return None
+
+    # Rename files with actual model_id
+    new_model_path = os.path.join(
+        config.MODEL_STORAGE_PATH,
+        f"model_{model_id}_{model_name.replace(' ', '_')}.pkl"
+    )
+    os.rename(model_file_path, new_model_path)
+
+    # Save preprocessing metadata under the model's own ID, so concurrent jobs never share a file
+    metadata = {
+        'label_encoders': preprocessing['label_encoders'],
+        'scaler': preprocessing['scaler'],
+        'input_features': input_features,
+        'output_feature': output_feature,
+        'model_type': model_type
+    }
+    new_metadata_path = ModelSerializer.save_metadata(model_id, metadata)
+
+    # Compile preprocessing once so prediction requests skip sklearn transformers
+    new_preprocessing_path = ModelSerializer.save_compiled_preprocessing(
+        model_id, CompiledPreprocessing.from_serialized(preprocessing)
+    )
+
+    response_data = {
+        'success': True,
+        'model_id': model_id,
+        'model_name': model_name,
+        'description': description,
+        'model_type': model_type,
+        'results': results['results'],
+        'best_model': results['best_model'],
+        'justification': results['justification']
+    }
+
+    print(f"💾 Model saved successfully!")
+    print(f"   Model ID: {model_id}")
+    print(f"   Model Path: {new_model_path}")
+    print(f"   Metadata Path: {new_metadata_path}")
+    print(f"   Preprocessing Path: {new_preprocessing_path}")
+    print(f"   Response: {response_data}\n")
+
+    return response_data
+
+
+def _run_training_job(job, model_name, description, model_type, dataset,
+                      input_features, output_feature, selection=None):
+    """Background job body for asynchronous /api/train requests
+
+    ``dataset`` is either the raw CSV string or an already-parsed DataFrame
+    (streamed uploads are parsed before the request closes).
+    """
+    if isinstance(dataset, pd.DataFrame):
+        df = dataset
+    else:
+        df = robust_read_csv(dataset)
+        print(f"✅ CSV parsed for job {job.job_id}: {df.shape[0]} rows × {df.shape[1]} columns")
+
+    fingerprint = _training_fingerprint(df, model_type, input_features, output_feature, selection)
+    cached = get_training_cache().get(fingerprint)
+    if cached:
+        job.set_algorithms([r['algorithm'] for r in cached['results']])
+        for r in cached['results']:
+            job.update_algorithm(r['algorithm'], 'eliminated' if 'eliminated_at_rung' in r else 'completed')
+
+        response_data = _save_cached_model(
+            cached, model_name, description, model_type,
+            input_features, output_feature
+        )
+    else:
+        trainer = MLModelTrainer(model_type, progress_callback=job.update_algorithm, selection=selection)
+        job.set_algorithms(list(trainer.get_algorithms().keys()))
+
+        results = _train(trainer, df, input_features, output_feature)
+
+        response_data = _save_trained_model(
+            trainer, results, model_name, description, model_type,
+            input_features, output_feature, fingerprint
+        )
+    if not response_data:
+        raise RuntimeError('Model trained but failed to save to database')
+    return response_data
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Get status, per-algorithm progress and result of a training job"""
+    job = get_job_manager().get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    return jsonify({'success': True, 'job': job}), 200
+
+
+# ==================== DATASET ENDPOINTS ====================
+
+@app.route('/api/datasets', methods=['POST'])
+def upload_dataset():
+    """Parse an uploaded CSV once and store it for later training requests
+
+    Accepts the CSV as JSON ``csv_data``, a multipart ``file`` upload or a
+    raw ``text/csv`` body. The returned ``dataset_id`` can be passed to
+    ``/api/train`` instead of ``csv_data``.
+    """
+    try:
+        data, csv_stream = _get_request_data()
+        if csv_stream is None and not data.get('csv_data'):
+            return jsonify({'success': False, 'error': 'No CSV data provided'}), 400
+
+        try:
+            df = read_csv_stream(csv_stream) if csv_stream is not None else robust_read_csv(data['csv_data'])
+        except Exception as e:
+            return jsonify({'success': False, 'error': f"CSV parsing error: {str(e)}"}), 400
+
+        dataset_id = get_dataset_store().save(df, data.get('name', ''))
+        return jsonify({
+            'success': True,
+            'dataset': get_dataset_store().get_info(dataset_id)
+        }), 201
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/datasets', methods=['GET'])
+def list_datasets():
+    """List stored datasets"""
+    try:
+        datasets = get_dataset_store().list()
+        return jsonify({'success': True, 'datasets': datasets, 'count': len(datasets)}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/datasets/<dataset_id>', methods=['GET'])
+def get_dataset(dataset_id):
+    """Get a stored dataset's columns and row count"""
+    dataset = get_dataset_store().get_info(dataset_id)
+    if not dataset:
+        return jsonify({'success': False, 'error': 'Dataset not found'}), 404
+
+    return jsonify({'success': True, 'dataset': dataset}), 200
+
+
+@app.route('/api/datasets/<dataset_id>', methods=['DELETE'])
+def delete_dataset(dataset_id):
+    """Delete a stored dataset"""
+    try:
+        if get_dataset_store().delete(dataset_id):
+            return jsonify({'success': True, 'message': 'Dataset deleted successfully'}), 200
+        return jsonify({'success': False, 'error': 'Dataset not found'}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
 # ==================== MODEL MANAGEMENT ENDPOINTS ====================
 
 @app.route('/api/models', methods=['GET'])
@@ -620,6 +1286,8 @@ def update_model_endpoint(model_id):
 
         if db:
             success = db.update_model(model_id, **data)
+            get_model_cache().invalidate(model_id)
+            get_prediction_cache().invalidate(model_id)
 
             if success:
                 model = db.get_model(model_id)
@@ -643,6 +1311,8 @@ def delete_model_endpoint(model_id):
     try:
         if db:
             success = db.delete_model(model_id)
+            get_model_cache().invalidate(model_id)
+            get_prediction_cache().invalidate(model_id)
 
             if success:
                 return jsonify({'success': True, 'message': f'Model {model_id} deleted'}), 200
@@ -694,8 +1364,8 @@ def predict(model_id):
 
 def _make_prediction(model_info, request):
     """Helper function to make predictions"""
-    # Load model from disk
-    model = ModelSerializer.load_model(model_info['model_file_path'])
+    # Load model and compiled preprocessing (from the in-process cache when already loaded)
+    model, preprocessing = get_model_cache().get(model_info['id'], model_info['model_file_path'])
     if model is None:
         return jsonify({'success': False, 'error': 'Failed to load model'}), 500
 
@@ -705,22 +1375,24 @@ def _make_prediction(model_info, request):
         return jsonify({'success': False, 'error': 'Missing input data'}), 400
 
     # Convert single input to list if needed
-    if not isinstance(input_data, list):
+    single_row = not isinstance(input_data, list)
+    if single_row:
         input_data = [input_data]
 
     try:
-        # Preprocess input
-        preprocessing = PreprocessingPipeline()
-        X = preprocessing.preprocess_input(input_data, model_info['input_features'])
+        predict_rows = functools.partial(_predict_rows, model, preprocessing, model_info['input_features'])
 
-        # Make prediction
-        prediction = model.predict(X)
+        if single_row and MicroBatcherRegistry.enabled(model_info['id'], model_info.get('model_name')):
+            # Coalesce concurrent single-row requests into one predict call; the batcher is
+            # versioned by the model file, so it survives requests that reload the model
+            model_path = model_info['model_file_path']
+            batcher = get_micro_batchers().get(model_info['id'], (model_path, os.path.getmtime(model_path)), predict_rows)
+            predict_rows = lambda rows: [batcher.predict(rows[0])]
 
-        # Postprocess output
-        result = preprocessing.postprocess_output(prediction)
+        result = _cached_predict(model_info, predict_rows, input_data)
 
-        # Save prediction to database
-        db.save_prediction(model_info['id'], input_data, {'prediction': str(result)})
+        # Queue prediction for the background database writer
+        get_prediction_logger().log(model_info['id'], input_data, {'prediction': str(result)})
 
         return jsonify({
             'success': True,
@@ -732,6 +1404,29 @@ def _make_prediction(model_info, request):
     except Exception as e:
         return jsonify({'success': False, 'error': f'Prediction error: {str(e)}'}), 400
 
+def _predict_rows(model, preprocessing, input_features, rows):
+    """Preprocess, predict and decode a list of input records"""
+    X = preprocessing.preprocess_input(rows, input_features)
+    return preprocessing.decode_predictions(model.predict(X))
+
+def _cached_predict(model_info, predict_rows, rows):
+    """Predict rows through the result cache when it is enabled for the model"""
+    if not PredictionResultCache.enabled(model_info['id'], model_info.get('model_name')):
+        return predict_rows(rows)
+
+    # The model file's mtime versions the entries, so a re-saved model never serves stale results
+    version = os.path.getmtime(model_info['model_file_path'])
+    vectors = [
+        [row.get(f) for f in model_info['input_features']] if isinstance(row, dict) else [row]
+        for row in rows
+    ]
+    results, hits = get_prediction_cache().predict(model_info['id'], version, rows, vectors, predict_rows)
+
+    # Recorded in api_stats by track_api_call
+    g.cache_hits = hits
+    g.cache_misses = len(rows) - hits
+    return results
+
 @app.route('/<model_name>/predict_batch', methods=['POST'])
 @track_api_call
 def batch_predict_by_name(model_name):
@@ -805,8 +1500,8 @@ def batch_predict(model_id):
 
 def _make_batch_prediction(model_info, request):
     """Helper function to make batch predictions"""
-    # Load model from disk
-    model = ModelSerializer.load_model(model_info['model_file_path'])
+    # Load model and compiled preprocessing (from the in-process cache when already loaded)
+    model, preprocessing = get_model_cache().get(model_info['id'], model_info['model_file_path'])
     if model is None:
         return jsonify({'success': False, 'error': 'Failed to load model'}), 500
 
@@ -816,19 +1511,14 @@ def _make_batch_prediction(model_info, request):
         return jsonify({'success': False, 'error': 'Missing input data'}), 400
 
     try:
-        # Preprocess input
-        preprocessing = PreprocessingPipeline()
-        X = preprocessing.preprocess_input(input_data, model_info['input_features'])
+        # Preprocess, predict and decode (skipping rows whose results are cached)
+        predict_rows = functools.partial(_predict_rows, model, preprocessing, model_info['input_features'])
+        results = _cached_predict(model_info, predict_rows, input_data)
 
-        # Make predictions
-        predictions = model.predict(X)
-
-        # Postprocess outputs
-        results = preprocessing.postprocess_output(predictions)
-
-        # Save predictions to database
-        for i, input_item in enumerate(input_data):
-            db.save_prediction(model_info['id'], input_item, {'prediction': str(results[i])})
+        # Queue predictions for the background database writer
+        get_prediction_logger().log_many(
+            model_info['id'], input_data, [{'prediction': str(r)} for r in results]
+        )
 
         return jsonify({
             'success': True,
@@ -840,17 +1530,99 @@ def _make_batch_prediction(model_info, request):
     except Exception as e:
         return jsonify({'success': False, 'error': f'Batch prediction error: {str(e)}'}), 400
 
+@app.route('/<model_name>/predict_stream', methods=['POST'])
+@track_api_call
+def stream_predict_by_name(model_name):
+    """Score NDJSON or CSV rows streamed in the request body by model name"""
+    if not db:
+        return jsonify({'success': False, 'error': 'Database not available'}), 500
+
+    model_info = db.get_model_by_name(model_name)
+    if not model_info:
+        return jsonify({'success': False, 'error': 'Model not found'}), 404
+
+    return _make_stream_prediction(model_info, request)
+
+@app.route('/api/models/<int:model_id>/predict_stream', methods=['POST'])
+def stream_predict(model_id):
+    """Score NDJSON or CSV rows streamed in the request body by model ID"""
+    if not db:
+        return jsonify({'success': False, 'error': 'Database not available'}), 500
+
+    model_info = db.get_model(model_id)
+    if not model_info:
+        return jsonify({'success': False, 'error': 'Model not found'}), 404
+
+    return _make_stream_prediction(model_info, request)
+
+def _iter_record_chunks(request, chunk_rows):
+    """Yield lists of input records from an NDJSON or CSV request body, chunk by chunk"""
+    if request.mimetype in ('text/csv', 'application/csv'):
+        for chunk in read_csv_stream(request.stream, chunksize=chunk_rows):
+            yield chunk.to_dict('records')
+        return
+
+    records = []
+    for line in request.stream:
+        line = line.strip()
+        if not line:
+            continue
+        records.append(json.loads(line))
+        if len(records) >= chunk_rows:
+            yield records
+            records = []
+    if records:
+        yield records
+
+def _make_stream_prediction(model_info, request):
+    """Helper function to score a streamed request body chunk by chunk
+
+    Reads ``PREDICT_STREAM_CHUNK_ROWS`` rows at a time, predicts them with
+    one vectorized call and writes one NDJSON line per prediction, so
+    memory use does not grow with the number of rows. The last line
+    reports the row count, or the error that stopped the stream.
+    """
+    model, preprocessing = get_model_cache().get(model_info['id'], model_info['model_file_path'])
+    if model is None:
+        return jsonify({'success': False, 'error': 'Failed to load model'}), 500
+
+    input_features = model_info['input_features']
+
+    def generate():
+        rows = 0
+        try:
+            for records in _iter_record_chunks(request, config.PREDICT_STREAM_CHUNK_ROWS):
+                results = _predict_rows(model, preprocessing, input_features, records)
+                get_prediction_logger().log_many(
+                    model_info['id'], records, [{'prediction': str(r)} for r in results]
+                )
+                yield ''.join(
+                    json.dumps({'row': rows + i, 'prediction': r}, default=str) + '\n'
+                    for i, r in enumerate(results)
+                )
+                rows += len(results)
+            yield json.dumps({'success': True, 'rows': rows}) + '\n'
+        except Exception as e:
+            yield json.dumps({'success': False, 'rows': rows, 'error': f'Prediction error: {str(e)}'}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 # ==================== UTILITY ENDPOINTS ====================
 
 
 @app.route('/api/dashboard/stats', methods=['GET'])
 def get_dashboard_stats():
     """Get dashboard statistics for landing page"""
+    conn = None
+    cursor = None
     try:
         if not db:
             return jsonify({'success': False, 'error': 'Database not available'}), 500
         
-        cursor = db.connection.cursor(dictionary=True, buffered=True)
+        conn = db.acquire_connection()
+        if not conn:
+            return jsonify({'success': False, 'error': 'Database not available'}), 500
+        cursor = conn.cursor(dictionary=True, buffered=True)
         
         # Get total model count and breakdown by type
         cursor.execute("""
@@ -863,7 +1635,6 @@ def get_dashboard_stats():
         """)
         
         result = cursor.fetchone()
-        cursor.close()
         
         stats = {
             'totalModels': result['total_models'] or 0,
@@ -880,26 +1651,36 @@ def get_dashboard_stats():
     except Exception as e:
         print(f"Error getting dashboard stats: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
+    finally:
+        if conn:
+            db.release_connection(conn, cursor)
 
 
 @app.route('/api/parse-csv', methods=['POST'])
 
 def parse_csv():
-    """Parse CSV and return column information"""
+    """Parse CSV and return column information
+
+    Accepts the CSV as JSON ``csv_data``, a multipart ``file`` upload or a
+    raw ``text/csv`` body; uploads are summarized chunk by chunk.
+    """
     try:
-        csv_data = request.json.get('csv_data')
+        data, csv_stream = _get_request_data()
         try:
-            df = robust_read_csv(csv_data)
+            if csv_stream is not None:
+                summary = summarize_csv_stream(csv_stream)
+            else:
+                df = robust_read_csv(data.get('csv_data'))
+                summary = {
+                    'columns': df.columns.tolist(),
+                    'sample_data': df.head(5).to_dict('records'),
+                    'row_count': len(df),
+                    'column_types': df.dtypes.astype(str).to_dict()
+                }
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 400
 
-        return jsonify({
-            'success': True,
-            'columns': df.columns.tolist(),
-            'sample_data': df.head(5).to_dict('records'),
-            'row_count': len(df),
-            'column_types': df.dtypes.astype(str).to_dict()
-        }), 200
+        return jsonify({'success': True, **summary}), 200
 
     except Exception as e:
         return jsonify({
@@ -908,10 +1689,44 @@ def parse_csv():
         }), 400
 
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get hit/miss counters of the model, training and prediction caches"""
+    return jsonify({
+        'success': True,
+        'model_cache': get_model_cache().get_stats(),
+        'model_row_cache': db.model_cache.get_stats() if db else None,
+        'training_cache': get_training_cache().get_stats(),
+        'prediction_log': get_prediction_logger().get_stats(),
+        'prediction_cache': get_prediction_cache().get_stats()
+    }), 200
+
+
+@app.route('/api/micro-batching/stats', methods=['GET'])
+def get_micro_batching_stats():
+    """Get per-model micro-batching counters and batch size histograms"""
+    return jsonify({
+        'success': True,
+        'enabled_for': config.MICRO_BATCH_MODELS,
+        'models': get_micro_batchers().get_stats()
+    }), 200
+
+
+@app.route('/api/db/pool/stats', methods=['GET'])
+def get_db_pool_stats():
+    """Get database pool size, checkout counts and connection wait times"""
+    if not db:
+        return jsonify({'success': False, 'error': 'Database not available'}), 500
+    return jsonify({
+        'success': True,
+        'pool': db.get_pool_stats()
+    }), 200
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    db_status = 'connected' if db and db.connection.is_connected() else 'disconnected'
+    db_status = 'connected' if db and db.is_connected() else 'disconnected'
 
     return jsonify({
         'status': 'healthy',
@@ -0,0 +1,80 @@
+"""
+Batch predictions with a single model call and per-input results
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def validate_inputs(inputs: List[Any], input_features: Optional[List[str]] = None,
+                    n_features: Optional[int] = None) -> Tuple[Dict[int, List], Dict[int, str]]:
+    """
+    Check batch inputs up front and order their values by feature
+
+    Args:
+        inputs: Objects keyed by feature name, or lists of feature values
+        input_features: Feature names in model order (objects must have all of them)
+        n_features: Number of features the model expects; without it (and
+            without input_features) the first valid input sets the width
+
+    Returns:
+        (vectors, errors): feature values of the valid inputs keyed by position,
+        and error messages of the invalid inputs keyed by position
+    """
+    vectors, errors = {}, {}
+    expected = len(input_features) if input_features else n_features
+
+    for i, inp in enumerate(inputs):
+        if isinstance(inp, dict):
+            if input_features:
+                missing = [str(f) for f in input_features if f not in inp]
+                if missing:
+                    errors[i] = f"Missing features: {', '.join(missing)}"
+                    continue
+                values = [inp[f] for f in input_features]
+            else:
+                values = list(inp.values())
+        elif isinstance(inp, list):
+            values = inp
+        else:
+            errors[i] = 'Each input must be an object or a list of feature values'
+            continue
+
+        expected = expected or len(values)
+        if len(values) != expected:
+            errors[i] = f'Expected {expected} features, got {len(values)}'
+            continue
+        vectors[i] = values
+
+    return vectors, errors
+
+
+def predict_inputs(inputs: List[Any], predict_rows: Callable[[List[List]], List[Any]],
+                   input_features: Optional[List[str]] = None, n_features: Optional[int] = None) -> List[Dict]:
+    """
+    Predict a batch with one predict call, keeping one result (or error) per input
+
+    Args:
+        inputs: Raw batch inputs (see validate_inputs)
+        predict_rows: Maps a list of feature vectors to a list of predictions
+        input_features: Feature names in model order
+        n_features: Number of features the model expects
+
+    Returns:
+        One {'success', 'prediction'} or {'success', 'error'} dict per input
+    """
+    vectors, errors = validate_inputs(inputs, input_features, n_features)
+    results = [{'success': False, 'error': errors.get(i)} for i in range(len(inputs))]
+    if not vectors:
+        return results
+
+    try:
+        for i, pred in zip(vectors, predict_rows(list(vectors.values()))):
+            results[i] = {'success': True, 'prediction': pred}
+    except Exception:
+        # A value the model rejects fails the whole call; retry row by row
+        # so the error is reported for the offending rows only
+        for i, values in vectors.items():
+            try:
+                results[i] = {'success': True, 'prediction': predict_rows([values])[0]}
+            except Exception as e:
+                results[i] = {'success': False, 'error': str(e)}
+    return results
@@ -14,10 +14,64 @@ DB_USER = os.getenv('DB_USER', 'root')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
 DB_NAME = os.getenv('DB_NAME', 'ml_models')
 DB_PORT = int(os.getenv('DB_PORT', 3306))
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))  # Pooled MySQL connections per process (MySQL Connector allows at most 32)
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))  # Seconds to wait for a free pooled connection before failing
 
 # Model Storage Configuration
 MODEL_STORAGE_PATH = os.getenv('MODEL_STORAGE_PATH', os.path.join(os.path.dirname(__file__), 'models'))
 MAX_MODEL_SIZE = 100 * 1024 * 1024  # 100MB
+MODEL_ROW_CACHE_TTL = float(os.getenv('MODEL_ROW_CACHE_TTL', 30))  # Seconds model rows are served from memory (0 disables)
+MODEL_CACHE_MAX_ENTRIES = int(os.getenv('MODEL_CACHE_MAX_ENTRIES', 32))  # Unpickled models kept in memory (0 disables)
+MODEL_CACHE_MAX_BYTES = int(os.getenv('MODEL_CACHE_MAX_BYTES', 1024 * 1024 * 1024))  # 1GB, estimated from pickle size
+DATASET_STORAGE_PATH = os.getenv('DATASET_STORAGE_PATH', os.path.join(MODEL_STORAGE_PATH, 'datasets'))
+
+# CSV Upload Configuration
+CSV_SNIFF_BYTES = int(os.getenv('CSV_SNIFF_BYTES', 16 * 1024))  # Bytes inspected to detect separator and dtypes
+CSV_ENGINE = os.getenv('CSV_ENGINE', 'auto')  # 'auto' (pyarrow if installed) or 'c'
+CSV_CHUNK_ROWS = int(os.getenv('CSV_CHUNK_ROWS', 100000))  # Rows per chunk when summarizing uploads
+
+# Streaming Prediction Configuration
+PREDICT_STREAM_CHUNK_ROWS = int(os.getenv('PREDICT_STREAM_CHUNK_ROWS', 5000))  # Rows scored per predict call
+
+# Unified API Configuration
+PRELOAD_MODELS = os.getenv('PRELOAD_MODELS', '*')  # Models loaded and warmed up at startup: '*', comma-separated names, or empty
+PRELOAD_WORKERS = int(os.getenv('PRELOAD_WORKERS', 4))  # Threads used to preload models
+MODEL_REGISTRY_RESCAN_SECONDS = float(os.getenv('MODEL_REGISTRY_RESCAN_SECONDS', 5))  # Interval of the models directory rescan (0 disables it)
+ASGI_PREDICT_WORKERS = int(os.getenv('ASGI_PREDICT_WORKERS', os.cpu_count() or 1))  # Threads running model loads and predictions in unified_asgi.py
+
+# Serving Configuration (serve.py)
+SERVE_WORKERS = int(os.getenv('SERVE_WORKERS', os.cpu_count() or 1))  # Worker processes forked by the pre-fork server
+SERVE_BACKLOG = int(os.getenv('SERVE_BACKLOG', 1024))  # Pending connections queued on the shared socket
+SERVE_SHUTDOWN_TIMEOUT = float(os.getenv('SERVE_SHUTDOWN_TIMEOUT', 30))  # Seconds workers get to finish requests before being killed
+
+# Micro-batching Configuration
+MICRO_BATCH_MODELS = os.getenv('MICRO_BATCH_MODELS', '')  # Comma-separated model names/IDs, '*' for all, empty disables
+MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', 64))  # Rows per coalesced predict call
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', 2))  # Max wait for other rows to join a batch
+
+# Prediction Result Cache Configuration
+PREDICTION_CACHE_MODELS = os.getenv('PREDICTION_CACHE_MODELS', '')  # Comma-separated model names/IDs, '*' for all, empty disables
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', 300))  # Seconds a cached prediction stays valid
+PREDICTION_CACHE_MAX_BYTES = int(os.getenv('PREDICTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # Memory budget for cached predictions
+
+# Prediction Logging Configuration
+PREDICTION_LOG_BATCH_SIZE = int(os.getenv('PREDICTION_LOG_BATCH_SIZE', 500))  # Records per batched insert
+PREDICTION_LOG_FLUSH_MS = int(os.getenv('PREDICTION_LOG_FLUSH_MS', 200))  # Max wait before a partial batch is written
+PREDICTION_LOG_MAX_QUEUE = int(os.getenv('PREDICTION_LOG_MAX_QUEUE', 50000))  # Records waiting to be written
+PREDICTION_LOG_POLICY = os.getenv('PREDICTION_LOG_POLICY', 'drop')  # 'drop' or 'block' when the queue is full
+
+# Training Configuration
+TRAINING_WORKERS = int(os.getenv('TRAINING_WORKERS', 1))  # Processes used to evaluate algorithms (1 = sequential)
+TRAINING_FLOAT32 = os.getenv('TRAINING_FLOAT32', 'false').lower() in ('1', 'true', 'yes')  # Halve feature memory
+TRAINING_SELECTION = os.getenv('TRAINING_SELECTION', 'full')  # 'full' or 'successive_halving'
+HALVING_MIN_SAMPLES = int(os.getenv('HALVING_MIN_SAMPLES', 1000))  # Training rows in the first halving rung
+SUBSAMPLE_MIN_ROWS = int(os.getenv('SUBSAMPLE_MIN_ROWS', 50000))  # Rank candidates on a sample from this many rows (0 disables)
+SUBSAMPLE_SCORE_STDERR = float(os.getenv('SUBSAMPLE_SCORE_STDERR', 0.01))  # Target standard error of sample scores
+TRAINING_CACHE_PATH = os.getenv('TRAINING_CACHE_PATH', os.path.join(MODEL_STORAGE_PATH, 'training_cache'))
+TRAINING_CACHE_MAX_BYTES = int(os.getenv('TRAINING_CACHE_MAX_BYTES', 500 * 1024 * 1024))  # 500MB, 0 disables
+TRAINING_JOB_WORKERS = int(os.getenv('TRAINING_JOB_WORKERS', 2))  # Background training jobs run concurrently
+TRAINING_JOB_MAX_PENDING = int(os.getenv('TRAINING_JOB_MAX_PENDING', 20))  # Queued + running jobs before rejecting
+TRAINING_JOB_HISTORY = int(os.getenv('TRAINING_JOB_HISTORY', 100))  # Finished jobs kept for status lookups
 
 # Ensure model storage directory exists
 os.makedirs(MODEL_STORAGE_PATH, exist_ok=True)
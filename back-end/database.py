@@ -2,30 +2,101 @@
 Database module for handling MySQL connections and model storage
 """
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+import copy
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, List, Dict
 import config
+from model_serializer import ModelSerializer
 # from database import get_db
 from api_statistics import create_api_stats_tables
 
+class ModelRowCache:
+    """TTL read-through cache of model rows, keyed by ID and by name
+
+    Rows are stored with their JSON columns already parsed. Every model
+    write bumps a version counter; a read that started before a write is
+    not stored, so a stale row can never be cached after invalidation.
+    The TTL bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, ttl: float = None):
+        self.ttl = config.MODEL_ROW_CACHE_TTL if ttl is None else ttl
+        self.by_id = {}  # model_id -> (expires_at, row)
+        self.by_name = {}  # model_name -> (expires_at, row)
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, table: Dict, key) -> Optional[Dict]:
+        """Return a copy of a fresh cached row, or None on a miss"""
+        with self._lock:
+            entry = table.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            table.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, table: Dict, key, row: Dict, version: int):
+        """Store a row read at ``version`` unless a write happened meanwhile"""
+        if self.ttl <= 0 or row is None:
+            return
+        with self._lock:
+            if version == self.version:
+                table[key] = (time.monotonic() + self.ttl, copy.deepcopy(row))
+
+    def invalidate(self, model_id: int = None):
+        """Drop a model's rows (names may change, so all name entries go)"""
+        with self._lock:
+            self.version += 1
+            self.by_id.pop(model_id, None)
+            self.by_name.clear()
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.by_id) + len(self.by_name),
+                'ttl': self.ttl
+            }
+
+
 class DatabaseManager:
     """Handles all database operations for ML models with connection pooling"""
     
     def __init__(self):
         self.pool = None
-        self.connection = None  # For backward compatibility with create_tables
+        self.pool_size = config.DB_POOL_SIZE
+        self.model_cache = ModelRowCache()
+        # Connections handed out are bounded here so a busy pool makes callers
+        # wait (up to DB_POOL_TIMEOUT) instead of failing immediately
+        self._pool_slots = threading.BoundedSemaphore(self.pool_size)
+        self._pool_lock = threading.Lock()
+        self.pool_checkouts = 0
+        self.pool_timeouts = 0
+        self.pool_in_use = 0
+        self.pool_peak_in_use = 0
+        self.pool_wait_total = 0.0
+        self.pool_wait_max = 0.0
         self.connect()
     
     def connect(self):
         """Establish connection pool to MySQL database"""
         try:
-            from mysql.connector import pooling
             self.pool = pooling.MySQLConnectionPool(
                 pool_name="ml_model_pool",
-                pool_size=10,  # Number of connections in the pool
+                pool_size=self.pool_size,  # Number of connections in the pool
                 pool_reset_session=True,
                 host=config.DB_HOST,
                 user=config.DB_USER,
@@ -33,30 +104,155 @@ class DatabaseManager:
                 database=config.DB_NAME,
                 port=config.DB_PORT
             )
-            # Get a connection for initialization (create_tables)
-            self.connection = self.pool.get_connection()
-            print("✓ Database connection pool established")
+            print(f"✓ Database connection pool established ({self.pool_size} connections)")
         except Error as e:
             print(f"✗ Error connecting to database: {e}")
             raise
     
+    def acquire_connection(self):
+        """
+        Borrow a pool connection; give it back with release_connection()
+        
+        Waits up to DB_POOL_TIMEOUT seconds for a free connection.
+        
+        Returns: the connection, or None if the pool is missing or stayed busy
+        """
+        if not self.pool:
+            return None
+        
+        started = time.perf_counter()
+        if not self._pool_slots.acquire(timeout=config.DB_POOL_TIMEOUT):
+            with self._pool_lock:
+                self.pool_timeouts += 1
+            print(f"✗ No database connection available after {config.DB_POOL_TIMEOUT}s")
+            return None
+        
+        try:
+            conn = self.pool.get_connection()
+        except Error as e:
+            self._pool_slots.release()
+            print(f"✗ Error getting a pooled connection: {e}")
+            return None
+        
+        wait = time.perf_counter() - started
+        with self._pool_lock:
+            self.pool_checkouts += 1
+            self.pool_in_use += 1
+            self.pool_peak_in_use = max(self.pool_peak_in_use, self.pool_in_use)
+            self.pool_wait_total += wait
+            self.pool_wait_max = max(self.pool_wait_max, wait)
+        return conn
+    
+    def release_connection(self, conn, cursor=None):
+        """
+        Give a connection borrowed with acquire_connection() back to the pool
+        
+        ``cursor``, if given, is closed first. The connection and its pool
+        slot are given back even if closing the cursor or the connection raises.
+        """
+        try:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Error as e:
+                    print(f"✗ Error closing cursor: {e}")
+            conn.close()
+        except Error as e:
+            # Resetting the session failed; the pool has taken the connection back regardless
+            print(f"✗ Error returning connection to the pool: {e}")
+        finally:
+            with self._pool_lock:
+                self.pool_in_use -= 1
+            self._pool_slots.release()
+    
+    @contextmanager
+    def pooled_connection(self):
+        """
+        Borrow a pool connection for one operation
+        
+        Raises PoolError when no connection is available (see
+        acquire_connection). If the block raises, uncommitted work is rolled
+        back. The connection always goes back to the pool.
+        """
+        conn = self.acquire_connection()
+        if not conn:
+            raise PoolError("No database connection available")
+        
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Error:
+                pass
+            raise
+        finally:
+            self.release_connection(conn)
+    
     def get_connection(self):
-        """Get a connection from the pool"""
+        """Get a raw connection from the pool (prefer acquire_connection, which is bounded and measured)"""
         if self.pool:
             return self.pool.get_connection()
         return None
     
     def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("✓ Database connection closed")
+        """Close the idle connections of the pool (they reconnect on next use)"""
+        if not self.pool:
+            return
+        
+        # Borrow every idle connection, holding its slot so no caller waits on the pool meanwhile
+        idle = []
+        while self._pool_slots.acquire(blocking=False):
+            try:
+                idle.append(self.pool.get_connection())
+            except Error:
+                self._pool_slots.release()
+                break
+        
+        for conn in idle:
+            try:
+                conn.disconnect()
+            except Error:
+                pass
+            try:
+                conn.close()  # Back to the pool, disconnected
+            except Error:
+                pass  # Resetting the session of a closed connection fails
+            self._pool_slots.release()
+        print(f"✓ Database connections closed ({len(idle)} idle)")
+    
+    def is_connected(self) -> bool:
+        """Whether a pool connection can be borrowed and reaches the server"""
+        try:
+            with self.pooled_connection() as conn:
+                return conn.is_connected()
+        except Error:
+            return False
+    
+    def get_pool_stats(self) -> Dict:
+        """Get pool size, checkout counts and wait times"""
+        with self._pool_lock:
+            return {
+                'pool_size': self.pool_size,
+                'in_use': self.pool_in_use,
+                'peak_in_use': self.pool_peak_in_use,
+                'checkouts': self.pool_checkouts,
+                'timeouts': self.pool_timeouts,
+                'wait_ms_avg': round(self.pool_wait_total / self.pool_checkouts * 1000, 3) if self.pool_checkouts else 0.0,
+                'wait_ms_max': round(self.pool_wait_max * 1000, 3),
+                'timeout_seconds': config.DB_POOL_TIMEOUT
+            }
     
     def create_tables(self):
         """Create necessary tables if they don't exist"""
-        cursor = self.connection.cursor(buffered=True)
+        conn = self.acquire_connection()
+        if not conn:
+            raise PoolError("No database connection available")
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             # Models table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS models (
@@ -106,14 +302,28 @@ class DatabaseManager:
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
             """)
             
-            self.connection.commit()
+            # Per-fold results of algorithms evaluated with k-fold cross-validation
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS training_fold_results (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    model_id INT NOT NULL,
+                    algorithm_name VARCHAR(255) NOT NULL,
+                    fold INT NOT NULL,
+                    metrics JSON NOT NULL,
+                    score FLOAT NOT NULL,
+                    INDEX idx_model_id (model_id),
+                    FOREIGN KEY (model_id) REFERENCES models(id) ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+            """)
+            
+            conn.commit()
             print("✓ Database tables created successfully")
         except Error as e:
             print(f"✗ Error creating tables: {e}")
-            self.connection.rollback()
+            conn.rollback()
             raise
         finally:
-            cursor.close()
+            self.release_connection(conn, cursor)
     
     def save_model(self, model_name: str, description: str, model_type: str,
                    best_algorithm: str, metrics: Dict, justification: str,
@@ -122,11 +332,21 @@ class DatabaseManager:
         """
         Save model information to database
         
+        The model row, one training result per algorithm and the per-fold
+        results of k-fold runs (``fold_results`` in each result) are written
+        with batched inserts in a single transaction: either all of them are
+        stored or none.
+        
         Returns: model_id if successful, None otherwise
         """
-        cursor = self.connection.cursor(buffered=True)
+        conn = self.acquire_connection()
+        if not conn:
+            return None
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             # Determine accuracy/score value
             if model_type == 'classification':
                 accuracy = metrics.get('f1_score')
@@ -156,51 +376,84 @@ class DatabaseManager:
             
             model_id = cursor.lastrowid
             
-            # Save all training results
-            for result in all_results:
-                self.save_training_result(model_id, result['algorithm'], 
-                                        result['metrics'], result['score'])
+            # Save all training results in one batched insert
+            cursor.executemany("""
+                INSERT INTO training_results (model_id, algorithm_name, metrics, score)
+                VALUES (%s, %s, %s, %s)
+            """, [
+                (model_id, result['algorithm'], json.dumps(result['metrics']), float(result['score']))
+                for result in all_results
+            ])
+            
+            fold_rows = [
+                (model_id, result['algorithm'], fold['fold'], json.dumps(fold['metrics']), float(fold['score']))
+                for result in all_results
+                for fold in result.get('fold_results', [])
+            ]
+            if fold_rows:
+                cursor.executemany("""
+                    INSERT INTO training_fold_results (model_id, algorithm_name, fold, metrics, score)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, fold_rows)
             
-            self.connection.commit()
+            conn.commit()
+            self.model_cache.invalidate(model_id)
             print(f"✓ Model saved to database with ID: {model_id}")
             return model_id
             
         except Error as e:
             print(f"✗ Error saving model: {e}")
-            self.connection.rollback()
+            conn.rollback()
             return None
         finally:
-            cursor.close()
+            self.release_connection(conn, cursor)
     
     def save_training_result(self, model_id: int, algorithm_name: str,
                             metrics: Dict, score: float):
         """Save individual algorithm training result"""
-        cursor = self.connection.cursor(buffered=True)
+        conn = self.acquire_connection()
+        if not conn:
+            return
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             query = """
                 INSERT INTO training_results (model_id, algorithm_name, metrics, score)
                 VALUES (%s, %s, %s, %s)
             """
             cursor.execute(query, (model_id, algorithm_name, json.dumps(metrics), score))
-            self.connection.commit()
+            conn.commit()
         except Error as e:
             print(f"✗ Error saving training result: {e}")
-            self.connection.rollback()
+            conn.rollback()
         finally:
-            cursor.close()
+            self.release_connection(conn, cursor)
     
     def get_model(self, model_id: int) -> Optional[Dict]:
-        """Retrieve model information from database"""
-        conn = self.get_connection()
+        """Retrieve model information, from the row cache when fresh"""
+        cached = self.model_cache.get(self.model_cache.by_id, model_id)
+        if cached is not None:
+            return cached
+
+        version = self.model_cache.version
+        result = self._fetch_model("SELECT * FROM models WHERE id = %s", model_id)
+        self.model_cache.put(self.model_cache.by_id, model_id, result, version)
+        return result
+
+    def _fetch_model(self, query: str, value) -> Optional[Dict]:
+        """Fetch one model row and parse its JSON columns"""
+        conn = self.acquire_connection()
         if not conn:
             return None
         
-        cursor = conn.cursor(dictionary=True, buffered=True)
+        cursor = None
         
         try:
-            query = "SELECT * FROM models WHERE id = %s"
-            cursor.execute(query, (model_id,))
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            
+            cursor.execute(query, (value,))
             result = cursor.fetchone()
             
             if result:
@@ -213,18 +466,19 @@ class DatabaseManager:
             print(f"✗ Error retrieving model: {e}")
             return None
         finally:
-            cursor.close()
-            conn.close()
+            self.release_connection(conn, cursor)
     
     def get_all_models(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Retrieve all models with pagination"""
-        conn = self.get_connection()
+        conn = self.acquire_connection()
         if not conn:
             return []
         
-        cursor = conn.cursor(dictionary=True, buffered=True)
+        cursor = None
         
         try:
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            
             query = """
                 SELECT id, model_name, description, model_type, best_algorithm, 
                        accuracy, created_at, updated_at
@@ -239,18 +493,19 @@ class DatabaseManager:
             print(f"✗ Error retrieving models: {e}")
             return []
         finally:
-            cursor.close()
-            conn.close()
+            self.release_connection(conn, cursor)
     
     def get_model_count(self) -> int:
         """Get total count of models"""
-        conn = self.get_connection()
+        conn = self.acquire_connection()
         if not conn:
             return 0
         
-        cursor = conn.cursor(buffered=True)
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             query = "SELECT COUNT(*) as count FROM models"
             cursor.execute(query)
             result = cursor.fetchone()
@@ -259,18 +514,19 @@ class DatabaseManager:
             print(f"✗ Error counting models: {e}")
             return 0
         finally:
-            cursor.close()
-            conn.close()
+            self.release_connection(conn, cursor)
     
     def get_training_results(self, model_id: int) -> List[Dict]:
         """Get all training results for a specific model"""
-        conn = self.get_connection()
+        conn = self.acquire_connection()
         if not conn:
             return []
         
-        cursor = conn.cursor(dictionary=True, buffered=True)
+        cursor = None
         
         try:
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            
             query = """
                 SELECT algorithm_name, metrics, score
                 FROM training_results
@@ -283,37 +539,96 @@ class DatabaseManager:
             for result in results:
                 result['metrics'] = json.loads(result['metrics'])
             
+            # Attach per-fold results of k-fold runs
+            cursor.execute("""
+                SELECT algorithm_name, fold, metrics, score
+                FROM training_fold_results
+                WHERE model_id = %s
+                ORDER BY fold
+            """, (model_id,))
+            folds = {}
+            for row in cursor.fetchall():
+                folds.setdefault(row['algorithm_name'], []).append({
+                    'fold': row['fold'],
+                    'metrics': json.loads(row['metrics']),
+                    'score': row['score']
+                })
+            for result in results:
+                if result['algorithm_name'] in folds:
+                    result['fold_results'] = folds[result['algorithm_name']]
+            
             return results
         except Error as e:
             print(f"✗ Error retrieving training results: {e}")
             return []
         finally:
-            cursor.close()
-            conn.close()
+            self.release_connection(conn, cursor)
     
     def save_prediction(self, model_id: int, input_data: Dict, prediction: Dict):
         """Save prediction history"""
-        cursor = self.connection.cursor(buffered=True)
+        conn = self.acquire_connection()
+        if not conn:
+            return
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             query = """
                 INSERT INTO predictions (model_id, input_data, prediction)
                 VALUES (%s, %s, %s)
             """
             cursor.execute(query, (model_id, json.dumps(input_data), json.dumps(prediction)))
-            self.connection.commit()
+            conn.commit()
             print(f"✓ Prediction saved for model {model_id}")
         except Error as e:
             print(f"✗ Error saving prediction: {e}")
-            self.connection.rollback()
+            conn.rollback()
         finally:
-            cursor.close()
+            self.release_connection(conn, cursor)
+    
+    def save_predictions(self, rows: List[tuple]) -> bool:
+        """
+        Save many prediction records in one transaction
+        
+        Args:
+            rows: (model_id, input_data JSON, prediction JSON) tuples
+        
+        Returns: True if the batch was committed
+        """
+        conn = self.acquire_connection()
+        if not conn:
+            return False
+        
+        cursor = None
+        
+        try:
+            cursor = conn.cursor(buffered=True)
+            
+            query = """
+                INSERT INTO predictions (model_id, input_data, prediction)
+                VALUES (%s, %s, %s)
+            """
+            cursor.executemany(query, rows)
+            conn.commit()
+            return True
+        except Error as e:
+            print(f"✗ Error saving {len(rows)} predictions: {e}")
+            conn.rollback()
+            return False
+        finally:
+            self.release_connection(conn, cursor)
     
     def delete_model(self, model_id: int) -> bool:
         """Delete a model and its associated data"""
-        cursor = self.connection.cursor(buffered=True)
+        conn = self.acquire_connection()
+        if not conn:
+            return False
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             # Get model file path
             query = "SELECT model_file_path FROM models WHERE id = %s"
             cursor.execute(query, (model_id,))
@@ -322,31 +637,39 @@ class DatabaseManager:
             if result:
                 model_file_path = result[0]
                 
-                # Delete model file
-                if os.path.exists(model_file_path):
-                    os.remove(model_file_path)
-                    print(f"✓ Model file deleted: {model_file_path}")
+                # Delete the model file and the artifacts saved alongside it
+                for path in (model_file_path, ModelSerializer.metadata_path(model_id),
+                             ModelSerializer.preprocessing_path(model_id)):
+                    if os.path.exists(path):
+                        os.remove(path)
+                        print(f"✓ Model file deleted: {path}")
                 
                 # Delete database records (cascade will handle related records)
                 delete_query = "DELETE FROM models WHERE id = %s"
                 cursor.execute(delete_query, (model_id,))
-                self.connection.commit()
+                conn.commit()
+                self.model_cache.invalidate(model_id)
                 print(f"✓ Model {model_id} deleted from database")
                 return True
             
             return False
         except Error as e:
             print(f"✗ Error deleting model: {e}")
-            self.connection.rollback()
+            conn.rollback()
             return False
         finally:
-            cursor.close()
+            self.release_connection(conn, cursor)
     
     def update_model(self, model_id: int, **kwargs) -> bool:
         """Update model information"""
-        cursor = self.connection.cursor(buffered=True)
+        conn = self.acquire_connection()
+        if not conn:
+            return False
+        cursor = None
         
         try:
+            cursor = conn.cursor(buffered=True)
+            
             allowed_fields = ['model_name', 'description']
             updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
             
@@ -358,23 +681,26 @@ class DatabaseManager:
             
             query = f"UPDATE models SET {set_clause} WHERE id = %s"
             cursor.execute(query, values)
-            self.connection.commit()
+            conn.commit()
+            self.model_cache.invalidate(model_id)
             print(f"✓ Model {model_id} updated")
             return True
         except Error as e:
             print(f"✗ Error updating model: {e}")
-            self.connection.rollback()
+            conn.rollback()
             return False
         finally:
-            cursor.close()
+            self.release_connection(conn, cursor)
 
     def get_model_by_name(self, model_name):
-        """Get model by name from database"""
-        cursor = self.conn.cursor(dictionary=True, buffered=True)
-        query = "SELECT * FROM models WHERE name = %s"
-        cursor.execute(query, (model_name,))
-        model = cursor.fetchone()
-        cursor.close()
+        """Get model by name, from the row cache when fresh"""
+        cached = self.model_cache.get(self.model_cache.by_name, model_name)
+        if cached is not None:
+            return cached
+
+        version = self.model_cache.version
+        model = self._fetch_model("SELECT * FROM models WHERE model_name = %s", model_name)
+        self.model_cache.put(self.model_cache.by_name, model_name, model, version)
         return model
 
 # Global database manager instance
@@ -385,6 +711,8 @@ def init_db():
     global db_manager
     db_manager = DatabaseManager()
     db_manager.create_tables()
+    with db_manager.pooled_connection() as conn:
+        create_api_stats_tables(conn)
     return db_manager
 
 def get_db():
@@ -393,6 +721,3 @@ def get_db():
     if db_manager is None:
         init_db()
     return db_manager
-
-db = get_db()
-create_api_stats_tables(db.connection)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Persistent columnar store for uploaded training datasets
+"""
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import config
+
+
+class DatasetStore:
+    """Saves parsed datasets as one .npy file per column so they can be memory-mapped
+
+    Numeric columns are stored with their own dtype. Text columns are stored
+    as integer category codes plus a sorted category list in the manifest,
+    which is also what MLModelTrainer encodes them to.
+    """
+
+    MANIFEST_FILE = 'manifest.json'
+
+    def __init__(self, storage_path: str = None):
+        """
+        Initialize dataset store
+
+        Args:
+            storage_path: Directory holding one sub-directory per dataset
+        """
+        self.storage_path = storage_path or config.DATASET_STORAGE_PATH
+
+    def _dataset_dir(self, dataset_id: str) -> str:
+        # Dataset IDs are generated hex strings; reject anything that could escape the store
+        if not dataset_id or not all(c in '0123456789abcdef' for c in dataset_id):
+            raise ValueError(f"Invalid dataset_id: {dataset_id}")
+        return os.path.join(self.storage_path, dataset_id)
+
+    def save(self, df: pd.DataFrame, name: str = '') -> str:
+        """
+        Save a parsed dataset
+
+        Args:
+            df: Parsed dataset
+            name: Optional label (e.g. original file name)
+
+        Returns:
+            dataset_id of the stored dataset
+        """
+        dataset_id = uuid.uuid4().hex
+        dataset_dir = self._dataset_dir(dataset_id)
+        tmp_dir = f"{dataset_dir}.tmp"
+
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            columns = []
+            for i, col in enumerate(df.columns):
+                series = df[col]
+                filename = f"col_{i}.npy"
+                column = {'name': str(col), 'file': filename, 'dtype': str(series.dtype)}
+
+                if pd.api.types.is_numeric_dtype(series.dtype):
+                    column['kind'] = 'numeric'
+                    values = series.to_numpy()
+                else:
+                    categorical = pd.Categorical(series)
+                    try:
+                        categorical = categorical.reorder_categories(sorted(categorical.categories))
+                    except TypeError:
+                        pass  # Mixed types cannot be sorted; keep order of appearance
+                    column['kind'] = 'categorical'
+                    column['categories'] = categorical.categories.tolist()
+                    values = categorical.codes
+
+                np.save(os.path.join(tmp_dir, filename), np.ascontiguousarray(values), allow_pickle=False)
+                columns.append(column)
+
+            manifest = {
+                'dataset_id': dataset_id,
+                'name': name,
+                'created_at': datetime.now().isoformat(),
+                'row_count': len(df),
+                'format': 'npy',
+                'columns': columns
+            }
+            with open(os.path.join(tmp_dir, self.MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, default=str)
+
+            os.rename(tmp_dir, dataset_dir)
+            print(f"✓ Dataset saved: {dataset_id} ({len(df)} rows × {len(columns)} columns)")
+            return dataset_id
+        except Exception as e:
+            print(f"✗ Error saving dataset: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def get_info(self, dataset_id: str) -> Optional[Dict]:
+        """Get a dataset's manifest, or None if it does not exist"""
+        try:
+            with open(os.path.join(self._dataset_dir(dataset_id), self.MANIFEST_FILE), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, dataset_id: str, mmap: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Load a stored dataset
+
+        Args:
+            dataset_id: ID returned by save()
+            mmap: Memory-map column files so only the columns that are used get read
+
+        Returns:
+            DataFrame (text columns as pandas Categorical) or None if not found.
+            With mmap, columns are read-only views of the column files.
+        """
+        manifest = self.get_info(dataset_id)
+        if manifest is None:
+            print(f"✗ Dataset not found: {dataset_id}")
+            return None
+
+        dataset_dir = self._dataset_dir(dataset_id)
+        data = {}
+        for column in manifest['columns']:
+            values = np.load(os.path.join(dataset_dir, column['file']), mmap_mode='r' if mmap else None)
+            if column['kind'] == 'categorical':
+                data[column['name']] = pd.Categorical.from_codes(values, categories=column['categories'])
+            else:
+                data[column['name']] = values
+
+        print(f"✓ Dataset loaded: {dataset_id}")
+        # Built from the dict with copy=False, pandas keeps each column in its own
+        # block backed by its memmap; assigning columns one at a time would copy them
+        return pd.DataFrame(data, copy=False)
+
+    def list(self) -> List[Dict]:
+        """List manifests of all stored datasets, newest first"""
+        if not os.path.isdir(self.storage_path):
+            return []
+
+        manifests = []
+        for dataset_id in os.listdir(self.storage_path):
+            if dataset_id.endswith('.tmp'):
+                continue
+            manifest = self.get_info(dataset_id) if all(c in '0123456789abcdef' for c in dataset_id) else None
+            if manifest:
+                manifests.append(manifest)
+        return sorted(manifests, key=lambda m: m['created_at'], reverse=True)
+
+    def delete(self, dataset_id: str) -> bool:
+        """Delete a stored dataset"""
+        dataset_dir = self._dataset_dir(dataset_id)
+        if not os.path.isdir(dataset_dir):
+            return False
+        shutil.rmtree(dataset_dir)
+        print(f"✓ Dataset deleted: {dataset_id}")
+        return True
+
+
+# Global dataset store instance
+dataset_store = None
+
+def get_dataset_store() -> DatasetStore:
+    """Get dataset store instance"""
+    global dataset_store
+    if dataset_store is None:
+        dataset_store = DatasetStore()
+    return dataset_store
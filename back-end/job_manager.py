@@ -0,0 +1,150 @@
+"""
+Background job manager for long-running training requests
+"""
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import config
+
+
+class TrainingJob:
+    """State and per-algorithm progress of a single training job"""
+
+    def __init__(self, job_id: str, description: str = ''):
+        self.job_id = job_id
+        self.description = description
+        self.status = 'queued'  # queued -> running -> completed | failed
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.algorithms = OrderedDict()
+        self.model_id = None
+        self.result = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def set_algorithms(self, names: List[str]):
+        """Register the algorithms that will be evaluated"""
+        with self._lock:
+            self.algorithms = OrderedDict((name, 'pending') for name in names)
+
+    def update_algorithm(self, name: str, status: str):
+        """Record the status of one algorithm ('running', 'completed', 'failed' or 'eliminated')"""
+        with self._lock:
+            self.algorithms[name] = status
+
+    def to_dict(self) -> Dict:
+        """Return a JSON-serializable snapshot of the job"""
+        with self._lock:
+            algorithms = dict(self.algorithms)
+            finished = sum(1 for s in algorithms.values() if s in ('completed', 'failed', 'eliminated'))
+            return {
+                'job_id': self.job_id,
+                'description': self.description,
+                'status': self.status,
+                'created_at': self.created_at.isoformat(),
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+                'progress': {
+                    'completed': finished,
+                    'total': len(algorithms),
+                    'algorithms': algorithms
+                },
+                'model_id': self.model_id,
+                'result': self.result,
+                'error': self.error
+            }
+
+
+class TrainingJobManager:
+    """Runs training jobs on a bounded thread pool and keeps their status in memory"""
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, max_history: int = None):
+        """
+        Initialize job manager
+
+        Args:
+            max_workers: Number of jobs that may train concurrently
+            max_pending: Maximum number of queued or running jobs before new ones are rejected
+            max_history: Number of finished jobs kept for status lookups
+        """
+        self.max_workers = max_workers or config.TRAINING_JOB_WORKERS
+        self.max_pending = max_pending or config.TRAINING_JOB_MAX_PENDING
+        self.max_history = max_history or config.TRAINING_JOB_HISTORY
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='training-job')
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, target: Callable[..., Dict], *args, description: str = '', **kwargs) -> Optional[str]:
+        """
+        Queue a job for background execution
+
+        Args:
+            target: Callable invoked as target(job, *args, **kwargs); returns the result dict
+            description: Short label shown in the job status
+
+        Returns:
+            Job ID, or None if too many jobs are already pending
+        """
+        with self._lock:
+            pending = sum(1 for j in self.jobs.values() if j.status in ('queued', 'running'))
+            if pending >= self.max_pending:
+                print(f"✗ Training job rejected: {pending} jobs already pending")
+                return None
+
+            job = TrainingJob(uuid.uuid4().hex, description)
+            self.jobs[job.job_id] = job
+            self._prune()
+
+        self.executor.submit(self._run, job, target, args, kwargs)
+        print(f"✓ Training job queued: {job.job_id}")
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a snapshot of a job's status, or None if unknown"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    def _run(self, job: TrainingJob, target: Callable[..., Dict], args: tuple, kwargs: Dict):
+        """Execute a job and record its outcome"""
+        job.status = 'running'
+        job.started_at = datetime.now()
+        try:
+            result = target(job, *args, **kwargs)
+            job.result = result
+            job.model_id = result.get('model_id') if isinstance(result, dict) else None
+            job.status = 'completed'
+            print(f"✓ Training job completed: {job.job_id}")
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = 'failed'
+            print(f"✗ Training job failed: {job.job_id}: {e}")
+        finally:
+            job.finished_at = datetime.now()
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the history limit (caller holds the lock)"""
+        finished = [job_id for job_id, j in self.jobs.items() if j.status in ('completed', 'failed')]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self.jobs[job_id]
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and optionally wait for running ones"""
+        self.executor.shutdown(wait=wait)
+
+
+# Global job manager instance
+job_manager = None
+
+def get_job_manager() -> TrainingJobManager:
+    """Get job manager instance"""
+    global job_manager
+    if job_manager is None:
+        job_manager = TrainingJobManager()
+    return job_manager
@@ -0,0 +1,179 @@
+"""
+Dynamic micro-batching of concurrent single-row predictions
+"""
+import threading
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Any, Callable, Dict, Hashable, List
+import config
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one vectorized predict call
+
+    Requests wait up to ``max_wait_ms`` (counted from the first queued row)
+    for up to ``max_batch`` rows to accumulate; a background thread then
+    calls ``predict_fn`` once with all of them and hands each request its
+    own result. If the batch fails, rows are retried one by one so a bad
+    input only fails its own request.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[Any]], List[Any]], max_batch: int = None,
+                 max_wait_ms: float = None, name: str = ''):
+        """
+        Initialize micro-batcher
+
+        Args:
+            predict_fn: Maps a list of rows to a list of results (same order)
+            max_batch: Maximum rows per predict call
+            max_wait_ms: Maximum time a row waits for others to join its batch
+            name: Label for logs and stats
+        """
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch or config.MICRO_BATCH_MAX_SIZE
+        self.max_wait = (config.MICRO_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.name = name
+        self.queue = Queue()
+        self.requests = 0
+        self.batches = 0
+        self.histogram = {}  # batch size bucket (power of two upper bound) -> count
+        self._stats_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._submit_lock = threading.Lock()  # Orders stop() after every accepted row
+        self._thread = threading.Thread(target=self._run, name=f'micro-batcher-{name}', daemon=True)
+        self._thread.start()
+
+    def predict(self, row: Any, timeout: float = None) -> Any:
+        """Queue one row and wait for its result (re-raises the row's prediction error)"""
+        future = Future()
+        with self._submit_lock:
+            stopped = self._stopped.is_set()
+            if not stopped:
+                self.queue.put((row, future))
+        if stopped:
+            # Replaced by a newer batcher while this request was in flight
+            return self.predict_fn([row])[0]
+        return future.result(timeout)
+
+    def _run(self):
+        """Collect rows into batches and predict them until stopped"""
+        while not (self._stopped.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=0.1)]
+            except Empty:
+                continue
+
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except Empty:
+                    break
+
+            self._predict_batch(batch)
+
+    def _predict_batch(self, batch: List[tuple]):
+        """Run one predict call and resolve each request's future"""
+        rows = [row for row, _ in batch]
+        try:
+            results = list(self.predict_fn(rows))
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                # Isolate the failing rows instead of failing the whole batch
+                for row, future in batch:
+                    if future.done():
+                        continue
+                    try:
+                        future.set_result(self.predict_fn([row])[0])
+                    except Exception as row_error:
+                        future.set_exception(row_error)
+        else:
+            if len(results) == len(rows):
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            else:
+                # Callers wait on every future, so none may be left unresolved
+                error = RuntimeError(f'Predict returned {len(results)} results for {len(rows)} rows')
+                for _, future in batch:
+                    future.set_exception(error)
+
+        bucket = 1
+        while bucket < len(batch):
+            bucket *= 2
+        with self._stats_lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def stop(self):
+        """Stop after predicting the rows already queued"""
+        with self._submit_lock:
+            self._stopped.set()
+
+    def get_stats(self) -> Dict:
+        """Get request/batch counters and the batch size histogram"""
+        with self._stats_lock:
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'mean_batch_size': round(self.requests / self.batches, 2) if self.batches else 0.0,
+                'batch_size_histogram': {f'<={size}': count for size, count in sorted(self.histogram.items())},
+                'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait * 1000
+            }
+
+
+class MicroBatcherRegistry:
+    """One micro-batcher per model, replaced when the model's version changes"""
+
+    def __init__(self):
+        self.batchers = {}  # key -> (version, MicroBatcher)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled(*names: Any) -> bool:
+        """Whether micro-batching is switched on for a model (by any of its names or IDs)"""
+        models = {m.strip().lower() for m in config.MICRO_BATCH_MODELS.split(',') if m.strip()}
+        return '*' in models or any(str(n).lower() in models for n in names if n is not None)
+
+    def get(self, key: Hashable, version: Any, predict_fn: Callable[[List[Any]], List[Any]]) -> MicroBatcher:
+        """
+        Get the batcher for a model, creating it on first use
+
+        Args:
+            key: Model identifier
+            version: Changes whenever the model is re-saved (e.g. its file's path and mtime)
+            predict_fn: Batch predict function for this version of the model
+        """
+        with self._lock:
+            entry = self.batchers.get(key)
+            if entry and entry[0] == version:
+                return entry[1]
+            if entry:
+                entry[1].stop()
+            batcher = MicroBatcher(predict_fn, name=str(key))
+            self.batchers[key] = (version, batcher)
+            return batcher
+
+    def get_stats(self) -> Dict:
+        """Stats of every model's batcher"""
+        with self._lock:
+            batchers = {str(key): batcher for key, (_, batcher) in self.batchers.items()}
+        return {key: batcher.get_stats() for key, batcher in batchers.items()}
+
+
+# Global micro-batcher registry instance
+micro_batchers = None
+
+def get_micro_batchers() -> MicroBatcherRegistry:
+    """Get micro-batcher registry instance"""
+    global micro_batchers
+    if micro_batchers is None:
+        micro_batchers = MicroBatcherRegistry()
+    return micro_batchers
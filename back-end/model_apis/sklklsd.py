@@ -7,8 +7,35 @@ from flask import Flask, request, jsonify
 import pickle
 import json
 import os
+import sys
 import traceback
 
+# Batch helper from the project (back-end directory) if available
+try:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), r"..")))
+    from batch_prediction import predict_inputs
+except Exception:
+    def predict_inputs(inputs, predict_rows, input_features=None, n_features=None):
+        """Fallback when the project is not importable: predict all valid inputs with one call."""
+        results = [None] * len(inputs)
+        rows = {}
+        for i, inp in enumerate(inputs):
+            missing = [str(f) for f in input_features or [] if isinstance(inp, dict) and f not in inp]
+            if missing:
+                results[i] = {'success': False, 'error': f"Missing features: {', '.join(missing)}"}
+            elif isinstance(inp, dict):
+                rows[i] = [inp[f] for f in input_features] if input_features else list(inp.values())
+            else:
+                rows[i] = inp
+        try:
+            predictions = predict_rows(list(rows.values())) if rows else []
+            for i, pred in zip(rows, predictions):
+                results[i] = {'success': True, 'prediction': pred}
+        except Exception as e:
+            for i in rows:
+                results[i] = {'success': False, 'error': str(e)}
+        return results
+
 # Optional preprocessing import (uses project's model_serializer if available)
 try:
     from model_serializer import PreprocessingPipeline
@@ -71,6 +98,15 @@ def predict_input_dict(input_dict: dict):
         return {'success': False, 'error': str(e)}
 
 
+def predict_rows(rows: list, input_features: list = None):
+    """Predict feature vectors (ordered like input_features) with a single model call."""
+    if input_features:
+        X = preprocessor.preprocess_input([dict(zip(input_features, r)) for r in rows], input_features)
+    else:
+        X = rows
+    return [p.tolist() if hasattr(p, 'tolist') else p for p in model.predict(X)]
+
+
 @app.route('/predict', methods=['POST'])
 def predict():
     payload = request.get_json(force=True)
@@ -97,10 +133,17 @@ def predict_batch():
     if not inputs or not isinstance(inputs, list):
         return jsonify({'success': False, 'error': 'Missing "inputs" (list) in JSON body'}), 400
 
-    results = []
-    for inp in inputs:
-        r = predict_input_dict(inp)
-        results.append(r)
+    input_features = None
+    if preprocessor is not None and metadata:
+        first = next((inp for inp in inputs if isinstance(inp, dict)), {})
+        input_features = metadata.get('input_features') or list(first.keys())
+
+    results = predict_inputs(
+        inputs,
+        lambda rows: predict_rows(rows, input_features),
+        input_features=input_features,
+        n_features=getattr(model, 'n_features_in_', None)
+    )
 
     return jsonify({'success': True, 'results': results})
 
@@ -0,0 +1,129 @@
+"""
+In-process LRU cache of deserialized models for the prediction endpoints
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import config
+from model_serializer import CompiledPreprocessing, ModelSerializer
+
+
+class ModelCache:
+    """Keeps recently used models unpickled in memory
+
+    Each entry holds the model and its compiled preprocessing. Entries are
+    keyed by model ID and validated against the model file's path and
+    mtime, so a re-saved model is reloaded automatically. The cache is
+    bounded by entry count and by estimated bytes (the size of the pickle
+    on disk); least-recently-used models are evicted first.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        """
+        Initialize model cache
+
+        Args:
+            max_entries: Maximum number of cached models (0 disables the cache)
+            max_bytes: Maximum estimated size of all cached models
+        """
+        self.max_entries = config.MODEL_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = config.MODEL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.entries = OrderedDict()  # model_id -> (path, mtime, size, model, preprocessing)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, model_id: int, filepath: str) -> Tuple[Optional[Any], Optional[CompiledPreprocessing]]:
+        """
+        Get a model and its compiled preprocessing, loading them from disk on a miss
+
+        Args:
+            model_id: Database ID of the model
+            filepath: Path to the model pickle
+
+        Returns:
+            (model, preprocessing), or (None, None) if the model could not be loaded
+        """
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            mtime = None
+
+        with self._lock:
+            entry = self.entries.get(model_id)
+            if entry and entry[0] == filepath and entry[1] == mtime and mtime is not None:
+                self.entries.move_to_end(model_id)
+                self.hits += 1
+                return entry[3], entry[4]
+            self.misses += 1
+
+        # Unpickle outside the lock so other models stay servable meanwhile
+        model = ModelSerializer.load_model(filepath)
+        if model is None:
+            return None, None
+        preprocessing = ModelSerializer.load_compiled_preprocessing(model_id)
+        if mtime is not None:
+            self._put(model_id, filepath, mtime, os.path.getsize(filepath), model, preprocessing)
+        return model, preprocessing
+
+    def _put(self, model_id: int, filepath: str, mtime: float, size: int, model: Any,
+             preprocessing: CompiledPreprocessing):
+        """Insert a loaded model and evict down to the count and byte limits"""
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(model_id)
+            self.entries[model_id] = (filepath, mtime, size, model, preprocessing)
+            self.total_bytes += size
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                evicted_id, _ = next(iter(self.entries.items()))
+                self._remove(evicted_id)
+                self.evictions += 1
+                print(f"✓ Model cache evicted: model {evicted_id}")
+
+    def _remove(self, model_id: int):
+        """Drop an entry if present (caller holds the lock)"""
+        entry = self.entries.pop(model_id, None)
+        if entry:
+            self.total_bytes -= entry[2]
+
+    def invalidate(self, model_id: int):
+        """Forget a cached model, e.g. after it was updated or deleted"""
+        with self._lock:
+            self._remove(model_id)
+
+    def clear(self):
+        """Forget all cached models"""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Global model cache instance
+model_cache = None
+
+def get_model_cache() -> ModelCache:
+    """Get model cache instance"""
+    global model_cache
+    if model_cache is None:
+        model_cache = ModelCache()
+    return model_cache
@@ -0,0 +1,107 @@
+"""
+In-memory index of serialized model files for the unified model gateway
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import config
+
+
+class ModelRegistry:
+    """Maps route names to model files so lookups never touch the filesystem
+
+    Files named ``model_{id}_{name}.pkl`` are indexed under
+    ``normalize(name)`` with their ID, path and mtime; when several files
+    share a name, the highest ID (the newest model) wins. The index is
+    rebuilt by a periodic rescan, and a lookup miss triggers an immediate
+    rescan (at most once per ``min_rescan_seconds``) so freshly trained
+    models are found without waiting for the next cycle.
+    """
+
+    def __init__(self, models_dir: str, normalize: Callable[[str], str] = None,
+                 rescan_seconds: float = None, min_rescan_seconds: float = 1.0):
+        """
+        Initialize model registry
+
+        Args:
+            models_dir: Directory holding model pickles
+            normalize: Maps a model name to its route key (e.g. sanitize_name)
+            rescan_seconds: Interval of the background rescan (0 disables it)
+            min_rescan_seconds: Minimum time between rescans triggered by misses
+        """
+        self.models_dir = models_dir
+        self.normalize = normalize or (lambda name: name)
+        self.rescan_seconds = config.MODEL_REGISTRY_RESCAN_SECONDS if rescan_seconds is None else rescan_seconds
+        self.min_rescan_seconds = min_rescan_seconds
+        self.models = {}  # route key -> {'id', 'name', 'path', 'mtime'}
+        self.last_scan = 0.0
+        self._scan_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def scan(self):
+        """Rebuild the index from one directory listing"""
+        with self._scan_lock:
+            models = {}
+            try:
+                entries = list(os.scandir(self.models_dir))
+            except FileNotFoundError:
+                entries = []
+
+            for entry in entries:
+                if not entry.name.endswith('.pkl') or not entry.is_file():
+                    continue
+                parts = entry.name[:-len('.pkl')].split('_', 2)
+                if len(parts) < 3 or parts[0] != 'model':
+                    continue
+                try:
+                    model_id = int(parts[1])
+                except ValueError:
+                    continue
+
+                key = self.normalize(parts[2])
+                if key in models and models[key]['id'] > model_id:
+                    continue
+                models[key] = {
+                    'id': model_id,
+                    'name': parts[2],
+                    'path': entry.path,
+                    'mtime': entry.stat().st_mtime
+                }
+
+            # Swap the whole index so readers never see a partial scan
+            self.models = models
+            self.last_scan = time.monotonic()
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Look up a model by route name, rescanning once on a miss"""
+        key = self.normalize(name)
+        entry = self.models.get(key)
+        if entry is None and time.monotonic() - self.last_scan >= self.min_rescan_seconds:
+            self.scan()
+            entry = self.models.get(key)
+        return entry
+
+    def list(self) -> List[Dict]:
+        """All indexed models, ordered by ID"""
+        return sorted(self.models.values(), key=lambda m: m['id'])
+
+    def start(self):
+        """Scan now and keep the index current from a background thread"""
+        self.scan()
+        if self.rescan_seconds > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='model-registry', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Rescan periodically until stopped"""
+        while not self._stopped.wait(self.rescan_seconds):
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"✗ Model registry rescan failed: {e}")
+
+    def stop(self):
+        """Stop the background rescan"""
+        self._stopped.set()
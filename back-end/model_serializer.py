@@ -4,8 +4,9 @@ Model serialization and persistence module
 import pickle
 import json
 import os
+import shutil
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 import config
 
 class ModelSerializer:
@@ -43,6 +44,33 @@ class ModelSerializer:
             print(f"✗ Error saving model: {e}")
             raise
     
+    @staticmethod
+    def copy_model(source_path: str, model_id: int, model_name: str) -> str:
+        """
+        Copy an already-serialized model file instead of pickling it again
+
+        Args:
+            source_path: Path to an existing model pickle
+            model_id: Database ID for the model
+            model_name: Name of the model
+
+        Returns:
+            Path to the copied model file
+        """
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"model_{model_id}_{model_name.replace(' ', '_')}_{timestamp}.pkl"
+            filepath = os.path.join(config.MODEL_STORAGE_PATH, filename)
+
+            os.makedirs(config.MODEL_STORAGE_PATH, exist_ok=True)
+            shutil.copyfile(source_path, filepath)
+
+            print(f"✓ Model copied to: {filepath}")
+            return filepath
+        except Exception as e:
+            print(f"✗ Error copying model: {e}")
+            raise
+
     @staticmethod
     def load_model(filepath: str) -> Optional[Any]:
         """
@@ -81,8 +109,7 @@ class ModelSerializer:
             Path to saved metadata file
         """
         try:
-            filename = f"metadata_{model_id}.json"
-            filepath = os.path.join(config.MODEL_STORAGE_PATH, filename)
+            filepath = ModelSerializer.metadata_path(model_id)
             
             os.makedirs(config.MODEL_STORAGE_PATH, exist_ok=True)
             
@@ -107,8 +134,7 @@ class ModelSerializer:
             Metadata dictionary or None if error
         """
         try:
-            filename = f"metadata_{model_id}.json"
-            filepath = os.path.join(config.MODEL_STORAGE_PATH, filename)
+            filepath = ModelSerializer.metadata_path(model_id)
             
             if not os.path.exists(filepath):
                 print(f"✗ Metadata file not found: {filepath}")
@@ -123,6 +149,65 @@ class ModelSerializer:
             print(f"✗ Error loading metadata: {e}")
             return None
     
+    @staticmethod
+    def metadata_path(model_id: int) -> str:
+        """Path of a model's metadata file"""
+        return os.path.join(config.MODEL_STORAGE_PATH, f"metadata_{model_id}.json")
+    
+    @staticmethod
+    def preprocessing_path(model_id: int) -> str:
+        """Path of a model's compiled preprocessing artifact"""
+        return os.path.join(config.MODEL_STORAGE_PATH, f"preprocessing_{model_id}.npz")
+    
+    @staticmethod
+    def save_compiled_preprocessing(model_id: int, compiled: 'CompiledPreprocessing') -> str:
+        """
+        Save a compiled preprocessing artifact next to the model
+        
+        Args:
+            model_id: Database ID for the model
+            compiled: Compiled preprocessing to store
+        
+        Returns:
+            Path to saved artifact
+        """
+        try:
+            filepath = ModelSerializer.preprocessing_path(model_id)
+            os.makedirs(config.MODEL_STORAGE_PATH, exist_ok=True)
+            compiled.save(filepath)
+            
+            print(f"✓ Compiled preprocessing saved to: {filepath}")
+            return filepath
+        except Exception as e:
+            print(f"✗ Error saving compiled preprocessing: {e}")
+            raise
+    
+    @staticmethod
+    def load_compiled_preprocessing(model_id: int) -> 'CompiledPreprocessing':
+        """
+        Load a model's compiled preprocessing
+        
+        Models saved before artifacts existed are compiled from their
+        metadata file; without either, inputs are passed through unchanged.
+        
+        Args:
+            model_id: Database ID for the model
+        
+        Returns:
+            CompiledPreprocessing instance
+        """
+        filepath = ModelSerializer.preprocessing_path(model_id)
+        try:
+            if os.path.exists(filepath):
+                return CompiledPreprocessing.load(filepath)
+        except Exception as e:
+            print(f"✗ Error loading compiled preprocessing: {e}")
+        
+        metadata = ModelSerializer.load_metadata(model_id)
+        if metadata:
+            return CompiledPreprocessing.from_serialized(metadata)
+        return CompiledPreprocessing()
+    
     @staticmethod
     def serialize_preprocessing(label_encoders: Dict, scaler: Any) -> Dict:
         """
@@ -162,63 +247,128 @@ class ModelSerializer:
 class PreprocessingPipeline:
     """Handles preprocessing for predictions"""
     
+    TARGET = 'target'  # Key of the target's encoder in label_encoders
+    
     def __init__(self, label_encoders: Dict = None, scaler: Any = None):
         """
         Initialize preprocessing pipeline
         
         Args:
-            label_encoders: Dict of label encoders for categorical features
-            scaler: StandardScaler instance for feature scaling
+            label_encoders: Dict of label encoders for categorical features (and the
+                classification target under 'target'), either fitted LabelEncoders
+                or their serialize_preprocessing() form
+            scaler: StandardScaler instance (or its serialized form) for feature scaling
         """
         self.label_encoders = label_encoders or {}
         self.scaler = scaler
+        self._lookups = None
+        self._scaling = None
     
-    def preprocess_input(self, input_data: Dict, input_features: list) -> Any:
+    @staticmethod
+    def _encoder_classes(encoder: Any) -> List:
+        """Classes of a fitted LabelEncoder or of its serialized form"""
+        if isinstance(encoder, dict):
+            return list(encoder.get('classes', []))
+        return list(encoder.classes_)
+    
+    def feature_classes(self) -> Dict[str, List]:
+        """Classes of each categorical feature, in code order"""
+        return {
+            feature: self._encoder_classes(encoder)
+            for feature, encoder in self.label_encoders.items()
+            if feature != self.TARGET
+        }
+    
+    def target_classes(self) -> Optional[List]:
+        """Labels of the encoded classification target, in code order (None if not encoded)"""
+        encoder = self.label_encoders.get(self.TARGET)
+        return None if encoder is None else self._encoder_classes(encoder)
+    
+    def _lookup_tables(self) -> Dict[str, Dict]:
+        """Category -> code dicts, built once per pipeline
+        
+        Keys are the categories as strings, so ``12345`` and ``"12345"``
+        find the same code.
+        """
+        if self._lookups is None:
+            self._lookups = {
+                feature: {str(value): code for code, value in enumerate(classes)}
+                for feature, classes in self.feature_classes().items()
+            }
+        return self._lookups
+    
+    def scaling_arrays(self) -> Optional[tuple]:
+        """Scaler mean and scale as arrays, or None without a scaler"""
+        import numpy as np
+        
+        if self._scaling is None and self.scaler is not None:
+            if isinstance(self.scaler, dict):
+                mean, scale = self.scaler.get('mean'), self.scaler.get('scale')
+            else:
+                mean, scale = getattr(self.scaler, 'mean_', None), getattr(self.scaler, 'scale_', None)
+            if mean is not None and scale is not None and len(mean):
+                self._scaling = (np.asarray(mean, dtype=float), np.asarray(scale, dtype=float))
+        return self._scaling
+    
+    def preprocess_input(self, input_data: Union[Dict, List[Dict]], input_features: list) -> Any:
         """
         Preprocess input data for prediction
         
+        Records are converted column by column into one 2-D array:
+        categorical columns go through precomputed lookup tables (unknown
+        categories fall back to the first class) and scaling is a single
+        broadcast over the whole batch.
+        
         Args:
-            input_data: Raw input data dictionary
+            input_data: Raw input data dictionary, or a list of them for a batch
             input_features: List of feature names
         
         Returns:
-            Preprocessed numpy array ready for model prediction
+            Preprocessed numpy array (one row per record) ready for model prediction
         """
         import numpy as np
         
         try:
+            records = [input_data] if isinstance(input_data, dict) else list(input_data)
+            lookups = self._lookup_tables()
+            
             # Extract features in correct order
-            features = []
-            for feature in input_features:
-                if feature in input_data:
-                    value = input_data[feature]
-                    
-                    # Encode categorical features
-                    if feature in self.label_encoders:
-                        encoder = self.label_encoders[feature]
-                        # Handle unknown categories
-                        try:
-                            value = encoder.transform([value])[0]
-                        except ValueError:
-                            # Use the most common class if unknown
-                            value = encoder.transform([encoder.classes_[0]])[0]
-                    
-                    features.append(float(value))
-                else:
+            X = np.empty((len(records), len(input_features)), dtype=float)
+            for j, feature in enumerate(input_features):
+                try:
+                    column = [record[feature] for record in records]
+                except KeyError:
                     raise ValueError(f"Missing required feature: {feature}")
-            
-            # Convert to numpy array
-            X = np.array([features])
+                
+                # Encode categorical features
+                if feature in lookups:
+                    lookup = lookups[feature]
+                    column = [lookup.get(str(value), 0) for value in column]
+                
+                X[:, j] = column
             
             # Scale features if scaler is available
-            if self.scaler:
-                X = self.scaler.transform(X)
+            scaling = self.scaling_arrays()
+            if scaling is not None:
+                mean, scale = scaling
+                X -= mean
+                X /= scale
             
             return X
         except Exception as e:
             print(f"✗ Error preprocessing input: {e}")
             raise
     
+    def decode_predictions(self, predictions: Any) -> List:
+        """Decode a batch of predictions to JSON-serializable labels/values, one per row"""
+        import numpy as np
+        
+        predictions = np.asarray(predictions)
+        classes = self.target_classes()
+        if classes is not None:
+            return np.asarray(classes)[predictions.astype(int)].tolist()
+        return predictions.tolist()
+    
     def postprocess_output(self, prediction: Any, label_encoder: Any = None) -> Any:
         """
         Postprocess model output
@@ -270,3 +420,55 @@ class PreprocessingPipeline:
             }
         
         return serialized
+
+
+class CompiledPreprocessing(PreprocessingPipeline):
+    """A PreprocessingPipeline stored as a standalone prediction-time artifact
+
+    Built from the output of serialize_preprocessing() when a model is
+    saved, and persisted as an .npz of plain arrays (category lists, scaler
+    mean and scale, target labels) so prediction never has to unpickle the
+    training-time encoders.
+    """
+    
+    @classmethod
+    def from_serialized(cls, preprocessing: Dict) -> 'CompiledPreprocessing':
+        """Compile the output of ModelSerializer.serialize_preprocessing (or saved metadata)"""
+        return cls(dict(preprocessing.get('label_encoders') or {}), preprocessing.get('scaler'))
+    
+    def save(self, filepath: str):
+        """Write the artifact as an .npz of plain (non-pickled) arrays"""
+        import numpy as np
+        
+        classes = self.feature_classes()
+        arrays = {'lookup_features': np.asarray(list(classes), dtype=str)}
+        for i, feature_classes in enumerate(classes.values()):
+            arrays[f'lookup_{i}'] = np.asarray(feature_classes).astype(str)
+        scaling = self.scaling_arrays()
+        if scaling is not None:
+            arrays['mean'], arrays['scale'] = scaling
+        target_classes = self.target_classes()
+        if target_classes is not None:
+            arrays['target_classes'] = np.asarray(target_classes).astype(str)
+        
+        with open(filepath, 'wb') as f:
+            np.savez(f, **arrays)
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'CompiledPreprocessing':
+        """Read an artifact written by save()"""
+        import numpy as np
+        
+        with np.load(filepath, allow_pickle=False) as data:
+            label_encoders = {
+                feature: {'classes': data[f'lookup_{i}'].tolist()}
+                for i, feature in enumerate(data['lookup_features'].tolist())
+            }
+            if 'target_classes' in data:
+                label_encoders[cls.TARGET] = {'classes': data['target_classes'].tolist()}
+            
+            scaler = None
+            if 'mean' in data:
+                scaler = {'mean': data['mean'], 'scale': data['scale']}
+            
+            return cls(label_encoders, scaler)
@@ -0,0 +1,153 @@
+"""
+Write-behind logging of predictions to the database
+"""
+import atexit
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+import config
+
+
+class PredictionLogger:
+    """Queues prediction records and writes them in batches from a background thread
+
+    Records are flushed with one multi-row insert per batch once
+    ``batch_size`` records are waiting or ``flush_interval_ms`` has passed.
+    When the queue is full, the ``policy`` decides between dropping the
+    record ('drop') and making the request wait for room ('block').
+    Pending records are flushed when the process exits.
+    """
+
+    POLICIES = ('drop', 'block')
+    _WAKE = object()  # Queued by shutdown() so the writer stops waiting for a full batch
+
+    def __init__(self, db, batch_size: int = None, flush_interval_ms: int = None,
+                 max_queue: int = None, policy: str = None):
+        """
+        Initialize prediction logger
+
+        Args:
+            db: DatabaseManager providing save_predictions()
+            batch_size: Maximum records written per insert
+            flush_interval_ms: Maximum time a record waits before being written
+            max_queue: Maximum records waiting to be written
+            policy: 'drop' or 'block' when the queue is full
+        """
+        self.db = db
+        self.batch_size = batch_size or config.PREDICTION_LOG_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or config.PREDICTION_LOG_FLUSH_MS) / 1000.0
+        self.policy = policy or config.PREDICTION_LOG_POLICY
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown prediction log policy '{self.policy}'. Expected one of: {', '.join(self.POLICIES)}")
+
+        self.queue = queue.Queue(maxsize=max_queue or config.PREDICTION_LOG_MAX_QUEUE)
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self._stopped = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='prediction-logger', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def log(self, model_id: int, input_data: Any, prediction: Dict):
+        """Queue one prediction record"""
+        record = (model_id, input_data, prediction)
+        if self.policy == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+
+    def log_many(self, model_id: int, inputs: List[Any], predictions: List[Dict]):
+        """Queue one record per input of a batch prediction"""
+        for input_data, prediction in zip(inputs, predictions):
+            self.log(model_id, input_data, prediction)
+
+    def _run(self):
+        """Collect records into batches and write them until shutdown"""
+        while not (self._stopped.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            if batch[0] is self._WAKE:
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=0 if self._stopped.is_set() else timeout)
+                except queue.Empty:
+                    break
+                if record is self._WAKE:
+                    break
+                batch.append(record)
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                # Keep the writer alive, or 'drop' loses every later record and 'block' hangs requests
+                print(f"✗ Error writing {len(batch)} prediction logs: {e}")
+                with self._stats_lock:
+                    self.failed += len(batch)
+
+    def _write(self, batch: List[tuple]):
+        """Serialize and insert one batch"""
+        rows = [
+            (model_id, json.dumps(input_data, default=str), json.dumps(prediction, default=str))
+            for model_id, input_data, prediction in batch
+        ]
+        saved = self.db.save_predictions(rows)
+        with self._stats_lock:
+            self.batches += 1
+            if saved:
+                self.written += len(rows)
+            else:
+                self.failed += len(rows)
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop the writer after flushing everything still queued"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        try:
+            self.queue.put_nowait(self._WAKE)
+        except queue.Full:
+            pass  # A full queue never leaves the writer waiting
+        self._thread.join(timeout)
+        print(f"✓ Prediction logger stopped ({self.written} written, {self.dropped} dropped)")
+
+    def get_stats(self) -> Dict:
+        """Get queue depth and write counters"""
+        with self._stats_lock:
+            return {
+                'queued': self.queue.qsize(),
+                'max_queue': self.queue.maxsize,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'policy': self.policy
+            }
+
+
+# Global prediction logger instance
+prediction_logger = None
+
+def get_prediction_logger() -> PredictionLogger:
+    """Get prediction logger instance"""
+    global prediction_logger
+    if prediction_logger is None:
+        from database import get_db
+        prediction_logger = PredictionLogger(get_db())
+    return prediction_logger
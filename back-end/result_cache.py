@@ -0,0 +1,163 @@
+"""
+Cache of prediction results for repeated feature vectors
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+import config
+
+
+class PredictionResultCache:
+    """Serves repeated predictions without calling the model again
+
+    Entries are keyed by the model, a model version (e.g. the model file's
+    mtime, so a re-saved model never serves stale results) and a hash of
+    the canonicalized feature vector: values in feature order with numbers
+    normalized to float, so ``35`` and ``35.0`` share an entry. Entries
+    expire after ``ttl`` seconds, and least-recently-used entries are
+    evicted once the estimated size exceeds ``max_bytes``.
+    """
+
+    ENTRY_OVERHEAD = 200  # Rough per-entry bookkeeping cost in bytes
+
+    def __init__(self, ttl: float = None, max_bytes: int = None):
+        """
+        Initialize prediction result cache
+
+        Args:
+            ttl: Seconds a result stays valid
+            max_bytes: Maximum estimated size of all cached results (0 disables the cache)
+        """
+        self.ttl = config.PREDICTION_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = config.PREDICTION_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.entries = OrderedDict()  # (model_id, digest) -> (expires_at, size, result)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled(*names: Any) -> bool:
+        """Whether result caching is switched on for a model (by any of its names or IDs)"""
+        models = {m.strip().lower() for m in config.PREDICTION_CACHE_MODELS.split(',') if m.strip()}
+        return '*' in models or any(str(n).lower() in models for n in names if n is not None)
+
+    @staticmethod
+    def _canonical(value: Any) -> Any:
+        """Normalize a feature value so equal inputs hash equally"""
+        if isinstance(value, bool) or value is None:
+            return value
+        try:
+            return float(value) if not isinstance(value, str) else value
+        except (TypeError, ValueError):
+            return str(value)
+
+    @classmethod
+    def make_key(cls, version: Any, vector: List[Any]) -> str:
+        """Stable hash of a model version and an ordered feature vector"""
+        canonical = json.dumps([version, [cls._canonical(v) for v in vector]], separators=(',', ':'), default=str)
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+    def predict(self, model_id: Hashable, version: Any, rows: List[Any], vectors: List[List[Any]],
+                predict_fn: Callable[[List[Any]], List[Any]]) -> Tuple[List[Any], int]:
+        """
+        Predict rows, calling the model only for those not cached yet
+
+        Args:
+            model_id: Model identifier (entries are invalidated per model)
+            version: Changes whenever the model is re-saved
+            rows: Inputs passed to predict_fn
+            vectors: Ordered feature vector of each row, used as the cache key
+            predict_fn: Maps a list of rows to a list of results (same order)
+
+        Returns:
+            (results, hits): one result per row and the number served from the cache
+        """
+        keys = [(model_id, self.make_key(version, vector)) for vector in vectors]
+        results = [None] * len(rows)
+        missing = []
+        now = time.monotonic()
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self.entries.get(key)
+                if entry and entry[0] > now:
+                    self.entries.move_to_end(key)
+                    results[i] = entry[2]
+                else:
+                    missing.append(i)
+            self.hits += len(rows) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            predicted = predict_fn([rows[i] for i in missing])
+            for i, result in zip(missing, predicted):
+                results[i] = result
+            self._put_many([(keys[i], results[i]) for i in missing])
+
+        return results, len(rows) - len(missing)
+
+    def _put_many(self, items: List[tuple]):
+        """Insert results and evict down to the byte limit"""
+        if self.max_bytes <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, result in items:
+                self._remove(key)
+                size = len(key[1]) + len(json.dumps(result, default=str)) + self.ENTRY_OVERHEAD
+                self.entries[key] = (expires_at, size, result)
+                self.total_bytes += size
+            while self.total_bytes > self.max_bytes and self.entries:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key: tuple):
+        """Drop an entry if present (caller holds the lock)"""
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry[1]
+
+    def invalidate(self, model_id: Hashable):
+        """Forget every cached result of a model, e.g. after it was updated or deleted"""
+        with self._lock:
+            for key in [k for k in self.entries if k[0] == model_id]:
+                self._remove(key)
+
+    def clear(self):
+        """Forget all cached results"""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled_for': config.PREDICTION_CACHE_MODELS,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl
+            }
+
+
+# Global prediction result cache instance
+prediction_cache = None
+
+def get_prediction_cache() -> PredictionResultCache:
+    """Get prediction result cache instance"""
+    global prediction_cache
+    if prediction_cache is None:
+        prediction_cache = PredictionResultCache()
+    return prediction_cache
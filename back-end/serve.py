@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Pre-fork production server for app.py and unified_api.py
+
+The master process imports the app, loads the models once and forks the
+workers, so the model arrays are shared copy-on-write instead of being
+loaded again in every worker. Every worker serves the same listening socket.
+
+When the models directory changes (or on SIGHUP), the master reloads the
+models and replaces the workers one by one. A new worker starts before an
+old one is asked to stop, and the old worker finishes its in-flight
+requests first, so reloads drop no requests. SIGTERM/SIGINT stop all workers
+gracefully.
+
+app.py keeps training jobs in process memory, so it is served by a single
+worker and is not reloaded on model changes (its model cache already picks
+up re-saved models). A stopping worker waits for its running training jobs
+and flushes queued prediction logs before exiting.
+
+Usage:
+  python serve.py unified --workers 4 --port 8001
+  python serve.py app --port 5000
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+import config
+from model_registry import ModelRegistry
+
+DEFAULT_PORTS = {'app': 5000, 'unified': 8001}
+
+# Targets keeping per-process state (training jobs) that other workers cannot see
+SINGLE_WORKER_TARGETS = {'app'}
+
+
+def load_target(target: str):
+    """
+    Import the app to serve
+
+    Returns:
+        (flask_app, models_dir, preload): preload loads the models into the app's caches;
+        models_dir is None when the app must not be reloaded on model changes
+    """
+    if target == 'unified':
+        import unified_api
+
+        def preload():
+            unified_api.model_registry.scan()
+            unified_api.start_preload(background=False)
+
+        return unified_api.app, unified_api.model_registry.models_dir, preload
+
+    import app as app_module
+    from database import get_db
+    from model_cache import get_model_cache
+
+    def preload():
+        # Warm the model cache with the most recent models, as many as it holds
+        db = get_db()
+        cache = get_model_cache()
+        loaded = 0
+        for row in db.get_all_models(limit=config.MODEL_CACHE_MAX_ENTRIES):
+            model_info = db.get_model(row['id'])
+            if model_info and cache.get(model_info['id'], model_info['model_file_path'])[0] is not None:
+                loaded += 1
+        print(f"✓ Preloaded {loaded} models")
+
+    # Not watched: every training run saves a model, and a reload would replace
+    # the worker running the training jobs. The model cache checks file mtimes.
+    return app_module.app, None, preload
+
+
+def reset_database():
+    """Drop the master's database connections in a fresh worker
+
+    Sockets inherited from the master must not be used by two processes, so
+    the worker opens its own pool on first use. The old manager is kept
+    referenced so it is never garbage collected (and closed) in the worker.
+    """
+    database = sys.modules.get('database')
+    if database is None or getattr(database, 'db_manager', None) is None:
+        return
+    reset_database.inherited = database.db_manager
+    database.db_manager = None
+    app_module = sys.modules.get('app')
+    if app_module is not None and hasattr(app_module, 'db'):
+        app_module.db = None  # Reconnected lazily by app.before_request
+
+
+# Modules whose singleton runs background threads or processes, and its global name
+BACKGROUND_SERVICES = (
+    ('job_manager', 'job_manager'),
+    ('prediction_logger', 'prediction_logger'),
+    ('training_pool', 'training_pool'),
+)
+
+
+def reset_services():
+    """Drop background services inherited from the master
+
+    Their threads do not survive the fork, so the worker starts its own on first use.
+    """
+    for module_name, attr in BACKGROUND_SERVICES:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            setattr(module, attr, None)
+
+
+def stop_services():
+    """Wait for running training jobs and flush queued prediction logs
+
+    Workers leave with os._exit (they must not run the master's cleanup), which
+    skips the atexit handlers, so the services are stopped here instead.
+    """
+    for module_name, attr in BACKGROUND_SERVICES:
+        service = getattr(sys.modules.get(module_name), attr, None)
+        if service is None:
+            continue
+        try:
+            service.shutdown()
+        except Exception:
+            traceback.print_exc()
+
+
+def run_worker(flask_app, sock: socket.socket):
+    """Serve requests on the shared socket until SIGTERM, then finish in-flight requests"""
+    from werkzeug.serving import make_server
+
+    reset_database()
+    reset_services()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The master handles Ctrl-C
+    signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+    server = make_server('0.0.0.0', 0, flask_app, threaded=True, fd=sock.fileno())
+    server.daemon_threads = False  # server_close() waits for in-flight requests
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+
+    try:
+        server.serve_forever()
+        server.server_close()
+    finally:
+        stop_services()
+        sys.stdout.flush()
+    os._exit(0)
+
+
+class PreforkServer:
+    """Master process: forks workers, supervises them and reloads them on model changes"""
+
+    def __init__(self, flask_app, sock: socket.socket, models_dir: str, preload, workers: int):
+        """
+        Initialize pre-fork server
+
+        Args:
+            flask_app: WSGI app served by every worker
+            sock: Listening socket shared by the workers
+            models_dir: Directory watched for model changes (None disables the watch)
+            preload: Loads the models into the app's caches (run in the master)
+            workers: Number of worker processes
+        """
+        self.app = flask_app
+        self.sock = sock
+        self.preload = preload
+        self.num_workers = workers
+        self.registry = ModelRegistry(models_dir, rescan_seconds=0) if models_dir else None
+        self.workers = {}  # pid -> generation
+        self.generation = 0
+        self.fingerprint = None
+        self.running = True
+        self.reload_requested = False
+
+    def _models_fingerprint(self):
+        """IDs and mtimes of the model files, to detect changes"""
+        if self.registry is None:
+            return None
+        self.registry.scan()
+        return tuple((m['id'], m['mtime']) for m in self.registry.list())
+
+    def load_models(self):
+        """(Re)load the models in the master before forking workers from it"""
+        self.fingerprint = self._models_fingerprint()
+        self.preload()
+        # Keep the loaded objects out of the collector so it never writes to the shared pages
+        gc.collect()
+        gc.freeze()
+
+    def spawn(self):
+        """Fork one worker of the current generation"""
+        sys.stdout.flush()  # Don't let the worker inherit and repeat buffered output
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(self.app, self.sock)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                os._exit(1)
+        self.workers[pid] = self.generation
+        print(f"✓ Worker {pid} started (generation {self.generation})")
+
+    def reload(self):
+        """Reload the models, then replace the workers one at a time"""
+        print("✓ Reloading models")
+        gc.unfreeze()
+        self.load_models()
+        self.generation += 1
+        for pid, generation in list(self.workers.items()):
+            if generation < self.generation:
+                self.spawn()
+                self._stop_worker(pid)
+
+    def _stop_worker(self, pid: int):
+        """Ask a worker to finish its in-flight requests and exit"""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self):
+        """Collect exited workers and replace the ones that died unexpectedly"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation = self.workers.pop(pid, None)
+            if self.running and generation == self.generation:
+                print(f"✗ Worker {pid} exited unexpectedly (status {status}), restarting")
+                self.spawn()
+
+    def run(self):
+        """Start the workers and supervise them until SIGTERM/SIGINT"""
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        self.load_models()
+        for _ in range(self.num_workers):
+            self.spawn()
+
+        next_check = time.monotonic() + config.MODEL_REGISTRY_RESCAN_SECONDS
+        while self.running:
+            time.sleep(0.2)
+            self._reap()
+            if self.reload_requested:
+                self.reload_requested = False
+                self.reload()
+            elif self.registry and config.MODEL_REGISTRY_RESCAN_SECONDS > 0 and time.monotonic() >= next_check:
+                next_check = time.monotonic() + config.MODEL_REGISTRY_RESCAN_SECONDS
+                if self._models_fingerprint() != self.fingerprint:
+                    self.reload()
+
+        self.shutdown()
+
+    def shutdown(self):
+        """Stop all workers, killing the ones still busy after SERVE_SHUTDOWN_TIMEOUT"""
+        for pid in list(self.workers):
+            self._stop_worker(pid)
+        deadline = time.monotonic() + config.SERVE_SHUTDOWN_TIMEOUT
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            os.kill(pid, signal.SIGKILL)
+        print("✓ Server stopped")
+
+    def _handle_stop(self, signum, frame):
+        self.running = False
+
+    def _handle_reload(self, signum, frame):
+        self.reload_requested = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve app.py or unified_api.py with pre-forked workers')
+    parser.add_argument('target', choices=sorted(DEFAULT_PORTS), help='Application to serve')
+    parser.add_argument('--workers', type=int, default=config.SERVE_WORKERS, help='Number of worker processes')
+    parser.add_argument('--host', type=str, default='0.0.0.0', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=None, help='Port to bind (default: PORT or the app\'s usual port)')
+    args = parser.parse_args()
+
+    port = args.port or int(os.getenv('PORT', DEFAULT_PORTS[args.target]))
+    workers = args.workers
+    if args.target in SINGLE_WORKER_TARGETS and workers > 1:
+        print(f"✗ {args.target} keeps training jobs in process memory; serving it with 1 worker instead of {workers}")
+        workers = 1
+    flask_app, models_dir, preload = load_target(args.target)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, port))
+    sock.listen(config.SERVE_BACKLOG)
+    sock.set_inheritable(True)
+
+    print(f'Starting {args.target} on {args.host}:{port} with {workers} workers...')
+    PreforkServer(flask_app, sock, models_dir, preload, workers).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Tests for batch predictions with per-input results
+"""
+import textwrap
+from batch_prediction import predict_inputs, validate_inputs
+from tools.generate_model_api import generate_file_content
+
+
+def test_validate_orders_values_by_feature_and_reports_bad_inputs():
+    vectors, errors = validate_inputs(
+        [{'b': 2, 'a': 1}, {'a': 1}, [3, 4], 'x', [1, 2, 3]],
+        input_features=['a', 'b']
+    )
+
+    assert vectors == {0: [1, 2], 2: [3, 4]}
+    assert errors == {
+        1: 'Missing features: b',
+        3: 'Each input must be an object or a list of feature values',
+        4: 'Expected 2 features, got 3'
+    }
+
+
+def test_first_valid_input_sets_the_width_without_feature_info():
+    vectors, errors = validate_inputs([[1, 2], [1, 2, 3], {'x': 5, 'y': 6}])
+
+    assert vectors == {0: [1, 2], 2: [5, 6]}
+    assert errors == {1: 'Expected 2 features, got 3'}
+
+
+def test_batch_is_predicted_with_one_call():
+    calls = []
+
+    def predict_rows(rows):
+        calls.append(rows)
+        return [sum(row) for row in rows]
+
+    results = predict_inputs([[1, 2], 'bad', [3, 4]], predict_rows, n_features=2)
+
+    assert calls == [[[1, 2], [3, 4]]]
+    assert results[0] == {'success': True, 'prediction': 3}
+    assert results[1]['success'] is False
+    assert results[2] == {'success': True, 'prediction': 7}
+
+
+def test_rejected_value_only_fails_its_own_input():
+    def predict_rows(rows):
+        return [1.0 / row[0] for row in rows]
+
+    results = predict_inputs([[2], [0], [4]], predict_rows)
+
+    assert [r['success'] for r in results] == [True, False, True]
+    assert results[0]['prediction'] == 0.5 and results[2]['prediction'] == 0.25
+    assert 'division' in results[1]['error']
+
+
+def test_generated_api_fallback_predicts_with_one_call():
+    content = generate_file_content('m', '/missing/model.pkl', None, backend_dir='/missing')
+    fallback = content[content.index('    def predict_inputs('):content.index('# Optional preprocessing import')]
+    namespace = {}
+    exec(textwrap.dedent(fallback), namespace)
+    calls = []
+
+    def predict_rows(rows):
+        calls.append(rows)
+        return [a - b for a, b in rows]
+
+    results = namespace['predict_inputs']([{'b': 2, 'a': 5}, {'a': 1}, [3, 4]], predict_rows, input_features=['a', 'b'])
+
+    assert calls == [[[5, 2], [3, 4]]]
+    assert results == [
+        {'success': True, 'prediction': 3},
+        {'success': False, 'error': 'Missing features: b'},
+        {'success': True, 'prediction': -1}
+    ]
@@ -0,0 +1,57 @@
+"""
+Tests for CSV ingestion
+"""
+import io
+import pandas as pd
+import pytest
+import app
+import config
+
+CSV = 'age;income;city\n25;1.5;Paris\n40;2.5;Berlin\n31;;Tokyo\n'
+
+
+def stream(text):
+    return io.BytesIO(text.encode('utf-8'))
+
+
+@pytest.mark.parametrize('text', ['a,b\n1,2', 'a,b\n1,2\n', 'a\tb\n1\t2', 'a;b\n1;2'])
+def test_one_row_file_keeps_numeric_types(text):
+    df = app.robust_read_csv(text)
+
+    assert list(df.columns) == ['a', 'b']
+    assert df.dtypes.astype(str).tolist() == ['int64', 'int64']
+    assert df.iloc[0].tolist() == [1, 2]
+
+
+def test_header_longer_than_the_sample_keeps_numeric_types(monkeypatch):
+    monkeypatch.setattr(config, 'CSV_SNIFF_BYTES', 12)
+
+    df = app.robust_read_csv('first_column,second_column\n1,2.5\n3,4.5\n')
+
+    assert df['first_column'].dtype.kind == 'i'
+    assert df['second_column'].dtype.kind == 'f'
+
+
+@pytest.mark.parametrize('sep', [',', ';', '\t', '|'])
+def test_dialect_is_sniffed(sep):
+    text = CSV.replace(';', sep)
+
+    assert app.sniff_csv_dialect(text) == (sep, '"')
+    assert list(app.robust_read_csv(text).columns) == ['age', 'income', 'city']
+    assert list(app.read_csv_stream(stream(text)).columns) == ['age', 'income', 'city']
+
+
+def test_streamed_dtypes_match_the_eager_parse():
+    eager = app.robust_read_csv(CSV)
+    streamed = app.read_csv_stream(stream(CSV))
+
+    pd.testing.assert_frame_equal(streamed, eager)
+    assert eager.dtypes.astype(str).tolist() == ['int64', 'float64', 'object']
+
+
+def test_streamed_chunks_replay_the_sniffed_head(monkeypatch):
+    monkeypatch.setattr(config, 'CSV_SNIFF_BYTES', 20)
+
+    chunks = list(app.read_csv_stream(stream(CSV), chunksize=2))
+
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), app.robust_read_csv(CSV))
@@ -0,0 +1,221 @@
+"""
+Tests for connection slot accounting in DatabaseManager (against an in-memory fake pool)
+"""
+import queue
+import sys
+import threading
+import mysql.connector.pooling
+import pytest
+from mysql.connector.errors import OperationalError, PoolError, ProgrammingError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.lastrowid = 1
+
+    def execute(self, query, params=None, many=False):
+        if self.conn.pool.fail_queries:
+            raise ProgrammingError('query failed')
+        self.conn.pool.queries += 1
+        self.conn.pool.log.append((id(self.conn), 'executemany' if many else 'execute', ' '.join(query.split()), params))
+
+    def executemany(self, query, seq_params):
+        self.execute(query, list(seq_params), many=True)
+
+    def fetchone(self):
+        return (3,)
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Pooled connection: close() gives it back, then fails like a failed session reset"""
+
+    def __init__(self, pool, raw):
+        self.pool = pool
+        self.raw = raw
+
+    def cursor(self, **kwargs):
+        if self.pool.fail_cursor:
+            raise OperationalError('MySQL Connection not available')
+        return FakeCursor(self)
+
+    def commit(self):
+        self.pool.log.append((id(self), 'commit', None, None))
+
+    def rollback(self):
+        self.pool.rollbacks += 1
+
+    def is_connected(self):
+        return self.raw['connected']
+
+    def disconnect(self):
+        self.raw['connected'] = False
+
+    def close(self):
+        self.pool.idle.put(self.raw)
+        if self.pool.fail_close:
+            raise OperationalError('Lost connection to MySQL server')
+
+
+class FakePool:
+    """Same contract as MySQLConnectionPool: never blocks, PoolError when exhausted"""
+
+    def __init__(self, pool_size, **kwargs):
+        self.idle = queue.Queue()
+        for _ in range(pool_size):
+            self.idle.put({'connected': True})
+        self.fail_close = False
+        self.fail_cursor = False
+        self.fail_queries = False
+        self.rollbacks = 0
+        self.queries = 0
+        self.log = []  # (connection, operation, query, params)
+
+    def get_connection(self):
+        try:
+            raw = self.idle.get(block=False)
+        except queue.Empty:
+            raise PoolError('Failed getting connection; pool exhausted')
+        raw['connected'] = True  # Reconnects like the real pool
+        return FakeConnection(self, raw)
+
+
+@pytest.fixture(scope='module')
+def database():
+    original = mysql.connector.pooling.MySQLConnectionPool
+    mysql.connector.pooling.MySQLConnectionPool = FakePool
+    sys.modules.pop('database', None)
+    import database
+    yield database
+    # Later imports must not see the fake pool
+    mysql.connector.pooling.MySQLConnectionPool = original
+    sys.modules.pop('database', None)
+
+
+@pytest.fixture
+def db(database, monkeypatch):
+    monkeypatch.setattr(database.config, 'DB_POOL_SIZE', 2)
+    monkeypatch.setattr(database.config, 'DB_POOL_TIMEOUT', 5)
+    return database.DatabaseManager()
+
+
+def test_concurrent_operations_share_the_bounded_pool(db):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(db.save_predictions([(1, '{}', '{}')])))
+               for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = db.get_pool_stats()
+    assert results == [True] * 20
+    assert stats['checkouts'] == 20 and stats['in_use'] == 0
+    assert stats['peak_in_use'] <= 2 and stats['timeouts'] == 0
+
+
+def test_failing_close_still_releases_the_slot(db):
+    db.pool.fail_close = True
+    for _ in range(5):
+        assert db.get_model_count() == 3
+
+    assert db.get_pool_stats()['in_use'] == 0
+    db.pool.fail_close = False
+    conns = [db.acquire_connection(), db.acquire_connection()]
+    assert all(conns)
+    for conn in conns:
+        db.release_connection(conn)
+
+
+def test_failing_cursor_still_releases_the_slot(db):
+    db.pool.fail_cursor = True
+    for _ in range(5):
+        assert db.get_model_count() == 0
+        assert db.save_model('m', '', 'classification', 'rf', {'f1_score': 0.9}, '', '/tmp/m.pkl', ['a'], 'y', []) is None
+
+    assert db.get_pool_stats()['in_use'] == 0
+    db.pool.fail_cursor = False
+    assert db.get_model_count() == 3
+
+
+def test_busy_pool_times_out(db, database, monkeypatch):
+    held = [db.acquire_connection(), db.acquire_connection()]
+    monkeypatch.setattr(database.config, 'DB_POOL_TIMEOUT', 0.05)
+
+    assert db.acquire_connection() is None
+    assert db.get_model_count() == 0
+    with pytest.raises(PoolError):
+        with db.pooled_connection():
+            pass
+    assert db.get_pool_stats()['timeouts'] == 3
+
+    for conn in held:
+        db.release_connection(conn)
+    assert db.get_model_count() == 3
+
+
+def test_failed_write_rolls_back_and_releases(db):
+    db.pool.fail_queries = True
+    assert db.save_model('m', '', 'classification', 'rf', {'f1_score': 0.9}, '', '/tmp/m.pkl', ['a'], 'y', []) is None
+    with pytest.raises(ProgrammingError):
+        with db.pooled_connection() as conn:
+            conn.cursor().execute('SELECT 1')
+
+    assert db.pool.rollbacks == 2
+    assert db.get_pool_stats()['in_use'] == 0
+
+
+def test_delete_model_removes_its_artifacts(db, database, monkeypatch, tmp_path):
+    monkeypatch.setattr(database.config, 'MODEL_STORAGE_PATH', str(tmp_path))
+    model_file = tmp_path / 'model_3_m.pkl'
+    files = [model_file, tmp_path / 'metadata_3.json', tmp_path / 'preprocessing_3.npz', tmp_path / 'metadata_4.json']
+    for path in files:
+        path.write_bytes(b'')
+    monkeypatch.setattr(FakeCursor, 'fetchone', lambda self: (str(model_file),))
+
+    assert db.delete_model(3)
+    assert [path.exists() for path in files] == [False, False, False, True]
+
+
+def test_disconnect_closes_only_idle_connections(db):
+    busy = db.acquire_connection()
+    db.disconnect()
+
+    idle = list(db.pool.idle.queue)
+    assert len(idle) == 1 and not idle[0]['connected']
+    assert busy.is_connected()
+
+    # The closed connection reconnects on next use and the slots are intact
+    db.release_connection(busy)
+    assert db.get_model_count() == 3
+    assert db.get_pool_stats()['in_use'] == 0
+
+
+def test_save_model_batches_inserts_in_one_transaction(db):
+    results = [
+        {'algorithm': 'A', 'metrics': {'r2_score': 0.9}, 'score': 0.9,
+         'fold_results': [{'fold': 1, 'metrics': {}, 'score': 0.8}, {'fold': 2, 'metrics': {}, 'score': 1.0}]},
+        {'algorithm': 'B', 'metrics': {'r2_score': 0.5}, 'score': 0.5,
+         'fold_results': [{'fold': 1, 'metrics': {}, 'score': 0.5}]}
+    ]
+
+    model_id = db.save_model('m', '', 'regression', 'A', {'r2_score': 0.9}, '', 'model.pkl', ['a'], 'y', results)
+
+    log = db.pool.log
+    assert model_id == 1
+    assert len({conn for conn, _, _, _ in log}) == 1
+    assert [(operation, query.split()[2] if query else None) for _, operation, query, _ in log] == [
+        ('execute', 'models'),
+        ('executemany', 'training_results'),
+        ('executemany', 'training_fold_results'),
+        ('commit', None)
+    ]
+    assert [row[1:] for row in log[1][3]] == [('A', '{"r2_score": 0.9}', 0.9), ('B', '{"r2_score": 0.5}', 0.5)]
+    assert [row[1:3] for row in log[2][3]] == [('A', 1), ('A', 2), ('B', 1)]
+    assert db.get_pool_stats()['in_use'] == 0
@@ -0,0 +1,57 @@
+"""
+Tests for the columnar dataset store
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from dataset_store import DatasetStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(str(tmp_path))
+
+
+def test_round_trip_keeps_values_and_categories(store):
+    df = pd.DataFrame({
+        'age': [25, 40, 31],
+        'income': [1.5, 2.5, 3.5],
+        'city': ['Paris', 'Berlin', 'Paris']
+    })
+    loaded = store.load(store.save(df, name='people.csv'))
+
+    assert list(loaded.columns) == ['age', 'income', 'city']
+    assert loaded['age'].tolist() == [25, 40, 31]
+    assert loaded['income'].tolist() == [1.5, 2.5, 3.5]
+    assert loaded['city'].tolist() == ['Paris', 'Berlin', 'Paris']
+    assert list(loaded['city'].cat.categories) == ['Berlin', 'Paris']
+
+
+def test_load_keeps_columns_memory_mapped(store, monkeypatch):
+    df = pd.DataFrame({f'f{i}': np.arange(1000, dtype=np.float64) * i for i in range(4)})
+    df['n'] = np.arange(1000, dtype=np.int64)
+    dataset_id = store.save(df)
+    mapped = []
+    load = np.load
+
+    def spy(*args, **kwargs):
+        mapped.append(load(*args, **kwargs))
+        return mapped[-1]
+
+    monkeypatch.setattr(np, 'load', spy)
+    loaded = store.load(dataset_id)
+
+    # Each column is a read-only view of its own column file, not a copy
+    assert len(mapped) == len(df.columns)
+    for col, column_file in zip(loaded.columns, mapped):
+        values = loaded[col].to_numpy()
+        assert isinstance(column_file, np.memmap)
+        assert np.shares_memory(values, column_file)
+        assert not values.flags.writeable
+        np.testing.assert_array_equal(values, df[col].to_numpy())
+
+
+def test_rejects_ids_outside_the_store(store):
+    assert store.load('../etc') is None
+    with pytest.raises(ValueError):
+        store.delete('../etc')
@@ -0,0 +1,102 @@
+"""
+Tests for background training jobs
+"""
+import json
+import threading
+import time
+import app
+import config
+from job_manager import TrainingJobManager
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_job_runs_from_queued_to_completed():
+    manager = TrainingJobManager(max_workers=1, max_pending=5, max_history=5)
+    release = threading.Event()
+
+    def train(job):
+        job.set_algorithms(['A', 'B'])
+        job.update_algorithm('A', 'completed')
+        release.wait(5)
+        job.update_algorithm('B', 'completed')
+        return {'success': True, 'model_id': 7}
+
+    job_id = manager.submit(train, description='m')
+    assert wait_for(lambda: manager.get(job_id)['progress']['completed'] == 1)
+    assert manager.get(job_id)['status'] == 'running'
+
+    release.set()
+    assert wait_for(lambda: manager.get(job_id)['status'] == 'completed')
+    job = manager.get(job_id)
+    assert job['model_id'] == 7 and job['result'] == {'success': True, 'model_id': 7}
+    assert job['progress'] == {'completed': 2, 'total': 2, 'algorithms': {'A': 'completed', 'B': 'completed'}}
+    assert job['finished_at'] is not None
+    manager.shutdown()
+
+
+def test_failed_job_reports_its_error():
+    manager = TrainingJobManager(max_workers=1, max_pending=5, max_history=5)
+
+    def train(job):
+        raise ValueError('no numeric columns')
+
+    job_id = manager.submit(train)
+    assert wait_for(lambda: manager.get(job_id)['status'] == 'failed')
+    assert manager.get(job_id)['error'] == 'no numeric columns'
+    assert manager.get('unknown') is None
+    manager.shutdown()
+
+
+def test_submissions_beyond_max_pending_are_rejected():
+    manager = TrainingJobManager(max_workers=1, max_pending=1, max_history=5)
+    release = threading.Event()
+
+    assert manager.submit(lambda job: release.wait(5) and {}) is not None
+    assert manager.submit(lambda job: {}) is None
+    release.set()
+    manager.shutdown()
+
+
+def test_concurrent_registrations_keep_their_own_metadata(tmp_path, monkeypatch):
+    class FakeDB:
+        def __init__(self):
+            self.next_id = 1
+            self.lock = threading.Lock()
+            self.both_saving = threading.Barrier(2, timeout=5)
+
+        def save_model(self, **kwargs):
+            self.both_saving.wait()  # Both jobs are between training and registration
+            with self.lock:
+                self.next_id += 1
+                return self.next_id
+
+    monkeypatch.setattr(config, 'MODEL_STORAGE_PATH', str(tmp_path))
+    monkeypatch.setattr(app, 'db', FakeDB())
+    results = {'best_model': 'A', 'results': [{'algorithm': 'A', 'metrics': {}, 'score': 1.0}], 'justification': ''}
+    responses = []
+
+    def register(feature):
+        model_file = tmp_path / f'tmp_{feature}.pkl'
+        model_file.write_bytes(b'')
+        responses.append(app._register_model(
+            str(model_file), {'label_encoders': {}, 'scaler': None}, results,
+            f'model {feature}', '', 'regression', [feature], 'y'
+        ))
+
+    threads = [threading.Thread(target=register, args=(f,)) for f in ('a', 'b')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(responses) == 2
+    for response in responses:
+        metadata = json.loads((tmp_path / f"metadata_{response['model_id']}.json").read_text())
+        assert metadata['input_features'] == [response['model_name'][-1]]
+    assert not (tmp_path / 'metadata_1.json').exists()
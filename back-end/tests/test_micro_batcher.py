@@ -0,0 +1,82 @@
+"""
+Tests for micro-batching of single-row predictions
+"""
+import threading
+import pytest
+from micro_batcher import MicroBatcher, MicroBatcherRegistry
+
+
+def test_concurrent_rows_share_one_predict_call():
+    calls = []
+
+    def predict(rows):
+        calls.append(len(rows))
+        return [row * 2 for row in rows]
+
+    batcher = MicroBatcher(predict, max_batch=8, max_wait_ms=200)
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.update({i: batcher.predict(i, timeout=5)}))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.stop()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert sum(calls) == 8 and len(calls) < 8
+    assert batcher.get_stats()['requests'] == 8
+
+
+def test_failing_row_only_fails_its_own_request():
+    def predict(rows):
+        if 'bad' in rows:
+            raise ValueError('bad row')
+        return [row.upper() for row in rows]
+
+    batcher = MicroBatcher(predict, max_batch=2, max_wait_ms=500)
+    good = []
+    thread = threading.Thread(target=lambda: good.append(batcher.predict('ok', timeout=5)))
+    thread.start()
+    with pytest.raises(ValueError):
+        batcher.predict('bad', timeout=5)
+    thread.join()
+    batcher.stop()
+
+    assert good == ['OK']
+
+
+def test_short_result_list_fails_every_request_of_the_batch():
+    batcher = MicroBatcher(lambda rows: rows[:-1], max_batch=2, max_wait_ms=500)
+    errors = []
+
+    def predict(row):
+        try:
+            batcher.predict(row, timeout=5)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=predict, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.stop()
+
+    assert len(errors) == 2
+
+
+def test_registry_keeps_the_batcher_while_the_version_is_unchanged():
+    registry = MicroBatcherRegistry()
+    version = ('/models/model_1.pkl', 1700000000.0)
+
+    # A new predict function per request (e.g. a freshly loaded model) keeps the batcher
+    first = registry.get(1, version, lambda rows: rows)
+    assert registry.get(1, version, lambda rows: rows) is first
+
+    # Re-saving the model replaces it; requests still in flight on the old one are answered
+    second = registry.get(1, ('/models/model_1.pkl', 1700000100.0), lambda rows: [r + 1 for r in rows])
+    assert second is not first
+    assert first.predict(1, timeout=5) == 1
+    assert second.predict(1, timeout=5) == 2
+    second.stop()
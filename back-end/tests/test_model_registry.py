@@ -0,0 +1,53 @@
+"""
+Tests for the model file registry
+"""
+import pytest
+from model_registry import ModelRegistry
+from unified_api import sanitize_name
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    for file_name in ('model_3_Loan Approval.pkl', 'model_7_Loan Approval.pkl',
+                      'model_5_loan-approval-v2.pkl', 'model_x_broken.pkl', 'notes.txt'):
+        (tmp_path / file_name).write_bytes(b'')
+    return tmp_path
+
+
+def test_lookups_match_exact_sanitized_names(models_dir):
+    registry = ModelRegistry(str(models_dir), normalize=sanitize_name, rescan_seconds=0)
+    registry.scan()
+
+    # The newest of the two 'Loan Approval' files, not the 'v2' model containing that name
+    assert registry.get('loan_approval')['id'] == 7
+    assert registry.get('Loan-Approval')['path'] == str(models_dir / 'model_7_Loan Approval.pkl')
+    assert registry.get('loan_approval_v2')['id'] == 5
+    assert registry.get('loan') is None
+    assert registry.get('approval') is None
+    assert [m['id'] for m in registry.list()] == [5, 7]
+
+
+def test_rescan_picks_up_added_and_removed_models(models_dir):
+    registry = ModelRegistry(str(models_dir), normalize=sanitize_name, rescan_seconds=0, min_rescan_seconds=0)
+    registry.scan()
+
+    (models_dir / 'model_9_churn.pkl').write_bytes(b'')
+    (models_dir / 'model_7_Loan Approval.pkl').unlink()
+    (models_dir / 'model_5_loan-approval-v2.pkl').unlink()
+
+    # A miss rescans immediately
+    assert registry.get('churn')['id'] == 9
+    assert registry.get('loan_approval')['id'] == 3
+    assert registry.get('loan_approval_v2') is None
+    assert [m['name'] for m in registry.list()] == ['Loan Approval', 'churn']
+
+
+def test_misses_rescan_at_most_once_per_interval(models_dir):
+    registry = ModelRegistry(str(models_dir), normalize=sanitize_name, rescan_seconds=0, min_rescan_seconds=60)
+    registry.scan()
+
+    (models_dir / 'model_9_churn.pkl').write_bytes(b'')
+
+    assert registry.get('churn') is None
+    registry.scan()
+    assert registry.get('churn')['id'] == 9
@@ -0,0 +1,134 @@
+"""
+Tests for the write-behind prediction logger
+"""
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from prediction_logger import PredictionLogger
+
+
+class FakeDB:
+    """Records each save_predictions() call"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_predictions(self, rows):
+        self.release.wait(5)
+        self.batches.append(rows)
+        return not self.fail
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_full_batches_are_written_with_one_insert_each():
+    db = FakeDB()
+    logger = PredictionLogger(db, batch_size=3, flush_interval_ms=300, max_queue=100)
+    logger.log_many(1, [{'x': i} for i in range(7)], [{'prediction': i} for i in range(7)])
+
+    assert wait_for(lambda: logger.get_stats()['written'] == 7)
+    assert [len(batch) for batch in db.batches] == [3, 3, 1]
+    assert db.batches[0][0] == (1, '{"x": 0}', '{"prediction": 0}')
+    logger.shutdown()
+
+
+def test_partial_batch_is_written_after_the_flush_interval():
+    db = FakeDB()
+    logger = PredictionLogger(db, batch_size=100, flush_interval_ms=50, max_queue=100)
+    logger.log(1, [1, 2], {'prediction': 3})
+
+    assert wait_for(lambda: len(db.batches) == 1, timeout=2)
+    assert len(db.batches[0]) == 1
+    logger.shutdown()
+
+
+def test_shutdown_flushes_queued_records():
+    db = FakeDB()
+    db.release.clear()
+    logger = PredictionLogger(db, batch_size=2, flush_interval_ms=5000, max_queue=100)
+    for i in range(5):
+        logger.log(1, i, i)
+    db.release.set()
+
+    logger.shutdown()
+
+    assert sum(len(batch) for batch in db.batches) == 5
+    assert logger.get_stats()['queued'] == 0
+    assert not logger._thread.is_alive()
+
+
+def test_drop_policy_counts_records_that_did_not_fit():
+    db = FakeDB()
+    db.release.clear()
+    logger = PredictionLogger(db, batch_size=1, flush_interval_ms=5000, max_queue=2, policy='drop')
+    logger.log(1, 0, 0)
+    assert wait_for(lambda: logger.queue.empty())
+    for i in range(4):
+        logger.log(1, i, i)
+
+    assert logger.get_stats()['dropped'] == 2
+    db.release.set()
+    logger.shutdown()
+    assert logger.get_stats()['written'] == 3
+
+
+def test_failed_inserts_are_counted():
+    db = FakeDB(fail=True)
+    logger = PredictionLogger(db, batch_size=2, flush_interval_ms=10, max_queue=100)
+    logger.log_many(1, [1, 2], [1, 2])
+    logger.shutdown()
+
+    assert logger.get_stats()['failed'] == 2
+    assert logger.get_stats()['written'] == 0
+
+
+def test_writer_survives_a_raising_insert():
+    db = FakeDB()
+    calls = []
+
+    def save_predictions(rows):
+        calls.append(rows)
+        if len(calls) == 1:
+            raise RuntimeError('connection lost')
+        return True
+
+    db.save_predictions = save_predictions
+    logger = PredictionLogger(db, batch_size=2, flush_interval_ms=10, max_queue=100)
+    logger.log_many(1, [1, 2], [1, 2])
+    assert wait_for(lambda: logger.get_stats()['failed'] == 2)
+
+    logger.log(1, 3, 3)
+    assert wait_for(lambda: logger.get_stats()['written'] == 1)
+    assert logger._thread.is_alive()
+    logger.shutdown()
+
+
+def test_pending_records_are_flushed_at_interpreter_exit(tmp_path):
+    out = tmp_path / 'rows.txt'
+    script = textwrap.dedent(f"""
+        from prediction_logger import PredictionLogger
+
+        class FileDB:
+            def save_predictions(self, rows):
+                with open({str(out)!r}, 'a') as f:
+                    f.writelines(f'{{row[1]}}\\n' for row in rows)
+                return True
+
+        logger = PredictionLogger(FileDB(), batch_size=1000, flush_interval_ms=60000, max_queue=1000)
+        logger.log_many(1, list(range(10)), list(range(10)))
+    """)
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', script], cwd=backend, check=True, timeout=30)
+
+    assert out.read_text().split() == [str(i) for i in range(10)]
@@ -0,0 +1,52 @@
+"""
+Tests for prediction-time preprocessing
+"""
+import numpy as np
+import pytest
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from model_serializer import CompiledPreprocessing, ModelSerializer, PreprocessingPipeline
+
+FEATURES = ['city', 'age', 'zip']
+RECORDS = [
+    {'city': 'Paris', 'age': 30, 'zip': 75001},
+    {'city': 'Berlin', 'age': 45, 'zip': '10115'},
+    {'city': 'Tokyo', 'age': 22, 'zip': 75001}  # Unknown city
+]
+
+
+@pytest.fixture
+def fitted():
+    encoders = {
+        'city': LabelEncoder().fit(['Berlin', 'Paris']),
+        'zip': LabelEncoder().fit(['10115', '75001']),
+        'target': LabelEncoder().fit(['no', 'yes'])
+    }
+    scaler = StandardScaler().fit(np.array([[0, 20, 0], [1, 50, 1]], dtype=float))
+    return encoders, scaler
+
+
+def test_encodes_and_scales_a_batch(fitted):
+    encoders, scaler = fitted
+    X = PreprocessingPipeline(encoders, scaler).preprocess_input(RECORDS, FEATURES)
+
+    raw = np.array([[1, 30, 1], [0, 45, 0], [0, 22, 1]], dtype=float)
+    np.testing.assert_allclose(X, scaler.transform(raw))
+
+
+def test_missing_feature_is_reported(fitted):
+    with pytest.raises(ValueError, match='age'):
+        PreprocessingPipeline(*fitted).preprocess_input({'city': 'Paris', 'zip': 75001}, FEATURES)
+
+
+def test_compiled_artifact_matches_the_pipeline(fitted, tmp_path):
+    encoders, scaler = fitted
+    pipeline = PreprocessingPipeline(encoders, scaler)
+    compiled = CompiledPreprocessing.from_serialized(ModelSerializer.serialize_preprocessing(encoders, scaler))
+    compiled.save(str(tmp_path / 'preprocessing.npz'))
+    loaded = CompiledPreprocessing.load(str(tmp_path / 'preprocessing.npz'))
+
+    expected = pipeline.preprocess_input(RECORDS, FEATURES)
+    for other in (compiled, loaded):
+        np.testing.assert_array_equal(other.preprocess_input(RECORDS, FEATURES), expected)
+        assert other.decode_predictions(np.array([1, 0])) == ['yes', 'no']
+
@@ -0,0 +1,105 @@
+"""
+Tests for invalidation of the prediction result and model caches
+"""
+import os
+import pickle
+import time
+import model_cache
+from model_cache import ModelCache
+from result_cache import PredictionResultCache
+
+
+def counting_predict(calls):
+    def predict(rows):
+        calls.append(list(rows))
+        return [sum(row) for row in rows]
+    return predict
+
+
+def test_repeated_vectors_are_served_from_the_cache():
+    cache = PredictionResultCache(ttl=60, max_bytes=1024 * 1024)
+    calls = []
+
+    results, hits = cache.predict(1, 'v1', [[1, 2], [3, 4]], [[1, 2], [3, 4]], counting_predict(calls))
+    assert results == [3, 7] and hits == 0
+
+    # 1 and 1.0 canonicalize to the same key; only the new vector reaches the model
+    results, hits = cache.predict(1, 'v1', [[1.0, 2], [5, 6]], [[1.0, 2], [5, 6]], counting_predict(calls))
+    assert results == [3, 11] and hits == 1
+    assert calls == [[[1, 2], [3, 4]], [[5, 6]]]
+
+
+def test_new_model_version_misses():
+    cache = PredictionResultCache(ttl=60, max_bytes=1024 * 1024)
+    calls = []
+
+    cache.predict(1, ('/models/model_1.pkl', 1.0), [[1, 2]], [[1, 2]], counting_predict(calls))
+    _, hits = cache.predict(1, ('/models/model_1.pkl', 2.0), [[1, 2]], [[1, 2]], counting_predict(calls))
+
+    assert hits == 0 and len(calls) == 2
+
+
+def test_invalidate_drops_only_that_model():
+    cache = PredictionResultCache(ttl=60, max_bytes=1024 * 1024)
+    calls = []
+    cache.predict(1, 'v1', [[1, 2]], [[1, 2]], counting_predict(calls))
+    cache.predict(2, 'v1', [[1, 2]], [[1, 2]], counting_predict(calls))
+
+    cache.invalidate(1)
+
+    assert cache.predict(1, 'v1', [[1, 2]], [[1, 2]], counting_predict(calls))[1] == 0
+    assert cache.predict(2, 'v1', [[1, 2]], [[1, 2]], counting_predict(calls))[1] == 1
+    assert cache.total_bytes == sum(entry[1] for entry in cache.entries.values())
+
+
+def test_expired_entries_miss():
+    cache = PredictionResultCache(ttl=0.05, max_bytes=1024 * 1024)
+    calls = []
+    cache.predict(1, 'v1', [[1, 2]], [[1, 2]], counting_predict(calls))
+
+    time.sleep(0.1)
+
+    assert cache.predict(1, 'v1', [[1, 2]], [[1, 2]], counting_predict(calls))[1] == 0
+    assert len(calls) == 2
+
+
+def test_byte_limit_evicts_least_recently_used():
+    cache = PredictionResultCache(ttl=60, max_bytes=PredictionResultCache.ENTRY_OVERHEAD * 3)
+    calls = []
+    for i in range(5):
+        cache.predict(1, 'v1', [[i]], [[i]], counting_predict(calls))
+
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.evictions >= 3
+    # The newest vector survived, the oldest was evicted
+    assert cache.predict(1, 'v1', [[4]], [[4]], counting_predict(calls))[1] == 1
+    assert cache.predict(1, 'v1', [[0]], [[0]], counting_predict(calls))[1] == 0
+
+
+def test_zero_budget_disables_caching():
+    cache = PredictionResultCache(ttl=60, max_bytes=0)
+    calls = []
+    cache.predict(1, 'v1', [[1]], [[1]], counting_predict(calls))
+
+    assert cache.predict(1, 'v1', [[1]], [[1]], counting_predict(calls))[1] == 0
+    assert not cache.entries
+
+
+def test_model_cache_reloads_a_resaved_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_cache.ModelSerializer, 'load_compiled_preprocessing', staticmethod(lambda model_id: None))
+    path = tmp_path / 'model_1.pkl'
+    path.write_bytes(pickle.dumps({'version': 1}))
+    cache = ModelCache(max_entries=4, max_bytes=1024 * 1024)
+
+    assert cache.get(1, str(path))[0] == {'version': 1}
+    assert cache.get(1, str(path))[0] == {'version': 1}
+    assert cache.hits == 1
+
+    # Re-saving the file changes its mtime, so the next lookup reloads it
+    path.write_bytes(pickle.dumps({'version': 2}))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(1, str(path))[0] == {'version': 2}
+
+    cache.invalidate(1)
+    assert not cache.entries and cache.total_bytes == 0
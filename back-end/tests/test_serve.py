@@ -0,0 +1,65 @@
+"""
+Tests for the pre-fork server's worker lifecycle
+"""
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import urllib.request
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_stopping_worker_flushes_prediction_logs(tmp_path):
+    out = tmp_path / 'rows.txt'
+    script = textwrap.dedent(f"""
+        import socket
+        from flask import Flask
+        import prediction_logger
+        import serve
+
+        class FileDB:
+            def save_predictions(self, rows):
+                with open({str(out)!r}, 'a') as f:
+                    f.writelines(f'{{row[1]}}\\n' for row in rows)
+                return True
+
+        app = Flask(__name__)
+
+        @app.route('/predict/<int:n>')
+        def predict(n):
+            if prediction_logger.prediction_logger is None:
+                prediction_logger.prediction_logger = prediction_logger.PredictionLogger(
+                    FileDB(), batch_size=1000, flush_interval_ms=60000, max_queue=1000)
+            prediction_logger.prediction_logger.log(1, n, n)
+            return 'ok'
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(16)
+        print(sock.getsockname()[1], flush=True)
+        serve.run_worker(app, sock)
+    """)
+    worker = subprocess.Popen([sys.executable, '-c', script], cwd=BACKEND, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(worker.stdout.readline())
+        for n in range(3):
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/predict/{n}', timeout=10).read()
+
+        worker.send_signal(signal.SIGTERM)
+        assert worker.wait(timeout=30) == 0
+    finally:
+        worker.kill()
+        worker.stdout.close()
+
+    # The records were still queued (60 s flush interval) when SIGTERM arrived
+    assert out.read_text().split() == ['0', '1', '2']
+
+
+def test_app_target_is_not_watched_for_model_changes():
+    import serve
+
+    server = serve.PreforkServer(None, None, None, lambda: None, 1)
+    assert server._models_fingerprint() is None
+    assert 'app' in serve.SINGLE_WORKER_TARGETS
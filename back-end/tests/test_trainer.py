@@ -0,0 +1,153 @@
+"""
+Tests for candidate selection in MLModelTrainer
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+import app
+from training_pool import TrainingPool
+
+
+@pytest.fixture
+def regression_frame():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    return pd.DataFrame({
+        'a': X[:, 0],
+        'b': X[:, 1],
+        'noise': X[:, 2],
+        'y': 3 * X[:, 0] - 2 * X[:, 1] + rng.normal(scale=0.01, size=200)
+    })
+
+
+def prepared(trainer, df, features=('a', 'b', 'noise'), target='y'):
+    X, y = trainer.preprocess_data(df, list(features), target)
+    split = app.train_test_split(X, y, test_size=0.2, random_state=42)
+    return trainer._prepare_splits(X, y, split=split)
+
+
+def test_parallel_evaluation_sizes_the_pool_from_n_jobs(regression_frame, monkeypatch):
+    pool = TrainingPool(max_workers=1)
+    monkeypatch.setattr(app, 'get_training_pool', lambda: pool)
+    monkeypatch.setattr(app.os, 'cpu_count', lambda: 4)
+    trainer = app.MLModelTrainer('regression', n_jobs=2)
+    algorithms = {name: model for name, model in trainer.get_algorithms().items()
+                  if name in ('Linear Regression', 'Ridge Regression', 'Decision Tree')}
+
+    try:
+        results = trainer._evaluate_candidates(algorithms, prepared(trainer, regression_frame))
+    finally:
+        pool.shutdown()
+
+    assert pool.max_workers == 2
+    assert [r['algorithm'] for r in results] == list(algorithms)
+
+
+def regression_candidates():
+    return {
+        'Linear Regression': app.LinearRegression(),
+        'Decision Tree': app.DecisionTreeRegressor(random_state=42),
+        'K-Nearest Neighbors': app.KNeighborsRegressor(),
+        'Lasso Regression': app.Lasso(alpha=10.0),
+        'Mean': DummyRegressor()
+    }
+
+
+def record_evaluations(trainer, monkeypatch):
+    """Record the candidates and training rows of every evaluation call"""
+    calls = []
+    evaluate = trainer._evaluate_candidates
+
+    def spy(algorithms, splits):
+        results = evaluate(algorithms, splits)
+        X_train = splits['train_test'][0] if 'train_test' in splits else splits['full'][0]
+        calls.append((list(algorithms), len(X_train), sorted(results, key=lambda r: r['score'], reverse=True)))
+        return results
+
+    monkeypatch.setattr(trainer, '_evaluate_candidates', spy)
+    return calls
+
+
+def test_successive_halving_keeps_the_top_half_and_refits_the_winner(regression_frame, monkeypatch):
+    monkeypatch.setattr(app.config, 'HALVING_MIN_SAMPLES', 20)
+    trainer = app.MLModelTrainer('regression', selection='successive_halving')
+    monkeypatch.setattr(trainer, 'get_algorithms', regression_candidates)
+    calls = record_evaluations(trainer, monkeypatch)
+
+    results = trainer.train_and_evaluate(regression_frame, ['a', 'b', 'noise'], 'y')
+
+    # Rungs double the sample while halving the field; the survivor is fit on all 160 training rows
+    assert [(len(names), rows) for names, rows, _ in calls] == [(5, 20), (3, 40), (2, 80), (1, 160)]
+    for (_, _, ranked), (survivors, _, _) in zip(calls, calls[1:]):
+        assert survivors == [r['algorithm'] for r in ranked[:len(survivors)]]
+    assert results['best_model'] == 'Linear Regression' == trainer.best_model_name
+    assert 'eliminated_at_rung' not in results['results'][0]
+    assert [r.get('eliminated_at_rung') for r in results['results'][1:]] == [3, 2, 1, 1]
+
+
+def test_prepared_splits_are_read_only_and_contiguous(regression_frame):
+    trainer = app.MLModelTrainer('regression')
+    X, y = trainer.preprocess_data(regression_frame, ['a', 'b', 'noise'], 'y')
+    train_test = prepared(trainer, regression_frame)
+    k_fold = trainer._prepare_splits(X, y, cv=app.KFold(n_splits=3, shuffle=True, random_state=42))
+
+    arrays = list(train_test['train_test']) + list(k_fold['full'])
+    for fold in k_fold['folds']:
+        arrays += list(fold)
+    assert len(k_fold['folds']) == 3
+    for array in arrays:
+        assert array.flags.c_contiguous
+        assert not array.flags.writeable
+    # Features are scaled once per split, on the training rows
+    X_train = train_test['train_test'][0]
+    np.testing.assert_allclose(X_train.mean(axis=0), 0, atol=1e-9)
+
+
+def test_compaction_keeps_values_and_encodes_like_label_encoder():
+    df = pd.DataFrame({
+        'age': np.array([25, 40, 31, 25, 58], dtype=np.int64),
+        'income': [1.5, 2.5, 3.5, 4.5, 5.5],
+        'city': ['Paris', 'Berlin', 'Paris', 'Tokyo', 'Berlin'],
+        'unused': ['x'] * 5,
+        'label': ['yes', 'no', 'yes', 'no', 'yes']
+    })
+    trainer = app.MLModelTrainer('classification')
+
+    X, y = trainer.preprocess_data(df, ['age', 'income', 'city'], 'label')
+
+    assert list(X.columns) == ['age', 'income', 'city']
+    assert X['age'].dtype == np.int8 and X['age'].tolist() == df['age'].tolist()
+    assert X['income'].tolist() == df['income'].tolist()
+    _, codes = app.MLModelTrainer._encode_categorical(df['city'])
+    assert X['city'].tolist() == list(codes) == app.LabelEncoder().fit_transform(df['city']).tolist()
+    assert list(trainer.label_encoders['city'].classes_) == ['Berlin', 'Paris', 'Tokyo']
+    assert list(y) == [1, 0, 1, 0, 1]
+    assert trainer.label_encoders['target'].inverse_transform([0, 1]).tolist() == ['no', 'yes']
+
+
+def test_ranking_on_a_sample_picks_the_full_evaluation_winner(monkeypatch):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1000, 3))
+    df = pd.DataFrame({'a': X[:, 0], 'b': X[:, 1], 'noise': X[:, 2],
+                       'y': 3 * X[:, 0] - 2 * X[:, 1] + rng.normal(scale=0.5, size=1000)})
+    monkeypatch.setattr(app.config, 'SUBSAMPLE_SCORE_STDERR', 0.2)
+
+    monkeypatch.setattr(app.config, 'SUBSAMPLE_MIN_ROWS', 0)
+    full = app.MLModelTrainer('regression')
+    monkeypatch.setattr(full, 'get_algorithms', regression_candidates)
+    expected = full.train_and_evaluate(df, ['a', 'b', 'noise'], 'y')
+
+    monkeypatch.setattr(app.config, 'SUBSAMPLE_MIN_ROWS', 500)
+    sampled = app.MLModelTrainer('regression')
+    monkeypatch.setattr(sampled, 'get_algorithms', regression_candidates)
+    calls = record_evaluations(sampled, monkeypatch)
+    results = sampled.train_and_evaluate(df, ['a', 'b', 'noise'], 'y')
+
+    # All candidates ranked on a sample, then only the winner refit on the 800 training rows
+    (ranked, sample_rows, _), (refit, full_rows, _) = calls
+    assert len(ranked) == 5 and sample_rows < full_rows == 800
+    assert refit == [results['best_model']]
+    assert results['best_model'] == expected['best_model'] == 'Linear Regression'
+    assert results['results'][0]['score'] == expected['results'][0]['score']
+    assert all(r['train_size'] == sample_rows for r in results['results'][1:])
@@ -0,0 +1,101 @@
+"""
+Tests for the training results cache
+"""
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import app
+import config
+from training_cache import TrainingCache
+
+CSV = 'x1,x2,label\n' + '\n'.join(f'{i % 7},{(i * 3) % 11},{"yes" if i % 7 > 3 else "no"}' for i in range(40))
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'a': [1, 2, 3], 'b': [0.5, 1.5, 2.5], 'c': ['x', 'y', 'x']})
+
+
+def fingerprint(df, **overrides):
+    settings = dict(model_type='classification', input_features=['a', 'b'], output_feature='c', selection=None)
+    settings.update(overrides)
+    return app._training_fingerprint(df, **settings)
+
+
+def test_identical_requests_share_a_fingerprint(frame):
+    assert fingerprint(frame) == fingerprint(frame.copy())
+
+
+@pytest.mark.parametrize('change', [
+    lambda df: df.assign(b=[0.5, 1.5, 2.6]),  # One value
+    lambda df: df.rename(columns={'c': 'd'}),  # A column name
+    lambda df: df.astype({'a': np.float64}),  # A dtype
+    lambda df: df[['b', 'a', 'c']],  # Column order
+    lambda df: df.iloc[:2],  # A dropped row
+    lambda df: df.assign(e=1),  # An extra column
+])
+def test_data_changes_change_the_fingerprint(frame, change):
+    assert fingerprint(change(frame)) != fingerprint(frame)
+
+
+@pytest.mark.parametrize('override', [
+    {'model_type': 'regression'},
+    {'input_features': ['a']},
+    {'input_features': ['b', 'a']},
+    {'output_feature': 'a'},
+    {'selection': 'successive_halving'},
+])
+def test_parameter_changes_change_the_fingerprint(frame, override):
+    assert fingerprint(frame, **override) != fingerprint(frame)
+
+
+@pytest.mark.parametrize('setting, value', [
+    ('TRAINING_FLOAT32', True),
+    ('HALVING_MIN_SAMPLES', 10),
+    ('SUBSAMPLE_MIN_ROWS', 10),
+    ('SUBSAMPLE_SCORE_STDERR', 0.5),
+])
+def test_result_affecting_settings_change_the_fingerprint(frame, monkeypatch, setting, value):
+    before = fingerprint(frame)
+    monkeypatch.setattr(config, setting, value)
+    assert fingerprint(frame) != before
+
+
+def test_repeated_train_request_is_served_from_the_cache(tmp_path, monkeypatch):
+    class FakeDB:
+        def __init__(self):
+            self.next_id = 0
+            self.lock = threading.Lock()
+
+        def save_model(self, **kwargs):
+            with self.lock:
+                self.next_id += 1
+                return self.next_id
+
+    trainers = []
+
+    class CountingTrainer(app.MLModelTrainer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            trainers.append(self)
+
+    cache = TrainingCache(str(tmp_path / 'cache'), max_bytes=10 ** 9)
+    monkeypatch.setattr(config, 'MODEL_STORAGE_PATH', str(tmp_path))
+    monkeypatch.setattr(app, 'db', FakeDB())
+    monkeypatch.setattr(app, 'get_training_cache', lambda: cache)
+    monkeypatch.setattr(app, 'MLModelTrainer', CountingTrainer)
+    client = app.app.test_client()
+    request = {'model_name': 'm', 'model_type': 'classification', 'csv_data': CSV,
+               'input_features': ['x1', 'x2'], 'output_feature': 'label'}
+
+    first = client.post('/api/train', json=request)
+    second = client.post('/api/train', json=request)
+    changed = client.post('/api/train', json=dict(request, input_features=['x1']))
+
+    assert [r.status_code for r in (first, second, changed)] == [201, 201, 201]
+    assert 'cached' not in first.get_json() and second.get_json()['cached'] is True
+    assert 'cached' not in changed.get_json()
+    assert second.get_json()['results'] == first.get_json()['results']
+    assert len(trainers) == 2
+    assert cache.get_stats()['hits'] == 1
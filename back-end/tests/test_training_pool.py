@@ -0,0 +1,46 @@
+"""
+Tests for the persistent training pool
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from training_pool import TrainingPool
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_reserve_grows_the_pool():
+    pool = TrainingPool(max_workers=1)
+    executor = pool._get_executor()
+
+    assert pool.reserve(3) == 3
+    assert pool._get_executor() is not executor
+    assert pool._get_executor()._max_workers == 3
+    assert pool.reserve(2) == 3
+    pool.shutdown()
+
+
+def test_workers_started_from_app_py_do_not_import_app_or_connect():
+    script = textwrap.dedent(f"""
+        import json
+        import sys
+        sys.modules['__main__'].__file__ = {os.path.join(BACKEND, 'app.py')!r}  # As if run with `python app.py`
+        from training_pool import TrainingPool
+
+        pool = TrainingPool(max_workers=1)
+        state = pool._get_executor().submit(eval, '''(
+            'app' in __import__('sys').modules,
+            getattr(__import__('sys').modules.get('database'), 'db_manager', None) is not None,
+            '__mp_main__' in __import__('sys').modules
+        )''').result(timeout=60)
+        pool.shutdown()
+        print(json.dumps(state))
+    """)
+    out = subprocess.run([sys.executable, '-c', script], cwd=BACKEND, capture_output=True, text=True,
+                         check=True, timeout=120).stdout
+
+    imported_app, connected, loaded_main = json.loads(out.splitlines()[-1])
+    assert loaded_main  # The worker did load app.py as its __main__ script
+    assert not imported_app and not connected
@@ -0,0 +1,32 @@
+"""
+Tests for single and batch predictions in the unified model gateway
+"""
+import numpy as np
+import unified_api
+
+
+class FakeModel:
+    """Predicts a - b, with features fitted in the order (a, b)"""
+    feature_names_in_ = np.array(['a', 'b'])
+    n_features_in_ = 2
+
+    def predict(self, X):
+        return np.array([row[0] - row[1] for row in X])
+
+
+def test_single_and_batch_order_dict_inputs_by_model_features():
+    model = FakeModel()
+    input_data = {'b': 1, 'a': 5}
+
+    single, _ = unified_api.predict_single('not_a_model', None, model, input_data)
+    batch = unified_api.predict_inputs('not_a_model', model, [input_data])
+
+    assert single == {'success': True, 'prediction': 4}
+    assert batch == [single]
+
+
+def test_single_prediction_reports_missing_features():
+    result, cache_hits = unified_api.predict_single('not_a_model', None, FakeModel(), {'a': 5})
+
+    assert result == {'success': False, 'error': 'Missing features: b'}
+    assert cache_hits is None
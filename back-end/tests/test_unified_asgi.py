@@ -0,0 +1,64 @@
+"""
+Tests for API call tracking in the ASGI gateway
+"""
+import asyncio
+import json
+import threading
+import time
+import unified_api
+import unified_asgi
+from model_registry import ModelRegistry
+
+
+def test_tracking_is_bounded_and_flushed_on_stop(monkeypatch):
+    written = []
+    release = threading.Event()
+
+    def track_api_call(**kwargs):
+        release.wait(5)
+        written.append(kwargs['n'])
+
+    monkeypatch.setattr(unified_api, 'track_api_call', track_api_call)
+    # The writer takes the first record and blocks on it; the rest fill the queue
+    unified_asgi.track_api_call_later(n=-1)
+    deadline = time.monotonic() + 5
+    while not unified_asgi.stats_queue.empty() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for n in range(unified_asgi.MAX_PENDING_STATS + 100):
+        unified_asgi.track_api_call_later(n=n)
+    assert unified_asgi.stats_queue.full()
+
+    release.set()
+    unified_asgi.stop_stats()
+
+    assert written == [-1] + list(range(unified_asgi.MAX_PENDING_STATS))
+    assert not unified_asgi.stats_thread.is_alive()
+
+
+def get(path):
+    """Serve one GET request through the ASGI app, returning (status, JSON body)"""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(unified_asgi.app({'type': 'http', 'method': 'GET', 'path': path}, receive, send))
+    return sent[0]['status'], json.loads(b''.join(m.get('body', b'') for m in sent[1:]))
+
+
+def test_models_and_ready_match_the_flask_gateway(tmp_path, monkeypatch):
+    (tmp_path / 'model_4_Loan Approval.pkl').write_bytes(b'')
+    registry = ModelRegistry(str(tmp_path), normalize=unified_api.sanitize_name, rescan_seconds=0)
+    registry.scan()
+    monkeypatch.setattr(unified_api, 'model_registry', registry)
+    monkeypatch.setitem(unified_api.preload_status, 'state', 'loading')
+    client = unified_api.app.test_client()
+
+    for path in ('/models', '/ready'):
+        response = client.get(path)
+        assert get(path) == (response.status_code, response.get_json())
+    assert get('/models')[1]['models'] == [{'id': '4', 'name': 'Loan Approval', 'endpoint': '/loan_approval/predict'}]
+    assert get('/ready')[0] == 503
@@ -0,0 +1,190 @@
+"""
+Persistent cache of training results keyed by a dataset + config fingerprint
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+import config
+
+
+class TrainingCache:
+    """Stores leaderboards and best-model pickles of past training runs on disk
+
+    Each entry is a directory named after its fingerprint holding
+    ``entry.json`` (leaderboard, justification, serialized preprocessing)
+    and ``model.pkl``. Entries are evicted least-recently-used first once
+    the cache grows past its byte budget.
+    """
+
+    ENTRY_FILE = 'entry.json'
+    MODEL_FILE = 'model.pkl'
+
+    def __init__(self, cache_path: str = None, max_bytes: int = None):
+        """
+        Initialize training cache
+
+        Args:
+            cache_path: Directory holding cache entries
+            max_bytes: Disk budget for all entries (0 disables the cache)
+        """
+        self.cache_path = cache_path or config.TRAINING_CACHE_PATH
+        self.max_bytes = config.TRAINING_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame, **training_config) -> str:
+        """
+        Compute a content hash of a parsed dataset and its training config
+
+        Args:
+            df: Parsed dataset
+            training_config: Settings that affect training (model type, features, ...)
+
+        Returns:
+            Hex digest identifying the training request
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+        digest.update(json.dumps([str(t) for t in df.dtypes]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        digest.update(json.dumps(training_config, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, fingerprint: str) -> Optional[Dict]:
+        """
+        Look up a cached training run
+
+        Returns:
+            Entry dict with 'results', 'best_model', 'justification',
+            'preprocessing' and 'model_path', or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        entry_dir = os.path.join(self.cache_path, fingerprint)
+        entry_file = os.path.join(entry_dir, self.ENTRY_FILE)
+        model_path = os.path.join(entry_dir, self.MODEL_FILE)
+
+        with self._lock:
+            try:
+                with open(entry_file, 'r') as f:
+                    entry = json.load(f)
+                if not os.path.exists(model_path):
+                    raise FileNotFoundError(model_path)
+                # Mark as recently used for LRU eviction
+                os.utime(entry_file)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        entry['model_path'] = model_path
+        print(f"✓ Training cache hit: {fingerprint[:12]}")
+        return entry
+
+    def put(self, fingerprint: str, results: Dict, preprocessing: Dict, model_file_path: str):
+        """
+        Store a training run
+
+        Args:
+            fingerprint: Key from fingerprint()
+            results: Output of MLModelTrainer.train_and_evaluate
+            preprocessing: Output of ModelSerializer.serialize_preprocessing
+            model_file_path: Pickled best model to keep a copy of
+        """
+        if not self.enabled:
+            return
+
+        entry_dir = os.path.join(self.cache_path, fingerprint)
+        tmp_dir = f"{entry_dir}.tmp{threading.get_ident()}"
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+
+            # Hard-link when possible so caching the model costs no extra disk space or copy time
+            cached_model_path = os.path.join(tmp_dir, self.MODEL_FILE)
+            try:
+                os.link(model_file_path, cached_model_path)
+            except OSError:
+                shutil.copyfile(model_file_path, cached_model_path)
+
+            with open(os.path.join(tmp_dir, self.ENTRY_FILE), 'w') as f:
+                json.dump({
+                    'fingerprint': fingerprint,
+                    'created_at': datetime.now().isoformat(),
+                    'results': results['results'],
+                    'best_model': results['best_model'],
+                    'justification': results['justification'],
+                    'preprocessing': preprocessing
+                }, f, default=str)
+
+            with self._lock:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.rename(tmp_dir, entry_dir)
+                self._evict()
+            print(f"✓ Training cached: {fingerprint[:12]}")
+        except Exception as e:
+            print(f"✗ Error caching training results: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _entries(self) -> List[Dict]:
+        """List cache entries with their size and last access time"""
+        entries = []
+        if not os.path.isdir(self.cache_path):
+            return entries
+
+        for name in os.listdir(self.cache_path):
+            entry_dir = os.path.join(self.cache_path, name)
+            entry_file = os.path.join(entry_dir, self.ENTRY_FILE)
+            if not os.path.isfile(entry_file):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, f))
+                for f in os.listdir(entry_dir)
+            )
+            entries.append({'path': entry_dir, 'size': size, 'last_used': os.path.getmtime(entry_file)})
+        return entries
+
+    def _evict(self):
+        """Remove least-recently-used entries until the cache fits its budget (caller holds the lock)"""
+        entries = sorted(self._entries(), key=lambda e: e['last_used'])
+        total = sum(e['size'] for e in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry['path'], ignore_errors=True)
+            total -= entry['size']
+            print(f"✓ Training cache evicted: {os.path.basename(entry['path'])[:12]}")
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and disk usage"""
+        with self._lock:
+            entries = self._entries()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(entries),
+                'bytes': sum(e['size'] for e in entries),
+                'max_bytes': self.max_bytes
+            }
+
+
+# Global training cache instance
+training_cache = None
+
+def get_training_cache() -> TrainingCache:
+    """Get training cache instance"""
+    global training_cache
+    if training_cache is None:
+        training_cache = TrainingCache()
+    return training_cache
@@ -0,0 +1,259 @@
+"""
+Persistent process pool for evaluating candidate algorithms in parallel
+"""
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import (
+    accuracy_score, precision_score, recall_score, f1_score,
+    mean_squared_error, mean_absolute_error, r2_score
+)
+import config
+
+
+def evaluate_classification(y_true, y_pred) -> Dict:
+    """Evaluate classification model"""
+    return {
+        'accuracy': round(accuracy_score(y_true, y_pred), 4),
+        'precision': round(precision_score(y_true, y_pred, average='weighted', zero_division=0), 4),
+        'recall': round(recall_score(y_true, y_pred, average='weighted', zero_division=0), 4),
+        'f1_score': round(f1_score(y_true, y_pred, average='weighted', zero_division=0), 4)
+    }
+
+
+def evaluate_regression(y_true, y_pred) -> Dict:
+    """Evaluate regression model"""
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        'mse': round(mse, 4),
+        'rmse': round(np.sqrt(mse), 4),
+        'mae': round(mean_absolute_error(y_true, y_pred), 4),
+        'r2_score': round(r2_score(y_true, y_pred), 4)
+    }
+
+
+def fit_and_score(model_type: str, name: str, model: Any, splits: Dict) -> Dict:
+    """Fit a single algorithm on the prepared splits and score it"""
+    evaluate = evaluate_classification if model_type == 'classification' else evaluate_regression
+    score_key = 'f1_score' if model_type == 'classification' else 'r2_score'
+
+    if 'folds' in splits:
+        # K-fold cross-validation: fit and average metrics across folds
+        fold_metrics = []
+        fold_scores = []
+
+        for X_train_scaled, X_test_scaled, y_train_fold, y_test_fold in splits['folds']:
+            # Clone and fit model
+            model_clone = clone(model)
+            model_clone.fit(X_train_scaled, y_train_fold)
+            y_pred = model_clone.predict(X_test_scaled)
+
+            # Evaluate fold
+            metrics_fold = evaluate(y_test_fold, y_pred)
+            fold_metrics.append(metrics_fold)
+            fold_scores.append(metrics_fold[score_key])
+
+        # Average metrics across folds
+        metrics = {}
+        if fold_metrics:
+            for key in fold_metrics[0].keys():
+                metrics[key] = round(np.mean([m[key] for m in fold_metrics]), 4)
+            score = np.mean(fold_scores)
+        else:
+            raise ValueError(f"No valid folds for {name}")
+
+        # Keep the per-fold results, persisted alongside the averages
+        fold_results = [
+            {'fold': i, 'metrics': m, 'score': s}
+            for i, (m, s) in enumerate(zip(fold_metrics, fold_scores))
+        ]
+
+        # Also train on full dataset for serialization
+        X_scaled, y_full = splits['full']
+        model.fit(X_scaled, y_full)
+
+    else:
+        # Traditional train/test split evaluation
+        X_train_scaled, X_test_scaled, y_train, y_test = splits['train_test']
+
+        # Train model
+        model.fit(X_train_scaled, y_train)
+
+        # Predict and evaluate
+        y_pred = model.predict(X_test_scaled)
+        metrics = evaluate(y_test, y_pred)
+        score = metrics[score_key]
+
+    result = {
+        'algorithm': name,
+        'metrics': metrics,
+        'score': score,
+        'model': model  # Store model for later serialization
+    }
+    if 'folds' in splits:
+        result['fold_results'] = fold_results
+    return result
+
+
+class SharedArray:
+    """Reference to an array placed in shared memory; pickles as its segment name, shape and dtype"""
+
+    def __init__(self, segment: str, shape: tuple, dtype: str):
+        self.segment = segment
+        self.shape = shape
+        self.dtype = dtype
+
+
+# Shared-memory segments mapped by this worker process: segment name -> SharedMemory
+_attached = {}
+
+
+def _attach(value: Any, used: set) -> Any:
+    """Replace SharedArray references in a splits structure with read-only views of the shared pages"""
+    if isinstance(value, SharedArray):
+        used.add(value.segment)
+        if value.segment not in _attached:
+            _attached[value.segment] = shared_memory.SharedMemory(name=value.segment)
+        array = np.ndarray(value.shape, np.dtype(value.dtype), buffer=_attached[value.segment].buf)
+        array.flags.writeable = False
+        return array
+    if isinstance(value, (list, tuple)):
+        return type(value)(_attach(v, used) for v in value)
+    if isinstance(value, dict):
+        return {k: _attach(v, used) for k, v in value.items()}
+    return value
+
+
+def _run_task(model_type: str, name: str, model: Any, splits: Dict) -> Dict:
+    """Pool entry point: map the run's shared splits, then fit and score"""
+    used = set()
+    splits = _attach(splits, used)
+
+    # Unmap segments of earlier runs (kept while an array still references them)
+    for segment in [s for s in _attached if s not in used]:
+        try:
+            _attached[segment].close()
+            del _attached[segment]
+        except BufferError:
+            pass
+
+    return fit_and_score(model_type, name, model, splits)
+
+
+class TrainingPool:
+    """Worker processes evaluating candidate algorithms, kept for the life of the server
+
+    Workers are started once, with the forkserver start method (spawn where
+    it is unavailable), so they are never forked from a multithreaded
+    request-serving process. The fork server preloads only this module.
+    Workers still import the server's ``__main__`` script (app.py) as
+    ``__mp_main__``, so that import must stay free of side effects: the
+    database connects on first use, never at import. The pool grows when a
+    run asks for more workers than it has.
+    A training run copies its prepared splits into
+    shared memory once; tasks carry only references to them, and every
+    worker maps the same pages instead of unpickling the data again for each
+    algorithm.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Initialize training pool
+
+        Args:
+            max_workers: Number of worker processes (defaults to TRAINING_WORKERS)
+        """
+        self.max_workers = max_workers or config.TRAINING_WORKERS
+        self.executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self, replace: bool = False) -> ProcessPoolExecutor:
+        """Start the worker processes on first use, or replace a pool whose worker died"""
+        with self._lock:
+            if replace and self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+            if self.executor is None:
+                if 'forkserver' in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context('forkserver')
+                    context.set_forkserver_preload(['training_pool'])
+                else:
+                    context = multiprocessing.get_context('spawn')
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self.executor
+
+    def reserve(self, n_workers: int) -> int:
+        """
+        Grow the pool to at least ``n_workers`` processes
+
+        Tasks already queued on the smaller pool still run there.
+
+        Returns: the pool's number of worker processes
+        """
+        with self._lock:
+            if n_workers > self.max_workers:
+                self.max_workers = n_workers
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False)
+                    self.executor = None
+            return self.max_workers
+
+    @contextmanager
+    def share(self, splits: Dict):
+        """
+        Copy the arrays of prepared splits into shared memory for the duration of a run
+
+        Yields the same structure with numeric arrays replaced by SharedArray
+        references. Object arrays are left as they are and travel pickled.
+        """
+        segments = []
+
+        def place(value):
+            if isinstance(value, np.ndarray) and value.dtype != object and value.nbytes:
+                segment = shared_memory.SharedMemory(create=True, size=value.nbytes)
+                segments.append(segment)
+                np.ndarray(value.shape, value.dtype, buffer=segment.buf)[...] = value
+                return SharedArray(segment.name, value.shape, value.dtype.str)
+            if isinstance(value, (list, tuple)):
+                return type(value)(place(v) for v in value)
+            if isinstance(value, dict):
+                return {k: place(v) for k, v in value.items()}
+            return value
+
+        try:
+            yield place(splits)
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    def submit(self, model_type: str, name: str, model: Any, shared_splits: Dict) -> Future:
+        """Queue one algorithm for fitting and scoring on splits from share()"""
+        try:
+            return self._get_executor().submit(_run_task, model_type, name, model, shared_splits)
+        except BrokenProcessPool:
+            return self._get_executor(replace=True).submit(_run_task, model_type, name, model, shared_splits)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+                self.executor = None
+
+
+# Global training pool instance
+training_pool = None
+
+def get_training_pool() -> TrainingPool:
+    """Get training pool instance"""
+    global training_pool
+    if training_pool is None:
+        training_pool = TrainingPool()
+    return training_pool
@@ -5,21 +5,32 @@ Serves all trained models on a single port with model-specific routes.
 Routes: /{model_name}/predict and /{model_name}/predict_batch
 """
 from flask import Flask, request, jsonify
+import functools
 import pickle
 import os
+import threading
 import traceback
-import glob
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 import time
+import numpy as np
 import psutil
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+import config
+import batch_prediction
+from micro_batcher import MicroBatcherRegistry, get_micro_batchers
+from model_registry import ModelRegistry
+from result_cache import PredictionResultCache, get_prediction_cache
+
 # Import database for tracking
 try:
     from database import get_db
+    get_db()  # Connect now; without a database the gateway serves without tracking
     DB_AVAILABLE = True
 except Exception as e:
     print(f"Warning: Could not import database: {e}")
@@ -27,71 +38,117 @@ except Exception as e:
 
 app = Flask(__name__)
 
-# Cache loaded models
+# Cache loaded models: sanitized name -> (path, mtime, model)
 models_cache = {}
 
+# Startup preload progress, reported by /ready
+preload_status = {
+    'state': 'idle',  # idle (no preload configured) -> loading -> ready
+    'total': 0,
+    'loaded': [],
+    'failed': {},
+    'started_at': None,
+    'finished_at': None
+}
+
 def sanitize_name(name: str) -> str:
     """Sanitize model name for URL routing"""
     return name.lower().replace(' ', '_').replace('-', '_')
 
+# Index of the models directory, used to resolve routes without globbing
+model_registry = ModelRegistry(os.path.join(os.path.dirname(__file__), 'models'), normalize=sanitize_name)
+
 def load_model(model_name: str):
     """Load a model from the models directory"""
-    if model_name in models_cache:
-        return models_cache[model_name]
-    
-    # Try to find the model file
-    models_dir = os.path.join(os.path.dirname(__file__), 'models')
-    
-    # Look for model files matching the name (case-insensitive)
-    all_files = glob.glob(os.path.join(models_dir, "*.pkl"))
-    matching_files = [
-        f for f in all_files 
-        if model_name.lower() in os.path.basename(f).lower()
-    ]
-    
-    if not matching_files:
+    entry = model_registry.get(model_name)
+    if entry is None:
         return None
-    
-    # Use the first matching file
-    model_path = matching_files[0]
-    
+
+    # Reuse the loaded model unless its file was replaced since
+    cached = models_cache.get(model_name)
+    if cached and cached[0] == entry['path'] and cached[1] == entry['mtime']:
+        return cached[2]
+
+    model_path = entry['path']
     try:
         with open(model_path, 'rb') as f:
             model = pickle.load(f)
-        models_cache[model_name] = model
+        models_cache[model_name] = (model_path, entry['mtime'], model)
         print(f"✓ Loaded model: {model_name} from {model_path}")
         return model
     except Exception as e:
         print(f"✗ Failed to load model {model_name}: {e}")
         return None
 
-def predict_input_dict(model, input_dict: dict):
-    """Make a prediction with a single input"""
+def predict_rows(model, rows):
+    """Make predictions for a list of feature vectors with a single predict call"""
+    preds = model.predict(rows)
+    return [p.tolist() if hasattr(p, 'tolist') else p for p in preds]
+
+def cached_predict(model_name, predict_fn, rows):
+    """
+    Predict feature vectors through the result cache when it is enabled for the model
+    
+    Returns:
+        (predictions, cache_hits); cache_hits is None when caching is off
+    """
+    entry = model_registry.get(model_name)
+    if entry is None or not PredictionResultCache.enabled(model_name, entry['id']):
+        return predict_fn(rows), None
+    
+    # The file mtime versions the entries, matching when load_model reloads the model
+    return get_prediction_cache().predict(entry['id'], entry['mtime'], rows, rows, predict_fn)
+
+def model_features(model):
+    """Feature names (in model order) and feature count the model was fitted with, when it records them"""
+    feature_names = getattr(model, 'feature_names_in_', None)
+    return (None if feature_names is None else list(feature_names)), getattr(model, 'n_features_in_', None)
+
+def predict_single(model_name, model_id, model, input_data):
+    """
+    Predict one input, coalesced with concurrent requests when micro-batching is on
+    
+    Inputs are validated and ordered like /predict_batch inputs.
+    
+    Returns:
+        (result, cache_hits): the response payload and the result cache hits (None when caching is off)
+    """
+    input_features, n_features = model_features(model)
+    vectors, errors = batch_prediction.validate_inputs([input_data], input_features, n_features)
+    if errors:
+        return {'success': False, 'error': errors[0]}, None
+    
+    predict_fn = functools.partial(predict_rows, model)
+    cached = models_cache.get(model_name)
+    if cached and MicroBatcherRegistry.enabled(model_name, model_id):
+        # Versioned by model file path and mtime, so a re-saved model gets a new batcher
+        batcher = get_micro_batchers().get(model_name, (cached[0], cached[1]), predict_fn)
+        predict_fn = lambda rows: [batcher.predict(rows[0])]
     try:
-        # Convert dict to list of values
-        if isinstance(input_dict, dict):
-            X = [list(input_dict.values())]
-        else:
-            X = [input_dict]
-        
-        preds = model.predict(X)
-        
-        # Convert numpy types to python types
-        try:
-            result = preds[0].tolist() if hasattr(preds[0], 'tolist') else preds[0]
-        except Exception:
-            result = preds[0]
-        
-        return {'success': True, 'prediction': result}
+        preds, cache_hits = cached_predict(model_name, predict_fn, [vectors[0]])
+        return {'success': True, 'prediction': preds[0]}, cache_hits
     except Exception as e:
         traceback.print_exc()
-        return {'success': False, 'error': str(e)}
+        return {'success': False, 'error': str(e)}, None
 
-def track_api_call(endpoint, method, status_code, response_time_ms, model_id=None):
-    """Track API call to database"""
+def predict_inputs(model_name, model, inputs):
+    """Predict a batch with one predict call, keeping one result (or error) per input"""
+    input_features, n_features = model_features(model)
+    return batch_prediction.predict_inputs(
+        inputs,
+        lambda rows: cached_predict(model_name, functools.partial(predict_rows, model), rows)[0],
+        input_features=input_features,
+        n_features=n_features
+    )
+
+def track_api_call(endpoint, method, status_code, response_time_ms, model_id=None, cache_hits=None, cache_misses=None,
+                   client_ip=None):
+    """Track API call to database (client_ip defaults to the current Flask request's address)"""
     if not DB_AVAILABLE:
         return
     
+    conn = None
+    cursor = None
     try:
         # Get system metrics
         cpu_percent = psutil.cpu_percent()
@@ -99,12 +156,14 @@ def track_api_call(endpoint, method, status_code, response_time_ms, model_id=Non
         memory_usage_mb = memory.used / (1024 * 1024)
         
         db = get_db()
-        if db and db.connection:
-            cursor = db.connection.cursor(buffered=True)
+        conn = db.acquire_connection() if db else None
+        if conn:
+            cursor = conn.cursor(buffered=True)
             query = """
                 INSERT INTO api_stats 
-                (endpoint, method, status_code, response_time_ms, model_id, client_ip, cpu_percent, memory_usage_mb)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                (endpoint, method, status_code, response_time_ms, model_id, client_ip, cpu_percent, memory_usage_mb,
+                 cache_hits, cache_misses)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             cursor.execute(query, (
                 endpoint,
@@ -112,35 +171,94 @@ def track_api_call(endpoint, method, status_code, response_time_ms, model_id=Non
                 status_code,
                 response_time_ms,
                 model_id,
-                request.remote_addr,
+                client_ip if client_ip is not None else request.remote_addr,
                 cpu_percent,
-                memory_usage_mb
+                memory_usage_mb,
+                cache_hits,
+                cache_misses
             ))
-            db.connection.commit()
-            cursor.close()
+            conn.commit()
     except Exception as e:
         print(f"Warning: Failed to log API stat: {e}")
+    finally:
+        if conn:
+            db.release_connection(conn, cursor)
 
 def get_model_id_from_name(model_name):
-    """Extract model ID from model filename"""
-    try:
-        models_dir = os.path.join(os.path.dirname(__file__), 'models')
-        all_files = glob.glob(os.path.join(models_dir, "*.pkl"))
-        matching_files = [
-            f for f in all_files 
-            if model_name.lower() in os.path.basename(f).lower()
-        ]
-        
-        if matching_files:
-            basename = os.path.basename(matching_files[0])
-            # Extract ID from "model_21_ModelTest.pkl"
-            parts = basename.replace('.pkl', '').split('_', 2)
-            if len(parts) >= 2:
-                return int(parts[1])
-    except Exception:
-        pass
-    return None
+    """Look up the model ID for a route name"""
+    entry = model_registry.get(model_name)
+    return entry['id'] if entry else None
+
 
+def warm_up_model(model):
+    """Run one synthetic prediction so the first real request skips lazy initialization"""
+    n_features = getattr(model, 'n_features_in_', None)
+    if n_features:
+        model.predict(np.zeros((1, n_features)))
+
+def _preload_model(model_name: str):
+    """Load and warm up one model for the startup preload"""
+    model = load_model(model_name)
+    if model is None:
+        raise RuntimeError('model could not be loaded')
+    warm_up_model(model)
+
+def preload_models():
+    """Load and warm up the configured models in parallel, then mark the gateway ready"""
+    names = [sanitize_name(m['name']) for m in model_registry.list()]
+    selected = {sanitize_name(m.strip()) for m in config.PRELOAD_MODELS.split(',') if m.strip()}
+    if '*' not in selected:
+        names = [n for n in names if n in selected]
+    preload_status['total'] = len(names)
+
+    with ThreadPoolExecutor(max_workers=config.PRELOAD_WORKERS) as executor:
+        futures = {executor.submit(_preload_model, name): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                preload_status['loaded'].append(name)
+            except Exception as e:
+                print(f"✗ Failed to preload model {name}: {e}")
+                preload_status['failed'][name] = str(e)
+
+    preload_status['finished_at'] = datetime.now().isoformat()
+    preload_status['state'] = 'ready'
+    print(f"✓ Preloaded {len(preload_status['loaded'])}/{len(names)} models")
+
+def start_preload(background: bool = True):
+    """Start preloading (in the background by default); /ready reports 503 until it finishes"""
+    if not config.PRELOAD_MODELS.strip():
+        return
+    preload_status.update(state='loading', loaded=[], failed={}, started_at=datetime.now().isoformat())
+    if background:
+        threading.Thread(target=preload_models, name='model-preload', daemon=True).start()
+    else:
+        preload_models()
+
+def readiness():
+    """Readiness payload and status code: 200 once startup preloading and warm-up have finished"""
+    status = dict(preload_status, loaded=len(preload_status['loaded']))
+    is_ready = status['state'] != 'loading'
+    return {'success': True, 'ready': is_ready, **status}, 200 if is_ready else 503
+
+def available_models():
+    """All indexed models with their prediction endpoints"""
+    return [
+        {
+            'id': str(m['id']),
+            'name': m['name'],
+            'endpoint': f'/{sanitize_name(m["name"])}/predict'
+        }
+        for m in model_registry.list()
+    ]
+
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness check: 200 once startup preloading and warm-up have finished"""
+    payload, status = readiness()
+    return jsonify(payload), status
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -152,6 +270,7 @@ def predict(model_name):
     """Single prediction endpoint"""
     start_time = time.time()
     status_code = 200
+    cache_hits = None
     
     try:
         # Sanitize the model name
@@ -179,7 +298,7 @@ def predict(model_name):
             return jsonify({'success': False, 'error': 'Missing "data" or "input" in JSON body'}), status_code
         
         # Make prediction
-        result = predict_input_dict(model, input_data)
+        result, cache_hits = predict_single(model_name_clean, model_id, model, input_data)
         status_code = 200 if result.get('success') else 500
         
         return jsonify(result), status_code
@@ -191,7 +310,9 @@ def predict(model_name):
             method=request.method,
             status_code=status_code,
             response_time_ms=duration_ms,
-            model_id=model_id if 'model_id' in locals() else None
+            model_id=model_id if 'model_id' in locals() else None,
+            cache_hits=cache_hits,
+            cache_misses=None if cache_hits is None else 1 - cache_hits
         )
 
 @app.route('/<model_name>/predict_batch', methods=['POST'])
@@ -215,42 +336,41 @@ def predict_batch(model_name):
     if not inputs or not isinstance(inputs, list):
         return jsonify({'success': False, 'error': 'Missing "data" or "inputs" (list) in JSON body'}), 400
     
-    # Make predictions
-    results = []
-    for inp in inputs:
-        result = predict_input_dict(model, inp)
-        results.append(result)
+    # Make predictions with a single predict call over all valid rows
+    results = predict_inputs(model_name_clean, model, inputs)
     
     return jsonify({'success': True, 'results': results})
 
+@app.route('/micro-batching/stats', methods=['GET'])
+def micro_batching_stats():
+    """Per-model micro-batching counters and batch size histograms"""
+    return jsonify({
+        'success': True,
+        'enabled_for': config.MICRO_BATCH_MODELS,
+        'models': get_micro_batchers().get_stats()
+    })
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Prediction result cache counters"""
+    return jsonify({'success': True, 'prediction_cache': get_prediction_cache().get_stats()})
+
 @app.route('/models', methods=['GET'])
 def list_models():
     """List all available models"""
-    models_dir = os.path.join(os.path.dirname(__file__), 'models')
-    model_files = glob.glob(os.path.join(models_dir, '*.pkl'))
-    
-    models = []
-    for f in model_files:
-        basename = os.path.basename(f)
-        # Extract model ID and name from filename like "model_18_sklklsd.pkl"
-        parts = basename.replace('.pkl', '').split('_', 2)
-        if len(parts) >= 3:
-            model_id = parts[1]
-            model_name = parts[2]
-            models.append({
-                'id': model_id,
-                'name': model_name,
-                'endpoint': f'/{sanitize_name(model_name)}/predict'
-            })
-    
-    return jsonify({'success': True, 'models': models})
+    return jsonify({'success': True, 'models': available_models()})
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8001))
     print(f'Starting Unified Model API Gateway on port {port}...')
     print('Available endpoints:')
     print('  GET  /health')
+    print('  GET  /ready')
     print('  GET  /models')
+    print('  GET  /micro-batching/stats')
+    print('  GET  /cache/stats')
     print('  POST /<model_name>/predict')
     print('  POST /<model_name>/predict_batch')
+    model_registry.start()
+    start_preload()
     app.run(host='0.0.0.0', port=port, debug=False)
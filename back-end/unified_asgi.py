@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Asyncio (ASGI) variant of the Unified Model API Gateway
+Serves the same routes as unified_api.py without holding a thread per connection:
+/health, /ready, /models, /{model_name}/predict and /{model_name}/predict_batch.
+
+Model loading and predict calls run in a bounded thread pool
+(ASGI_PREDICT_WORKERS) and API call tracking is handed to a single
+background writer thread, so the event loop never blocks on disk, CPU-bound
+predictions or MySQL.
+
+Run with any ASGI server, e.g.:
+  pip install -r requirements-asgi.txt
+  uvicorn unified_asgi:app --port 8001
+"""
+import asyncio
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+import config
+import unified_api
+
+# CPU-bound work (unpickling, predict) runs here, off the event loop
+predict_executor = ThreadPoolExecutor(max_workers=config.ASGI_PREDICT_WORKERS, thread_name_prefix='asgi-predict')
+
+# API call tracking is written from a single background thread, so it holds at most one pooled MySQL connection
+MAX_PENDING_STATS = 10000  # Tracking records dropped beyond this backlog
+stats_queue = queue.Queue(maxsize=MAX_PENDING_STATS)
+
+
+async def run_blocking(func, *args):
+    """Run a blocking function in the predict pool"""
+    return await asyncio.get_running_loop().run_in_executor(predict_executor, func, *args)
+
+
+def track_api_call_later(**kwargs):
+    """Queue an API call record for the background writer without waiting for MySQL"""
+    try:
+        stats_queue.put_nowait(kwargs)
+    except queue.Full:
+        pass
+
+
+def write_stats():
+    """Background writer: record queued API calls until the None sentinel"""
+    while True:
+        kwargs = stats_queue.get()
+        if kwargs is None:
+            return
+        unified_api.track_api_call(**kwargs)
+
+
+stats_thread = threading.Thread(target=write_stats, name='asgi-stats', daemon=True)
+stats_thread.start()
+
+
+def stop_stats():
+    """Write the records still queued, then stop the background writer"""
+    if stats_thread.is_alive():
+        stats_queue.put(None)
+        stats_thread.join()
+
+
+atexit.register(stop_stats)
+
+
+async def read_json(receive):
+    """Read the whole request body and parse it as JSON (None if empty or invalid)"""
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    try:
+        return json.loads(b''.join(chunks) or b'null')
+    except ValueError:
+        return None
+
+
+async def send_json(send, payload, status: int = 200):
+    """Send a JSON response"""
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def predict(scope, receive, model_name):
+    """Single prediction endpoint; returns (payload, status)"""
+    start_time = time.time()
+    status_code = 200
+    cache_hits = None
+    model_name_clean = unified_api.sanitize_name(model_name)
+    model_id = None
+
+    try:
+        # May rescan the models directory
+        model_id = await run_blocking(unified_api.get_model_id_from_name, model_name_clean)
+        model = await run_blocking(unified_api.load_model, model_name_clean)
+        if model is None:
+            status_code = 404
+            return {'success': False, 'error': f'Model "{model_name}" not found'}, status_code
+
+        payload = await read_json(receive)
+        if not payload or not isinstance(payload, dict):
+            status_code = 400
+            return {'success': False, 'error': 'Missing JSON body'}, status_code
+
+        # Accept both {"data": {...}} and {"input": {...}} formats
+        input_data = payload.get('data') or payload.get('input')
+        if input_data is None:
+            status_code = 400
+            return {'success': False, 'error': 'Missing "data" or "input" in JSON body'}, status_code
+
+        result, cache_hits = await run_blocking(unified_api.predict_single, model_name_clean, model_id, model, input_data)
+        status_code = 200 if result.get('success') else 500
+        return result, status_code
+    finally:
+        client = scope.get('client')
+        track_api_call_later(
+            endpoint=scope['path'],
+            method=scope['method'],
+            status_code=status_code,
+            response_time_ms=(time.time() - start_time) * 1000,
+            model_id=model_id,
+            cache_hits=cache_hits,
+            cache_misses=None if cache_hits is None else 1 - cache_hits,
+            client_ip=client[0] if client else ''
+        )
+
+
+async def predict_batch(scope, receive, model_name):
+    """Batch prediction endpoint; returns (payload, status)"""
+    model_name_clean = unified_api.sanitize_name(model_name)
+
+    model = await run_blocking(unified_api.load_model, model_name_clean)
+    if model is None:
+        return {'success': False, 'error': f'Model "{model_name}" not found'}, 404
+
+    payload = await read_json(receive)
+    if not payload or not isinstance(payload, dict):
+        return {'success': False, 'error': 'Missing JSON body'}, 400
+
+    # Accept both {"data": [...]} and {"inputs": [...]} formats
+    inputs = payload.get('data') or payload.get('inputs')
+    if not inputs or not isinstance(inputs, list):
+        return {'success': False, 'error': 'Missing "data" or "inputs" (list) in JSON body'}, 400
+
+    results = await run_blocking(unified_api.predict_inputs, model_name_clean, model, inputs)
+    return {'success': True, 'results': results}, 200
+
+
+async def lifespan(receive, send):
+    """Index the models directory and start preloading on startup; flush tracking on shutdown"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            unified_api.model_registry.start()
+            unified_api.start_preload()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            unified_api.model_registry.stop()
+            await asyncio.get_running_loop().run_in_executor(None, stop_stats)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    method = scope['method']
+    parts = scope['path'].strip('/').split('/')
+
+    if len(parts) == 2 and parts[1] in ('predict', 'predict_batch'):
+        if method != 'POST':
+            await send_json(send, {'success': False, 'error': 'Method not allowed'}, 405)
+            return
+        handler = predict if parts[1] == 'predict' else predict_batch
+        payload, status = await handler(scope, receive, parts[0])
+    elif len(parts) == 1 and parts[0] in ('health', 'ready', 'models'):
+        if method != 'GET':
+            await send_json(send, {'success': False, 'error': 'Method not allowed'}, 405)
+            return
+        if parts[0] == 'health':
+            payload, status = {'success': True, 'models_loaded': len(unified_api.models_cache)}, 200
+        elif parts[0] == 'ready':
+            payload, status = unified_api.readiness()
+        else:
+            payload, status = {'success': True, 'models': unified_api.available_models()}, 200
+    else:
+        payload, status = {'success': False, 'error': 'Not found'}, 404
+
+    await send_json(send, payload, status)
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        print('✗ uvicorn is not installed (pip install -r requirements-asgi.txt), or run unified_asgi:app with another ASGI server')
+        raise SystemExit(1)
+
+    port = int(os.getenv('PORT', 8001))
+    print(f'Starting Unified Model API Gateway (ASGI) on port {port}...')
+    uvicorn.run(app, host='0.0.0.0', port=port)